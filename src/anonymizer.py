@@ -1,15 +1,23 @@
 """Module that handles the full Anonymization pipeline
 """
 
+import multiprocessing
+import os
 import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
 import modules.visu as vs
 
-from configuration.configurations import DPConfig, SensitiveConfig, ContinuousConfig
+from configuration.configurations import DPConfig, SensitiveConfig, ContinuousConfig, ReportConfig
 from configuration.config_parser import JSONParser
 from modules.jdbc_handler import JDBCHandler
+from modules.config_inference import ConfigInference
 from modules.dp_anonymizer import DifferentialPrivacyAnonymizer
 from modules.sensitive_anonymizer import SensitiveAnonymizer
+from modules.dtype_planner import DtypePlanner
+from modules.metrics import StageTimer
+from modules.report_stats import ReportStatistics
 
 
 def anonymize(
@@ -17,6 +25,9 @@ def anonymize(
     anon_config: DPConfig,
     cont_config: ContinuousConfig,
     sens_config: SensitiveConfig,
+    output_dir: str = vs.OUTPUT_DIR,
+    population: pd.DataFrame = None,
+    report_config: ReportConfig = None,
 ):
     """Method that runs the actual anonymization steps
 
@@ -25,25 +36,313 @@ def anonymize(
         anon_config (DPConfig): Differential privacy config
         cont_config (ContinuousConfig): Continuous columns config
         sens_config (SensitiveConfig): Sensitive data config
+        output_dir (str, optional): Directory of the evaluation report
+        population (pd.DataFrame, optional): Hidden columns of the full table if dataset is a subsample
+        report_config (ReportConfig, optional): Evaluation report options, defaults to a report on all rows
 
     Returns:
         pd.DataFrame: The fully anonymized data
     """
+    dp_data, _ = anonymize_with_budget(
+        dataset, anon_config, cont_config, sens_config, output_dir, population, report_config
+    )
+    return dp_data
+
+
+def anonymize_with_budget(
+    dataset: pd.DataFrame,
+    anon_config: DPConfig,
+    cont_config: ContinuousConfig,
+    sens_config: SensitiveConfig,
+    output_dir: str = vs.OUTPUT_DIR,
+    population: pd.DataFrame = None,
+    report_config: ReportConfig = None,
+):
+    """Method that runs the actual anonymization steps and reports the spent privacy budget
+
+    The evaluation report is finished before returning, use start_report to overlap it with other work.
+
+    Args:
+        dataset (pd.DataFrame): The data
+        anon_config (DPConfig): Differential privacy config
+        cont_config (ContinuousConfig): Continuous columns config
+        sens_config (SensitiveConfig): Sensitive data config
+        output_dir (str, optional): Directory of the evaluation report
+        population (pd.DataFrame, optional): Hidden columns of the full table if dataset is a subsample
+        report_config (ReportConfig, optional): Evaluation report options, defaults to a report on all rows
+
+    Returns:
+        (pd.DataFrame,float): The fully anonymized data and the spent epsilon
+    """
     dp_data = dataset
+    spent_epsilon = 0.0
     if anon_config is not None:
-        dp_anonymizer = DifferentialPrivacyAnonymizer(dataset, anon_config, cont_config)
+        dp_anonymizer = DifferentialPrivacyAnonymizer(dataset, anon_config, cont_config, population)
         dp_data = dp_anonymizer.run_anonymization()
+        spent_epsilon = dp_anonymizer.spent_epsilon
 
     if sens_config is not None:
         sens_anonymizer = SensitiveAnonymizer(dp_data, sens_config)
         dp_data = sens_anonymizer.run_anonymization()
 
+    report_config = report_config or ReportConfig(background=False)
+    finish_report(start_report(dataset, dp_data, output_dir, report_config))
+
+    return dp_data, spent_epsilon
+
+
+def start_report(dataset: pd.DataFrame, dp_data: pd.DataFrame, output_dir: str, report_config: ReportConfig):
+    """Function that starts the evaluation report on a sample of the original and the anonymized data
+
+    A background report runs in its own process, the data is handed over when this function returns.
+
+    Args:
+        dataset (pd.DataFrame): The original data
+        dp_data (pd.DataFrame): The anonymized data
+        output_dir (str): Directory of the evaluation report
+        report_config (ReportConfig): Evaluation report options
+
+    Returns:
+        Future: The seconds spent on the report, None if the report is disabled
+    """
+    if not report_config.enabled:
+        print("The evaluation report is disabled.")
+        return None
+    if report_config.streaming:
+        # The report is generated from the statistics collected during the transfer, see start_streaming_report
+        return None
+
+    dataset = vs.sampleRows(dataset, report_config.sample_rows)
+    dp_data = vs.sampleRows(dp_data, report_config.sample_rows)
+    args = (dataset, dp_data, output_dir, report_config.correlation, report_config.render_correlation)
+    return submit_report(vs.generateVisu, args, report_config.background)
+
+
+def report_statistics(report_config: ReportConfig):
+    """Function that creates the statistics a streaming evaluation report collects while the table is read
+
+    Args:
+        report_config (ReportConfig): Evaluation report options
+
+    Returns:
+        ReportStatistics: Empty statistics, None if the report is not streamed
+    """
+    if not (report_config.enabled and report_config.streaming):
+        return None
+    return ReportStatistics(sample_rows=report_config.sample_rows)
+
+
+def start_streaming_report(
+    orig_stats: ReportStatistics, anon_stats: ReportStatistics, output_dir: str, report_config: ReportConfig
+):
+    """Function that starts the evaluation report on the statistics collected while the tables were transferred
+
+    Args:
+        orig_stats (ReportStatistics): Statistics of the original table, None if the report is not streamed
+        anon_stats (ReportStatistics): Statistics of the anonymized table
+        output_dir (str): Directory of the evaluation report
+        report_config (ReportConfig): Evaluation report options
+
+    Returns:
+        Future: The seconds spent on the report, None if the report is not streamed or its statistics failed
+    """
+    if orig_stats is None:
+        return None
+    if orig_stats.failed or anon_stats.failed:
+        print("The streaming evaluation report is skipped, its statistics are incomplete.")
+        return None
+    if report_config.correlation != "pearson":
+        print("The streaming evaluation report only computes Pearson correlations.")
+    args = (orig_stats, anon_stats, output_dir, report_config.render_correlation)
+    return submit_report(vs.generateStreamingVisu, args, report_config.background)
+
+
+def submit_report(visu_function, args: tuple, background: bool):
+    """Function that runs a report function of the visu module in its own process or right away
+
+    Args:
+        visu_function (callable): The report function
+        args (tuple): Its arguments
+        background (bool): Whether the report runs in its own process
+
+    Returns:
+        Future: The seconds spent on the report, it has to be handed to finish_report
+    """
+    if background:
+        # Forking a process that runs a JVM is not safe, hence the workers are spawned
+        mp_context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=mp_context)
+        future = executor.submit(vs.timedVisu, visu_function, *args)
+        # The worker keeps running until the report is done, finish_report waits for it and logs its errors
+        executor.shutdown(wait=False)
+        return future
+
+    future = Future()
     try:
-        vs.generateVisu(dataset, dp_data.copy(deep=True))
-    except Exception: # pylint: disable=broad-exception-caught
-        print("An exception occurred while trying to visualize the output.")
+        future.set_result(vs.timedVisu(visu_function, *args))
+    except Exception as error: # pylint: disable=broad-exception-caught
+        future.set_exception(error)
+    return future
 
-    return dp_data
+
+def finish_report(report: Future, timer: StageTimer = None):
+    """Function that waits for the evaluation report and records its duration as the report stage
+
+    Args:
+        report (Future): The report returned by start_report, None if the report is disabled
+        timer (StageTimer, optional): Recorder of the stage timings, the duration is printed without one
+    """
+    if report is None:
+        return
+    try:
+        seconds = report.result()
+    except Exception as error: # pylint: disable=broad-exception-caught
+        print(f"An exception occurred while trying to visualize the output: {error!r}")
+        return
+
+    if timer is not None:
+        timer.record("report", seconds)
+    else:
+        print(f"The evaluation report took: {seconds:0.2f} seconds")
+
+
+def anonymize_chunks(
+    dp_anonymizer: DifferentialPrivacyAnonymizer,
+    sens_config: SensitiveConfig,
+    output_dir: str = vs.OUTPUT_DIR,
+    report_config: ReportConfig = None,
+    timer: StageTimer = None,
+):
+    """Generator that runs the anonymization steps on the chunks sampled according to the sampling config
+
+    The evaluation report compares the data with the first chunk, a background report overlaps with the
+    remaining chunks. The spent epsilon is available from the anonymizer once all chunks are consumed.
+
+    Args:
+        dp_anonymizer (DifferentialPrivacyAnonymizer): The DP anonymizer of the data
+        sens_config (SensitiveConfig): Sensitive data config
+        output_dir (str, optional): Directory of the evaluation report
+        report_config (ReportConfig, optional): Evaluation report options, defaults to a report on all rows
+        timer (StageTimer, optional): Recorder of the report duration
+
+    Yields:
+        pd.DataFrame: The next chunk of fully anonymized data
+    """
+    report_config = report_config or ReportConfig(background=False)
+    report = None
+    try:
+        for index, dp_data in enumerate(dp_anonymizer.iter_anonymization()):
+            if sens_config is not None:
+                sens_anonymizer = SensitiveAnonymizer(dp_data, sens_config)
+                dp_data = sens_anonymizer.run_anonymization()
+
+            if index == 0:
+                report = start_report(dp_anonymizer.dataset, dp_data, output_dir, report_config)
+
+            yield dp_data
+    finally:
+        # A report process is joined even if the consumer of the chunks fails
+        finish_report(report, timer)
+
+
+def read_table(jdbc_handler: JDBCHandler, conn, table: str, observer=None):
+    """Function that pulls a table, partitioned if the transfer config asks for it
+
+    Args:
+        jdbc_handler (JDBCHandler): The JDBC connection information
+        conn (jaydebeapi.Connection): Connection to the database
+        table (str): Name of the table
+        observer (callable, optional): Function that is called with the chunks of the table
+
+    Returns:
+        (pd.DataFrame,list[int]): The table and a list of indexes for all time-related columns
+    """
+    if jdbc_handler.transfer_config.partitions > 1:
+        dataset, timestamps = jdbc_handler.partitioned_data_from_table(table)
+        if observer is not None:
+            observer(dataset)
+        return dataset, timestamps
+    return jdbc_handler.data_from_table(conn, table, observer)
+
+
+def read_fit_table(jdbc_handler: JDBCHandler, conn, anon_config: DPConfig, observer=None):
+    """Function that pulls the data the synthesizer is fitted on
+
+    If a fit fraction is configured, only a random subsample of the table is pulled together with the hidden
+    columns of all rows.
+
+    Args:
+        jdbc_handler (JDBCHandler): The JDBC connection information
+        conn (jaydebeapi.Connection): Connection to the database
+        anon_config (DPConfig): The Differential privacy config
+        observer (callable, optional): Function that is called with the chunks of the data
+
+    Raises:
+        ValueError: The fit fraction is not in (0, 1]
+
+    Returns:
+        (pd.DataFrame,list[int],pd.DataFrame): The data, a list of indexes for all time-related columns and
+        the hidden columns of the full table, which is None if the full table is pulled
+    """
+    table = anon_config.table_name
+    fraction = anon_config.fit_fraction
+    if fraction is not None and not 0 < float(fraction) <= 1:
+        raise ValueError(f"The fit fraction must be in (0, 1], got {fraction}")
+
+    # Without a privacy budget the original data is returned, which requires the full table
+    if fraction is not None and float(fraction) < 1 and float(anon_config.epsilon) > 0:
+        sample, timestamps, population = jdbc_handler.sampled_data_from_table(
+            conn, table, float(fraction), anon_config.column_classification.hidden
+        )
+        if observer is not None:
+            observer(sample)
+        return sample, timestamps, population
+
+    dataset, timestamps = read_table(jdbc_handler, conn, table, observer)
+    return dataset, timestamps, None
+
+
+def write_table(
+    jdbc_handler: JDBCHandler, conn, table: str, dataset_anon: pd.DataFrame, timestamps, observer=None
+):
+    """Function that creates the anonymized copy of a table and pushes the anonymized data
+
+    Args:
+        jdbc_handler (JDBCHandler): The JDBC connection information
+        conn (jaydebeapi.Connection): Connection to the database
+        table (str): Name of the original table
+        dataset_anon (pd.DataFrame): The anonymized data
+        timestamps (list[int]): A list of indexes for all time-related columns
+        observer (callable, optional): Function that is called with the batches of pushed data
+    """
+    # Create empty table
+    anon_table_name = jdbc_handler.create_anonymized_table(conn, table)
+
+    # Populate new table
+    append_table(jdbc_handler, conn, anon_table_name, dataset_anon, timestamps, observer)
+
+
+def append_table(
+    jdbc_handler: JDBCHandler, conn, anon_table_name: str, dataset_anon: pd.DataFrame, timestamps, observer=None
+):
+    """Function that pushes anonymized data into an existing anonymized table
+
+    Args:
+        jdbc_handler (JDBCHandler): The JDBC connection information
+        conn (jaydebeapi.Connection): Connection to the database
+        anon_table_name (str): Name of the anonymized table
+        dataset_anon (pd.DataFrame): The anonymized data
+        timestamps (list[int]): A list of indexes for all time-related columns
+        observer (callable, optional): Function that is called with the batches of pushed data
+    """
+    if jdbc_handler.transfer_config.writer == "bulk":
+        jdbc_handler.bulk_load_anonymized_table(
+            conn, dataset_anon, anon_table_name, timestamps, observer
+        )
+    else:
+        jdbc_handler.populate_anonymized_table(
+            conn, dataset_anon, anon_table_name, timestamps, observer
+        )
 
 
 def anonymize_db(
@@ -51,33 +350,294 @@ def anonymize_db(
     anon_config: DPConfig,
     sens_config: SensitiveConfig,
     cont_config: ContinuousConfig,
+    timer: StageTimer = None,
+    report_config: ReportConfig = None,
 ):
     """Function that handles all anonymization steps, including pulling and pushing data
 
+    The evaluation report is recorded as its own stage. A background report overlaps with the write stage,
+    a streaming report collects its statistics during the read and write stages.
+
     Args:
         jdbc_handler (JDBCHandler): The JDBC connection information
         anon_config (DPConfig): The Differential privacy config
         sens_config (SensitiveConfig): The sensitive data config
         cont_config (ContinuousConfig): The continuous column config
+        timer (StageTimer, optional): Recorder of the stage timings
+        report_config (ReportConfig, optional): Evaluation report options, defaults to a background report
+            on all rows
+
+    Returns:
+        dict: Seconds spent per stage
+    """
+    timer = timer or StageTimer()
+    report_config = report_config or ReportConfig()
+
+    with timer.stage("connect"):
+        jdbc_handler.start_jvm()
+        conn = jdbc_handler.get_connection()
+
+    try:
+        table = anon_config.table_name
+        orig_stats = report_statistics(report_config)
+        with timer.stage("read"):
+            dataset, timestamps, population = read_fit_table(
+                jdbc_handler, conn, anon_config, None if orig_stats is None else orig_stats.observe
+            )
+        anon_stats = None if orig_stats is None else orig_stats.empty_like()
+        observer = None if anon_stats is None else anon_stats.observe
+
+        with timer.stage("plan"):
+            dataset = DtypePlanner(anon_config.column_classification).apply(dataset, timestamps, table)
+
+        if anon_config.sampling is not None:
+            dp_anonymizer = DifferentialPrivacyAnonymizer(dataset, anon_config, cont_config, population)
+            chunks = anonymize_chunks(dp_anonymizer, sens_config, vs.OUTPUT_DIR, report_config, timer)
+            del dataset
+            stream_table(jdbc_handler, conn, table, chunks, timestamps, timer, observer)
+            finish_report(start_streaming_report(orig_stats, anon_stats, vs.OUTPUT_DIR, report_config), timer)
+            return timer.timings
+
+        with timer.stage("anonymize"):
+            dataset_anon = anonymize(
+                dataset,
+                anon_config,
+                cont_config,
+                sens_config,
+                population=population,
+                report_config=ReportConfig(enabled=False),
+            )
+            del population
+
+        report = start_report(dataset, dataset_anon, vs.OUTPUT_DIR, report_config)
+        del dataset
+
+        try:
+            with timer.stage("write"):
+                write_table(jdbc_handler, conn, table, dataset_anon, timestamps, observer)
+        finally:
+            # A report process is joined even if the write fails
+            finish_report(report, timer)
+        finish_report(start_streaming_report(orig_stats, anon_stats, vs.OUTPUT_DIR, report_config), timer)
+    finally:
+        jdbc_handler.release_connection(conn)
+
+    return timer.timings
+
+
+def stream_table(
+    jdbc_handler: JDBCHandler, conn, table: str, chunks, timestamps, timer: StageTimer, observer=None
+):
+    """Function that creates the anonymized copy of a table and pushes the anonymized chunks as they arrive
+
+    The time spent waiting for chunks is recorded as the anonymize stage, the rest as the write stage.
+
+    Args:
+        jdbc_handler (JDBCHandler): The JDBC connection information
+        conn (jaydebeapi.Connection): Connection to the database
+        table (str): Name of the original table
+        chunks (Iterator[pd.DataFrame]): The anonymized data
+        timestamps (list[int]): A list of indexes for all time-related columns
+        timer (StageTimer): Recorder of the stage timings
+        observer (callable, optional): Function that is called with the batches of pushed data
+    """
+    anonymize_seconds = 0.0
+    start_time = time.perf_counter()
+    anon_table_name = jdbc_handler.create_anonymized_table(conn, table)
+    write_seconds = time.perf_counter() - start_time
+
+    chunks = iter(chunks)
+    while True:
+        start_time = time.perf_counter()
+        dataset_anon = next(chunks, None)
+        anonymize_seconds += time.perf_counter() - start_time
+        if dataset_anon is None:
+            break
+
+        start_time = time.perf_counter()
+        append_table(jdbc_handler, conn, anon_table_name, dataset_anon, timestamps, observer)
+        write_seconds += time.perf_counter() - start_time
+
+    timer.record("anonymize", anonymize_seconds)
+    timer.record("write", write_seconds)
+
+
+def anonymize_tables(
+    jdbc_handler: JDBCHandler, table_configs: list, workers: int = None, report_config: ReportConfig = None
+):
+    """Function that anonymizes multiple tables concurrently
+
+    The tables are pulled and pushed in threads, while the CPU-bound anonymization runs in a pool of
+    processes. Every table spends its own privacy budget. A summary of all tables is printed at the end.
+
+    Args:
+        jdbc_handler (JDBCHandler): The JDBC connection information
+        table_configs (list[(DPConfig,SensitiveConfig,ContinuousConfig)]): The configs of every table
+        workers (int, optional): Number of anonymization processes, defaults to the number of CPUs
+        report_config (ReportConfig, optional): Evaluation report options of every table, defaults to a
+            background report on all rows
+
+    Returns:
+        dict: The spent epsilon and the seconds spent per stage of every table
     """
     jdbc_handler.start_jvm()
+    workers = workers or min(len(table_configs), os.cpu_count() or 1)
+    report_config = report_config or ReportConfig()
+    # Plotting is not thread-safe, hence the reports of the concurrent tables always run in their own process
+    report_config = ReportConfig(
+        report_config.enabled,
+        report_config.sample_rows,
+        True,
+        report_config.streaming,
+        report_config.correlation,
+        report_config.render_correlation,
+    )
+
+    # Forking a process that runs a JVM is not safe, hence the workers are spawned
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as synth_pool:
+        with ThreadPoolExecutor(max_workers=len(table_configs)) as io_pool:
+            futures = [
+                io_pool.submit(anonymize_table_job, jdbc_handler, synth_pool, *configs, report_config)
+                for configs in table_configs
+            ]
+
+    summary = {}
+    for (anon_config, _, _), future in zip(table_configs, futures):
+        try:
+            summary[anon_config.table_name] = future.result()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            print(f"Anonymization of {anon_config.table_name} failed: {error!r}")
+            summary[anon_config.table_name] = None
+
+    print_summary(summary)
+    return summary
+
+
+def anonymize_table_job(
+    jdbc_handler: JDBCHandler,
+    synth_pool: ProcessPoolExecutor,
+    anon_config: DPConfig,
+    sens_config: SensitiveConfig,
+    cont_config: ContinuousConfig,
+    report_config: ReportConfig,
+):
+    """Function that pulls, anonymizes and pushes a single table of a multi-table run
 
-    conn = jdbc_handler.get_connection()
+    Args:
+        jdbc_handler (JDBCHandler): The JDBC connection information
+        synth_pool (ProcessPoolExecutor): The pool that runs the anonymization
+        anon_config (DPConfig): The Differential privacy config
+        sens_config (SensitiveConfig): The sensitive data config
+        cont_config (ContinuousConfig): The continuous column config
+        report_config (ReportConfig): Evaluation report options, the report runs in the background
 
+    Returns:
+        dict: The spent epsilon and the seconds spent per stage
+    """
     table = anon_config.table_name
-    dataset, timestamps = jdbc_handler.data_from_table(conn, table)
+    output_dir = os.path.join(vs.OUTPUT_DIR, table)
+    timer = StageTimer()
+    start_time = time.perf_counter()
 
-    dataset_anon = anonymize(dataset, anon_config, cont_config, sens_config)
+    orig_stats = report_statistics(report_config)
+    with timer.stage("read"):
+        with jdbc_handler.connection() as conn:
+            dataset, timestamps, population = read_fit_table(
+                jdbc_handler, conn, anon_config, None if orig_stats is None else orig_stats.observe
+            )
+    anon_stats = None if orig_stats is None else orig_stats.empty_like()
+    observer = None if anon_stats is None else anon_stats.observe
 
-    # Create empty table
-    anon_table_name = jdbc_handler.create_anonymized_table(conn, table)
+    with timer.stage("plan"):
+        dataset = DtypePlanner(anon_config.column_classification).apply(dataset, timestamps, table)
 
-    # Populate new table
-    jdbc_handler.populate_anonymized_table(
-        conn, dataset_anon, anon_table_name, timestamps
+    if anon_config.sampling is not None:
+        # Sampled tables are streamed by this thread, the sampler runs its own processes
+        dp_anonymizer = DifferentialPrivacyAnonymizer(dataset, anon_config, cont_config, population)
+        chunks = anonymize_chunks(dp_anonymizer, sens_config, output_dir, report_config, timer)
+        del dataset
+        with jdbc_handler.connection() as conn:
+            stream_table(jdbc_handler, conn, table, chunks, timestamps, timer, observer)
+        finish_report(start_streaming_report(orig_stats, anon_stats, output_dir, report_config), timer)
+        return {
+            "epsilon": dp_anonymizer.spent_epsilon,
+            **timer.timings,
+            "total": time.perf_counter() - start_time,
+        }
+
+    with timer.stage("anonymize"):
+        dataset_anon, spent_epsilon = synth_pool.submit(
+            anonymize_with_budget,
+            dataset,
+            anon_config,
+            cont_config,
+            sens_config,
+            output_dir,
+            population,
+            ReportConfig(enabled=False),
+        ).result()
+        del population
+
+    report = start_report(dataset, dataset_anon, output_dir, report_config)
+    del dataset
+
+    try:
+        with timer.stage("write"):
+            with jdbc_handler.connection() as conn:
+                write_table(jdbc_handler, conn, table, dataset_anon, timestamps, observer)
+    finally:
+        # A report process is joined even if the write fails
+        finish_report(report, timer)
+    finish_report(start_streaming_report(orig_stats, anon_stats, output_dir, report_config), timer)
+
+    return {
+        "epsilon": spent_epsilon,
+        **timer.timings,
+        "total": time.perf_counter() - start_time,
+    }
+
+
+def print_summary(summary: dict):
+    """Function that prints the spent privacy budget and wall times of a multi-table run
+
+    Args:
+        summary (dict): The results of anonymize_table_job per table, None for failed tables
+    """
+    print(
+        f"{'Table':<30}{'Epsilon':>10}{'Read[s]':>10}{'Anon[s]':>10}{'Write[s]':>10}{'Report[s]':>10}"
+        f"{'Total[s]':>10}"
     )
+    for table, result in summary.items():
+        if result is None:
+            print(f"{table:<30}{'failed':>10}")
+            continue
+        print(
+            f"{table:<30}{result['epsilon']:>10.2f}{result['read']:>10.2f}{result['anonymize']:>10.2f}"
+            f"{result['write']:>10.2f}{result.get('report', 0.0):>10.2f}{result['total']:>10.2f}"
+        )
+
+
+def infer_table_configs(jdbc_handler: JDBCHandler, table_configs: list, inference_configs: list):
+    """Function that completes the configs of the tables whose columns are inferred
+
+    Args:
+        jdbc_handler (JDBCHandler): The JDBC connection information
+        table_configs (list[(DPConfig,SensitiveConfig,ContinuousConfig)]): The configs of every table
+        inference_configs (list[InferenceConfig]): The inference options of every table, None for tables
+            whose columns are not inferred
 
-    conn.close()
+    Returns:
+        list[(DPConfig,SensitiveConfig,ContinuousConfig)]: The completed configs
+    """
+    completed = []
+    for (anon_config, sens_config, cont_config), inference_config in zip(table_configs, inference_configs):
+        if inference_config is not None:
+            anon_config, cont_config = ConfigInference(jdbc_handler, inference_config).infer(
+                anon_config, cont_config
+            )
+        completed.append((anon_config, sens_config, cont_config))
+    return completed
 
 
 def main():
@@ -91,11 +651,24 @@ def main():
     config_parser = JSONParser(sys.argv)
 
     jdbc_handler = config_parser.get_jdbc_config()
+    if config_parser.is_multi_table():
+        table_configs, workers = config_parser.get_table_configs()
+        table_configs = infer_table_configs(
+            jdbc_handler, table_configs, config_parser.get_table_inference_configs()
+        )
+        anonymize_tables(jdbc_handler, table_configs, workers, config_parser.get_report_config())
+        return
+
     anon_config = config_parser.get_anon_config()
     sens_config = config_parser.get_sens_config()
     cont_config = config_parser.get_cont_config()
+    anon_config, sens_config, cont_config = infer_table_configs(
+        jdbc_handler, [(anon_config, sens_config, cont_config)], [config_parser.get_inference_config()]
+    )[0]
+
+    report_config = config_parser.get_report_config()
 
-    anonymize_db(jdbc_handler, anon_config, sens_config, cont_config)
+    anonymize_db(jdbc_handler, anon_config, sens_config, cont_config, report_config=report_config)
     return
 
 
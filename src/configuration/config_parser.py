@@ -7,8 +7,14 @@ from configuration.configurations import (
     SensitiveEntry,
     ContinuousConfig,
     ContinuousEntry,
+    InferenceConfig,
+    ReportConfig,
+    SamplingConfig,
+    TransferConfig,
 )
 from modules.jdbc_handler import JDBCHandler
+from modules.model_cache import DEFAULT_CACHE_DIR
+from modules.vocab_cache import DEFAULT_VOCAB_DIR
 
 class JSONParser:
 
@@ -23,27 +29,204 @@ class JSONParser:
             dict_object["username"],
             dict_object["password"],
             dict_object["jarPath"],
+            self.get_transfer_config(dict_object),
+        )
+
+    def get_transfer_config(self, dict_object: dict):
+        defaults = TransferConfig()
+        return TransferConfig(
+            int(dict_object.get("fetchSize", defaults.fetch_size)),
+            int(dict_object.get("partitions", defaults.partitions)),
+            dict_object.get("partitionColumn", defaults.partition_column),
+            int(dict_object.get("batchSize", defaults.batch_size)),
+            int(dict_object.get("commitEvery", defaults.commit_batches)),
+            int(dict_object.get("multiRow", defaults.multi_row)),
+            dict_object.get("writer", defaults.writer),
         )
 
     def get_anon_config(self):
         dict_object = json.loads(self.args[2])
-        col_config = DPColumnConfig(
-            dict_object["hide"],
-            dict_object["cat"],
-            dict_object["cont"],
-            dict_object["ord"]
+        return self.anon_config_from_dict(dict_object)
+
+    def get_sens_config(self):
+        dict_object = json.loads(self.args[3])
+        return self.sens_config_from_list(dict_object)
+
+    def get_cont_config(self):
+        dict_object = json.loads(self.args[4])
+        return self.cont_config_from_list(dict_object)
+
+    def get_report_config(self):
+        """Parses the evaluation report options under "report" of the anonymization config
+
+        The options are either a boolean that enables or disables the report or an object with the keys
+        "enabled", "sampleRows", "background", "streaming", "correlation" and "renderCorrelation".
+        Multi-table configs take them from the top-level object.
+
+        Returns:
+            ReportConfig: The report options
+        """
+        dict_object = json.loads(self.args[2])
+        report = dict_object.get("report", {}) if isinstance(dict_object, dict) else {}
+        if isinstance(report, bool):
+            return ReportConfig(enabled=report)
+
+        defaults = ReportConfig()
+        sample_rows = report.get("sampleRows", defaults.sample_rows)
+        return ReportConfig(
+            bool(report.get("enabled", defaults.enabled)),
+            int(sample_rows) if sample_rows is not None else None,
+            bool(report.get("background", defaults.background)),
+            bool(report.get("streaming", defaults.streaming)),
+            report.get("correlation", defaults.correlation),
+            bool(report.get("renderCorrelation", defaults.render_correlation)),
+        )
+
+    def get_inference_config(self):
+        """Parses the options of the column inference under "infer" of the anonymization config
+
+        Returns:
+            InferenceConfig: The inference options, None if the columns are not inferred
+        """
+        dict_object = json.loads(self.args[2])
+        return self.inference_config_from_dict(dict_object)
+
+    def get_table_inference_configs(self):
+        """Parses the inference options of every table of a multi-table anonymization config
+
+        Tables without "infer" take the options of the top-level object.
+
+        Returns:
+            list[InferenceConfig]: The inference options in the order of get_table_configs, None for
+            tables whose columns are not inferred
+        """
+        dict_object = json.loads(self.args[2])
+        default = None
+        if isinstance(dict_object, dict):
+            default = dict_object.get("infer")
+            dict_object = dict_object["tables"]
+        return [self.inference_config_from_dict({"infer": entry.get("infer", default)}) for entry in dict_object]
+
+    def inference_config_from_dict(self, dict_object: dict):
+        """Parses the inference options of a table config
+
+        The options are either a boolean that enables the inference or an object with the keys
+        "maxCategories", "bins", "bounds" and "countDistinct".
+
+        Args:
+            dict_object (dict): The table config
+
+        Returns:
+            InferenceConfig: The inference options, None if the columns are not inferred
+        """
+        infer = dict_object.get("infer") if isinstance(dict_object, dict) else None
+        if not infer:
+            return None
+        if infer is True:
+            return InferenceConfig()
+
+        defaults = InferenceConfig()
+        return InferenceConfig(
+            int(infer.get("maxCategories", defaults.max_categories)),
+            int(infer.get("bins", defaults.bins)),
+            infer.get("bounds", defaults.bounds),
+            bool(infer.get("countDistinct", defaults.count_distinct)),
         )
 
+    def is_multi_table(self):
+        dict_object = json.loads(self.args[2])
+        return isinstance(dict_object, list) or "tables" in dict_object
+
+    def get_table_configs(self):
+        """Parses a multi-table anonymization config
+
+        The anonymization config is either a list of table configs or an object with the list under
+        "tables" and the number of synthesis processes under "workers". Every table config may contain
+        its own sensitive config under "sens" and continuous config under "contConfig", otherwise the
+        sensitive and continuous configs are used. "cont" lists the continuous columns as in single-table
+        configs.
+
+        Returns:
+            (list[(DPConfig,SensitiveConfig,ContinuousConfig)],int): The configs of every table and
+            the number of workers, which is None if it is not configured
+        """
+        dict_object = json.loads(self.args[2])
+        workers = None
+        infer = None
+        if isinstance(dict_object, dict):
+            workers = dict_object.get("workers")
+            infer = dict_object.get("infer")
+            dict_object = dict_object["tables"]
+
+        default_sens = json.loads(self.args[3])
+        default_cont = json.loads(self.args[4])
+
+        table_configs = []
+        for entry in dict_object:
+            table_configs.append(
+                (
+                    self.anon_config_from_dict({"infer": infer, **entry}),
+                    self.sens_config_from_list(entry.get("sens", default_sens)),
+                    self.cont_config_from_list(entry.get("contConfig", default_cont)),
+                )
+            )
+        return table_configs, workers
+
+    def anon_config_from_dict(self, dict_object: dict):
+        # Inferred configs only need to list the columns whose classification is fixed
+        if dict_object.get("infer"):
+            col_config = DPColumnConfig(
+                dict_object.get("hide", []),
+                dict_object.get("cat", []),
+                dict_object.get("cont", []),
+                dict_object.get("ord", []),
+            )
+        else:
+            col_config = DPColumnConfig(
+                dict_object["hide"],
+                dict_object["cat"],
+                dict_object["cont"],
+                dict_object["ord"]
+            )
+
+        # The model cache is either enabled with true or pointed to a directory
+        cache_dir = dict_object.get("modelCache")
+        if cache_dir is True:
+            cache_dir = DEFAULT_CACHE_DIR
+
+        # Sampling in chunks is only enabled if a sample size is given
+        sampling = None
+        if "sampleRows" in dict_object or "scaleFactor" in dict_object:
+            sampling = SamplingConfig(
+                dict_object.get("sampleRows"),
+                dict_object.get("scaleFactor"),
+                dict_object.get("sampleChunk", 100000),
+                dict_object.get("sampleWorkers", 1),
+                dict_object.get("seed"),
+            )
+
         return DPConfig(
             dict_object["table"],
             dict_object["eps"],
             dict_object["preEps"],
             dict_object["alg"],
-            col_config
+            col_config,
+            cache_dir or None,
+            sampling,
+            dict_object.get("fitFraction"),
         )
 
-    def get_sens_config(self):
-        dict_object = json.loads(self.args[3])
+    def sens_config_from_list(self, dict_object: list):
+        # The sensitive config is either the list of columns or an object with the list under "columns"
+        vocab_dir = None
+        workers = 1
+        if isinstance(dict_object, dict):
+            workers = int(dict_object.get("workers", workers))
+            vocab_dir = dict_object.get("vocabCache")
+            if vocab_dir is True:
+                vocab_dir = DEFAULT_VOCAB_DIR
+            dict_object = dict_object["columns"]
+
         sens_column_list = []
 
         for entry in dict_object:
@@ -53,10 +236,9 @@ class JSONParser:
                 )
             )
 
-        return SensitiveConfig(sens_column_list)
+        return SensitiveConfig(sens_column_list, vocab_dir or None, workers)
 
-    def get_cont_config(self):
-        dict_object = json.loads(self.args[4])
+    def cont_config_from_list(self, dict_object: list):
         cont_column_list = []
 
         for entry in dict_object:
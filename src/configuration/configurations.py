@@ -46,6 +46,13 @@ class DPConfig:
           Name of the DP-algorithm
     column_classification : DPColumnConfig
           lassification of table columns
+    cache_dir : str
+          Directory of fitted synthesizers that are reused by later runs, None disables the cache
+    sampling : SamplingConfig
+          Options for sampling more or fewer rows than the table has, None samples one row per row
+    fit_fraction : float
+          Probability of a row to be part of the random subsample the synthesizer is fitted on,
+          None fits on the full table
 
     """
 
@@ -56,12 +63,179 @@ class DPConfig:
         preproc_eps: str,
         algorithm: str,
         column_classification: DPColumnConfig,
+        cache_dir: str = None,
+        sampling: "SamplingConfig" = None,
+        fit_fraction: float = None,
     ):
         self.epsilon = epsilon
         self.table_name = table_name
         self.preproc_eps = preproc_eps
         self.algorithm = algorithm
         self.column_classification = column_classification
+        self.cache_dir = cache_dir
+        self.sampling = sampling
+        self.fit_fraction = fit_fraction
+
+
+class SamplingConfig:
+    """A class to represent the options for sampling synthetic data in parallel chunks
+
+    Attributes
+    ----------
+    rows : int
+          Number of rows to sample, takes precedence over scale_factor
+    scale_factor : float
+          Number of rows to sample relative to the number of rows of the table
+    chunk_rows : int
+          Number of rows that are sampled and written at once
+    workers : int
+          Number of processes that sample chunks concurrently
+    seed : int
+          Seed of the random streams of the chunks, None draws a fresh seed
+
+    """
+
+    def __init__(
+        self,
+        rows: int = None,
+        scale_factor: float = None,
+        chunk_rows: int = 100000,
+        workers: int = 1,
+        seed: int = None,
+    ):
+        self.rows = rows
+        self.scale_factor = scale_factor
+        self.chunk_rows = chunk_rows
+        self.workers = workers
+        self.seed = seed
+
+    def target_rows(self, table_rows: int):
+        """Method that returns the number of rows to sample
+
+        Args:
+            table_rows (int): Number of rows of the table
+
+        Returns:
+            int: The number of rows to sample
+        """
+        if self.rows is not None:
+            return int(self.rows)
+        if self.scale_factor is not None:
+            return int(round(table_rows * float(self.scale_factor)))
+        return table_rows
+
+
+class ReportConfig:
+    """A class to represent the options for the evaluation report that compares original and anonymized data
+
+    Attributes
+    ----------
+    enabled : bool
+          Whether the report is generated at all
+    sample_rows : int
+          Number of random rows of either table the report is based on, None uses all rows
+    background : bool
+          Whether the report is generated in its own process while the anonymized data is written
+    streaming : bool
+          Whether the report is generated from statistics that are collected while the tables are read and
+          written, the KDE curves are then based on a sample of `sample_rows` rows
+    correlation : str
+          Measure of the correlation maps, either "pearson" or "association", streaming reports only
+          support "pearson"
+    render_correlation : bool
+          Whether the correlation maps are rendered as images besides the JSON and NPY matrices
+
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        sample_rows: int = None,
+        background: bool = True,
+        streaming: bool = False,
+        correlation: str = "pearson",
+        render_correlation: bool = True,
+    ):
+        self.enabled = enabled
+        self.sample_rows = sample_rows
+        self.background = background
+        self.streaming = streaming
+        self.correlation = correlation
+        self.render_correlation = render_correlation
+
+
+class InferenceConfig:
+    """A class to represent the options for inferring the column classification and bins of a table
+
+    Attributes
+    ----------
+    max_categories : int
+          Maximum number of distinct values of categorical and ordinal columns, which bounds the domain
+          size of every column the synthesizer fits
+    bins : int
+          Maximum number of bins of inferred continuous columns
+    bounds : str
+          Source of the bounds of inferred continuous columns, either "dp", which leaves them empty so they
+          are estimated with the preprocessing budget, "type", which takes them from the column type, or
+          "exact", which takes the minimum and maximum of the table and is not differentially private
+    count_distinct : bool
+          Whether the number of distinct values is counted by the database, without it string columns
+          are hidden and numeric columns are continuous
+
+    """
+
+    def __init__(
+        self,
+        max_categories: int = 64,
+        bins: int = 16,
+        bounds: str = "dp",
+        count_distinct: bool = True,
+    ):
+        self.max_categories = max_categories
+        self.bins = bins
+        self.bounds = bounds
+        self.count_distinct = count_distinct
+
+
+class TransferConfig:
+    """A class to represent the options for moving table data over JDBC
+
+    Attributes
+    ----------
+    fetch_size : int
+          Number of rows that are fetched per round trip when reading tables
+    partitions : int
+          Number of connections that read a table concurrently, 1 disables partitioned reads
+    partition_column : str
+          Numeric column whose value range is split among the partitions, defaults to the primary key
+    batch_size : int
+          Number of rows that are sent to the database per batch when writing tables
+    commit_batches : int
+          Number of batches after which the write transaction is committed
+    multi_row : int
+          Number of rows per multi-row INSERT statement, 1 inserts every row with its own statement
+    writer : str
+          Backend that writes the anonymized tables, either "insert" or "bulk"
+
+    """
+
+    def __init__(
+        self,
+        fetch_size: int = 10000,
+        partitions: int = 1,
+        partition_column: str = None,
+        batch_size: int = 10000,
+        commit_batches: int = 10,
+        multi_row: int = 1,
+        writer: str = "insert",
+    ):
+        self.fetch_size = fetch_size
+        self.partitions = partitions
+        self.partition_column = partition_column
+        self.batch_size = batch_size
+        self.commit_batches = commit_batches
+        self.multi_row = multi_row
+        self.writer = writer
 
 
 class ContinuousEntry:
@@ -109,6 +283,9 @@ class SensitiveEntry:
           Name of the column
     method : str
           Faking method
+    mode : str
+          Either "natural", "fitting", "unique" or "keyed", which derives distinct fake values of the
+          type and width of the column from a keyed hash of the original values, stable across runs
     locales : list[str]
           List of locales
     seed : str
@@ -131,7 +308,13 @@ class SensitiveConfig:
     ----------
     columns : list[SensitiveEntry]
           Name of the column
+    vocab_dir : str
+          Directory of generated fake values that are reused by later runs, None disables the cache
+    workers : int
+          Number of processes that fake columns concurrently
     """
 
-    def __init__(self, columns: list[SensitiveEntry]):
+    def __init__(self, columns: list[SensitiveEntry], vocab_dir: str = None, workers: int = 1):
         self.columns = columns
+        self.vocab_dir = vocab_dir
+        self.workers = workers
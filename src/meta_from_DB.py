@@ -2,11 +2,14 @@
 """
 import json
 import sys
-import jaydebeapi
-import jpype
+
+from modules.db_metadata import MetadataCache
+from modules.jdbc_handler import JDBCHandler
 
 def columnsFromTable(curs, table):
-    """A helper function that returns a list of column names
+    """A helper function that returns a list of column names by running a query on the table
+
+    It is the fallback for tables that the DatabaseMetaData of the driver does not list, e.g. synonyms.
 
     Args:
         curs (any): JDBC connection cursor
@@ -27,49 +30,90 @@ def columnsFromTable(curs, table):
     return cols
 
 
-def getMeta(table, jdbcConfig: dict):
+def handlerFromConfig(jdbcConfig: dict):
+    """A helper function that creates the handler of a database without starting the JVM
+
+    Args:
+        jdbcConfig (dict): JSON dictionary containing connection information
+
+    Returns:
+        JDBCHandler: The handler
+    """
+    return JDBCHandler(
+        jdbcConfig["driver"],
+        jdbcConfig["url"],
+        jdbcConfig["username"],
+        jdbcConfig["password"],
+        jdbcConfig["jarPath"],
+    )
+
+
+def getTablesMeta(tables, jdbcConfig: dict, refresh=False):
+    """Method that returns the metadata of many tables from the DatabaseMetaData of the database
+
+    The metadata is cached per connection URL, so repeated calls neither start the JVM nor connect.
+
+    Args:
+        tables (str[]): Names of the tables
+        jdbcConfig (dict): JSON dictionary containing connection information
+        refresh (bool, optional): Whether the metadata is read from the database regardless of the cache
+
+    Returns:
+        dict: The TableMeta per table name
+    """
+    return MetadataCache().tables(handlerFromConfig(jdbcConfig), tables, refresh)
+
+
+def getMeta(table, jdbcConfig: dict, refresh=False):
     """Method that returns a list of columns corresponding to a table
 
     Args:
         table (str): Name of the table
         jdbcConfig (dict): JSON dictionary containing connection information
+        refresh (bool, optional): Whether the metadata is read from the database regardless of the cache
 
     Returns:
         cols (str[]): List of columns of the defined table
     """
-    driver = jdbcConfig["driver"]
-    url = jdbcConfig["url"]
-    username = jdbcConfig["username"]
-    password = jdbcConfig["password"]
-    jar = jdbcConfig["jarPath"]
-
-    jpype.startJVM(classpath=[jar])
+    cols = getTablesMeta([table], jdbcConfig, refresh)[table].column_names()
+    if cols:
+        return cols
 
-    conn = jaydebeapi.connect(driver, url, [username, password])
+    handler = handlerFromConfig(jdbcConfig)
+    handler.start_jvm()
 
-    curs = conn.cursor()
-
-    cols = columnsFromTable(curs, table)
-    curs.close()
-    conn.close()
+    with handler.connection() as conn:
+        curs = conn.cursor()
+        cols = columnsFromTable(curs, table)
+        curs.close()
     return cols
 
 
 def main():
     """Main function that handles sys args
 
+    A single table prints its list of columns, a comma separated list of tables or the --details flag
+    prints the full metadata of every table as JSON. The --refresh flag bypasses the metadata cache.
+
     Raises:
         Exception: Not enough arguments provided
     """
     if len(sys.argv) < 3:
-        raise RuntimeError("Not enough arguments provided: <tableName> <jdbcConfig>")
+        raise RuntimeError(
+            "Not enough arguments provided: <tableName>[,<tableName>...] <jdbcConfig> [--details] [--refresh]"
+        )
 
-    name = sys.argv[1]
+    names = [name.strip() for name in sys.argv[1].split(",") if name.strip()]
     jdbcConfig = json.loads(sys.argv[2])
+    flags = sys.argv[3:]
+    refresh = "--refresh" in flags
 
-    columns = getMeta(name, jdbcConfig)
+    if len(names) == 1 and "--details" not in flags:
+        print(getMeta(names[0], jdbcConfig, refresh))
+        return
 
-    print(columns)
+    tables = getTablesMeta(names, jdbcConfig, refresh)
+    print(json.dumps({name: meta.to_dict() for name, meta in tables.items()}))
 
     return
 
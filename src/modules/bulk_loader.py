@@ -0,0 +1,165 @@
+"""A module that writes DataFrames with the native bulk loaders of the databases
+"""
+import os
+import tempfile
+import jpype
+import jaydebeapi
+import numpy as np
+import pandas as pd
+
+from modules.metrics import ThroughputReporter
+
+# Marker that represents NULL values in the CSV stream
+NULL_MARKER = "\\N"
+
+
+class BulkLoader:
+    """
+    A class to represent a bulk loader that streams a DataFrame as CSV into the database
+
+    PostgreSQL is loaded through the CopyManager of its JDBC driver and H2, which can be used as
+    an embedded stand-in, through CSVREAD. Other databases are not supported.
+
+    Attributes
+    ----------
+    chunk_size : int
+        number of rows that are converted to CSV at once
+    """
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+
+    def dialect(self, conn: jaydebeapi.Connection):
+        """Method that returns the bulk load dialect of a connection
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+
+        Returns:
+            str: "postgresql", "h2" or None if the database has no supported bulk loader
+        """
+        product = str(conn.jconn.getMetaData().getDatabaseProductName()).lower()
+        for dialect in ("postgresql", "h2"):
+            if dialect in product:
+                return dialect
+        return None
+
+    def load(self, conn: jaydebeapi.Connection, df: pd.DataFrame, table: str):
+        """Method that bulk loads a DataFrame into a table
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            df (pd.DataFrame): Data to push
+            table (str): Name of the table that receives the data
+
+        Returns:
+            bool: False if the database has no supported bulk loader, True otherwise
+        """
+        dialect = self.dialect(conn)
+        if dialect is None:
+            return False
+
+        reporter = ThroughputReporter(f"Bulk loaded into {table}")
+        if dialect == "postgresql":
+            self.__copy_postgresql(conn, df, table, reporter)
+        else:
+            self.__csvread_h2(conn, df, table, reporter)
+        reporter.finish()
+        return True
+
+    def csv_chunks(self, df: pd.DataFrame, header: bool = False):
+        """Generator that converts a DataFrame into CSV chunks of `chunk_size` rows
+
+        NULL values are written as the unquoted NULL_MARKER, while all values of non-numeric columns are
+        quoted. Both loaders only read unquoted markers as NULL, so a "\\N" string stays a string.
+
+        Args:
+            df (pd.DataFrame): The data
+            header (bool, optional): Whether the first chunk starts with the column names
+
+        Yields:
+            (bytes,int): The UTF-8 encoded chunk and its number of rows
+        """
+        for start in range(0, max(len(df), 1), self.chunk_size):
+            chunk = df.iloc[start : start + self.chunk_size]
+            lines = None
+            for i in range(chunk.shape[1]):
+                fields = self.__csv_fields(chunk.iloc[:, i])
+                lines = fields if lines is None else lines + "," + fields
+            data = "\n".join(lines) + "\n" if lines is not None and len(lines) else ""
+            if header and start == 0:
+                data = ",".join(self.__quote(pd.Series([str(col) for col in df.columns]))) + "\n" + data
+            yield data.encode("utf-8"), len(chunk)
+
+    def __csv_fields(self, column: pd.Series):
+        """Method that encodes the values of a column as CSV fields
+
+        Args:
+            column (pd.Series): The values
+
+        Returns:
+            np.ndarray: The fields as Python strings
+        """
+        missing = column.isna().to_numpy()
+        if pd.api.types.is_float_dtype(column.dtype):
+            values = column.to_numpy()
+            # Integer columns with NULL values are floats, which integer columns do not accept
+            if np.array_equal(values, np.trunc(values), equal_nan=True):
+                column = column.astype("Int64")
+        if pd.api.types.is_numeric_dtype(column.dtype) or pd.api.types.is_bool_dtype(column.dtype):
+            fields = column.astype(str).to_numpy(dtype=object)
+        else:
+            fields = self.__quote(column.astype(str)).to_numpy(dtype=object)
+        fields[missing] = NULL_MARKER
+        return fields
+
+    def __quote(self, values: pd.Series):
+        return '"' + values.str.replace('"', '""', regex=False) + '"'
+
+    def __copy_postgresql(self, conn, df: pd.DataFrame, table: str, reporter: ThroughputReporter):
+        """Method that streams the CSV chunks into a COPY ... FROM STDIN statement
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            df (pd.DataFrame): Data to push
+            table (str): Name of the table that receives the data
+            reporter (ThroughputReporter): Progress reporter
+        """
+        copy_manager = jpype.JClass("org.postgresql.copy.CopyManager")
+        base_connection = jpype.JClass("org.postgresql.core.BaseConnection")
+
+        copy_query = f"COPY {table} FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')"
+        copy_in = copy_manager(conn.jconn.unwrap(base_connection)).copyIn(copy_query)
+        try:
+            for data, rows in self.csv_chunks(df):
+                copy_in.writeToCopy(jpype.JArray(jpype.JByte)(data), 0, len(data))
+                reporter.update(rows)
+            copy_in.endCopy()
+        finally:
+            if copy_in.isActive():
+                copy_in.cancelCopy()
+
+    def __csvread_h2(self, conn, df: pd.DataFrame, table: str, reporter: ThroughputReporter):
+        """Method that writes the CSV chunks to a temporary file and inserts it with CSVREAD
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            df (pd.DataFrame): Data to push
+            table (str): Name of the table that receives the data
+            reporter (ThroughputReporter): Progress reporter
+        """
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        try:
+            with os.fdopen(handle, "wb") as csv_file:
+                for data, rows in self.csv_chunks(df, header=True):
+                    csv_file.write(data)
+                    reporter.update(rows)
+
+            curs = conn.cursor()
+            curs.execute(
+                f"INSERT INTO {table} SELECT * FROM CSVREAD('{path}', NULL, "
+                f"'charset=UTF-8 nullString={NULL_MARKER}')"
+            )
+            curs.close()
+        finally:
+            os.remove(path)
@@ -0,0 +1,128 @@
+"""A module that samples synthetic data from a fitted synthesizer in parallel chunks
+"""
+import multiprocessing
+import pickle
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+# Fitted synthesizer of a sampling process, set by the pool initializer
+_SYNTH = None
+
+
+def _init_worker(synth_bytes: bytes):
+    global _SYNTH  # pylint: disable=global-statement
+    _SYNTH = pickle.loads(synth_bytes)
+
+
+def _seed_chunk(seed: int, chunk_index: int):
+    """Function that seeds all random generators the synthesizers draw from
+
+    Every chunk gets its own stream that only depends on the seed and the chunk index, hence the
+    sampled data does not depend on the number of workers.
+
+    Args:
+        seed (int): The seed of the sampling run
+        chunk_index (int): Position of the chunk
+    """
+    state = np.random.SeedSequence(seed, spawn_key=(chunk_index,)).generate_state(1)[0]
+    np.random.seed(state)
+    random.seed(int(state))
+    try:
+        import torch  # pylint: disable=import-outside-toplevel
+
+        torch.manual_seed(int(state))
+    except ImportError:
+        pass
+
+
+@contextmanager
+def _saved_rng_state():
+    """Context manager that restores the state of the random generators seeded by _seed_chunk on exit
+
+    Chunks that are sampled in the calling process must not change the random streams of later code.
+    """
+    numpy_state = np.random.get_state()
+    random_state = random.getstate()
+    try:
+        import torch  # pylint: disable=import-outside-toplevel
+
+        torch_state = torch.get_rng_state()
+    except ImportError:
+        torch = None
+    try:
+        yield
+    finally:
+        np.random.set_state(numpy_state)
+        random.setstate(random_state)
+        if torch is not None:
+            torch.set_rng_state(torch_state)
+
+
+def _sample_chunk(chunk_index: int, rows: int, seed: int, synth=None):
+    _seed_chunk(seed, chunk_index)
+    return pd.DataFrame((synth or _SYNTH).sample(rows))
+
+
+class ChunkSampler:
+    """
+    A class to represent a sampler that draws the rows of a fitted synthesizer chunk by chunk
+
+    Attributes
+    ----------
+    synth : Synthesizer
+        The fitted synthesizer including its transformer
+    chunk_rows : int
+        Number of rows per chunk
+    workers : int
+        Number of processes that sample concurrently, 1 samples in the calling process
+    seed : int
+        Seed of the random streams of the chunks
+    """
+
+    def __init__(self, synth, chunk_rows: int, workers: int = 1, seed: int = None):
+        self.synth = synth
+        self.chunk_rows = chunk_rows
+        self.workers = workers
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+
+    def chunks(self, rows: int):
+        """Generator that samples `rows` rows in order
+
+        At most two chunks per worker are sampled ahead, so the memory use does not depend on `rows`.
+
+        Args:
+            rows (int): Total number of rows
+
+        Yields:
+            pd.DataFrame: The next chunk of synthetic data
+        """
+        sizes = [min(self.chunk_rows, rows - start) for start in range(0, rows, self.chunk_rows)]
+        print(f"Sampling {rows} rows in {len(sizes)} chunks with seed {self.seed}")
+
+        if self.workers <= 1:
+            for chunk_index, size in enumerate(sizes):
+                with _saved_rng_state():
+                    chunk = _sample_chunk(chunk_index, size, self.seed, self.synth)
+                yield chunk
+            return
+
+        # Forking a process that runs a JVM is not safe, hence the workers are spawned
+        mp_context = multiprocessing.get_context("spawn")
+        synth_bytes = pickle.dumps(self.synth, protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(synth_bytes,),
+        ) as pool:
+            pending = deque()
+            for chunk_index, size in enumerate(sizes):
+                pending.append(pool.submit(_sample_chunk, chunk_index, size, self.seed))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
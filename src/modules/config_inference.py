@@ -0,0 +1,319 @@
+"""A module that infers the DP column classification and the continuous bins of a table
+"""
+from decimal import Decimal
+import jaydebeapi
+
+from configuration.configurations import (
+    ContinuousConfig,
+    ContinuousEntry,
+    DPColumnConfig,
+    DPConfig,
+    InferenceConfig,
+)
+from modules.db_metadata import ColumnMeta, MetadataCache
+from modules.jdbc_handler import JDBCHandler
+
+# Sources of the bounds of inferred continuous columns
+BOUND_SOURCES = ("dp", "type", "exact")
+# Number of aggregates per statement, wider tables are summarized by several statements
+MAX_AGGREGATES = 1000
+# Largest number of integer digits of a DECIMAL type whose range is used as bounds, the ranges of wider
+# types, e.g. of NUMERIC without precision, exceed the floats the preprocessor works with
+MAX_BOUND_DIGITS = 15
+
+# SQL types from java.sql.Types
+BOOLEAN_TYPES = {-7, 16}
+# Value range of the integer types
+INTEGER_RANGES = {
+    -6: (-(2**7), 2**7 - 1),
+    5: (-(2**15), 2**15 - 1),
+    4: (-(2**31), 2**31 - 1),
+    -5: (-(2**63), 2**63 - 1),
+}
+DECIMAL_TYPES = {2, 3}
+FLOAT_TYPES = {6, 7, 8}
+STRING_TYPES = {1, 12, -15, -9}
+
+
+class ColumnInference:
+    """
+    A class to represent the inferred classification of a column
+
+    Attributes
+    ----------
+    column : ColumnMeta
+        The metadata of the column
+    kind : str
+        Either "cat", "ord", "cont" or "hide"
+    reason : str
+        Why the column got its classification
+    distinct : int
+        Number of distinct values, None if they are not counted
+    domain : int
+        Number of values the synthesizer models for the column, None for hidden columns
+    entry : ContinuousEntry
+        The bins of a continuous column, None for other columns
+    """
+
+    def __init__(self, column: ColumnMeta, kind: str, reason: str, distinct: int = None, domain: int = None):
+        self.column = column
+        self.kind = kind
+        self.reason = reason
+        self.distinct = distinct
+        self.domain = domain
+        self.entry = None
+
+
+class ConfigInference:
+    """
+    A class to represent the inference of the DP configs of a table from its metadata and statistics
+
+    The column types are read from the DatabaseMetaData, the number of distinct values and the ranges of
+    numeric columns are aggregated by the database in a single statement. Categorical and ordinal columns
+    have at most `max_categories` values and continuous columns at most `bins` bins, which keeps the domain
+    of the synthesizer bounded. Columns that can not be bounded, e.g. keys, free text and timestamps, are
+    hidden. The classification is based on exact statistics, only the bounds can be differentially private.
+
+    Attributes
+    ----------
+    jdbc_handler : JDBCHandler
+        The JDBC connection information
+    inference_config : InferenceConfig
+        The inference options
+    """
+
+    def __init__(self, jdbc_handler: JDBCHandler, inference_config: InferenceConfig = None):
+        self.jdbc_handler = jdbc_handler
+        self.inference_config = inference_config or InferenceConfig()
+
+    def infer(self, anon_config: DPConfig, cont_config: ContinuousConfig):
+        """Method that completes the configs with the classification of all columns that are not configured
+
+        Columns that are classified by the anonymization config keep their classification and
+        the continuous config entries of configured columns are kept as well.
+
+        Args:
+            anon_config (DPConfig): The Differential privacy config
+            cont_config (ContinuousConfig): The continuous column config
+
+        Raises:
+            ValueError: Unknown bound source, unknown table, or bounds to estimate without a preprocessing budget
+
+        Returns:
+            (DPConfig,ContinuousConfig): The completed configs
+        """
+        options = self.inference_config
+        if options.bounds not in BOUND_SOURCES:
+            raise ValueError(f"Unknown bound source '{options.bounds}', expected one of {BOUND_SOURCES}")
+
+        table = anon_config.table_name
+        classification = anon_config.column_classification
+        configured = set(classification.hidden) | set(classification.categorical)
+        configured |= set(classification.continuous) | set(classification.ordinal)
+
+        meta = MetadataCache().tables(self.jdbc_handler, [table])[table]
+        if not meta.columns:
+            raise ValueError(f"Table {table} was not found in the database metadata")
+        columns = [col for col in meta.columns if col.name not in configured]
+        if not columns:
+            return anon_config, cont_config
+
+        # Key columns are hidden regardless of their statistics
+        primary_key = set(meta.primary_key)
+        self.jdbc_handler.start_jvm()
+        with self.jdbc_handler.connection() as conn:
+            statistics = self.__statistics(conn, table, [col for col in columns if col.name not in primary_key])
+        inferred = [self.__classify(col, statistics.get(col.name, {}), primary_key) for col in columns]
+
+        unbounded = [col.column.name for col in inferred if col.kind == "cont" and not col.entry.lower]
+        if unbounded and float(anon_config.preproc_eps) <= 0:
+            raise ValueError(
+                f"The bounds of {unbounded} are estimated with the preprocessing budget, please set preEps > 0"
+            )
+        if options.bounds == "exact":
+            print("The exact bounds of continuous columns are not differentially private")
+        self.__print_inference(table, inferred)
+
+        kinds = {kind: [] for kind in ("hide", "cat", "cont", "ord")}
+        for col in inferred:
+            kinds[col.kind].append(col.column.name)
+        anon_config = DPConfig(
+            anon_config.table_name,
+            anon_config.epsilon,
+            anon_config.preproc_eps,
+            anon_config.algorithm,
+            DPColumnConfig(
+                classification.hidden + kinds["hide"],
+                classification.categorical + kinds["cat"],
+                classification.continuous + kinds["cont"],
+                classification.ordinal + kinds["ord"],
+            ),
+            anon_config.cache_dir,
+            anon_config.sampling,
+            anon_config.fit_fraction,
+        )
+        entries = cont_config.columns if cont_config else []
+        entries = entries + [col.entry for col in inferred if col.entry is not None]
+        return anon_config, ContinuousConfig(entries)
+
+    def __statistics(self, conn: jaydebeapi.Connection, table: str, columns: list[ColumnMeta]):
+        """Method that aggregates the number of distinct values and the range of numeric columns
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            table (str): Name of the table
+            columns (list[ColumnMeta]): The columns to summarize
+
+        Returns:
+            dict: The "distinct", "min" and "max" aggregates per column name
+        """
+        aggregates = []
+        for col in columns:
+            modeled = self.__is_numeric(col) or col.jdbc_type in BOOLEAN_TYPES or col.jdbc_type in STRING_TYPES
+            if self.inference_config.count_distinct and modeled:
+                aggregates.append((col.name, "distinct", f"COUNT(DISTINCT {col.name})"))
+            if self.__is_numeric(col):
+                aggregates.append((col.name, "min", f"MIN({col.name})"))
+                aggregates.append((col.name, "max", f"MAX({col.name})"))
+
+        statistics = {}
+        for start in range(0, len(aggregates), MAX_AGGREGATES):
+            part = aggregates[start : start + MAX_AGGREGATES]
+            curs = conn.cursor()
+            try:
+                curs.execute(f"SELECT {', '.join(expression for _, _, expression in part)} FROM {table}")
+                row = curs.fetchone()
+            finally:
+                curs.close()
+            for (name, aggregate, _), value in zip(part, row):
+                statistics.setdefault(name, {})[aggregate] = value
+        return statistics
+
+    def __classify(self, col: ColumnMeta, statistics: dict, primary_key: set):
+        """Method that classifies a column that is not configured
+
+        Args:
+            col (ColumnMeta): The metadata of the column
+            statistics (dict): The aggregates of the column
+            primary_key (set[str]): The primary key columns of the table
+
+        Returns:
+            ColumnInference: The classification
+        """
+        options = self.inference_config
+        distinct = statistics.get("distinct")
+        distinct = None if distinct is None else int(distinct)
+        few_values = distinct is not None and distinct <= options.max_categories
+
+        if col.name in primary_key:
+            return ColumnInference(col, "hide", "primary key", distinct)
+        if distinct == 0:
+            return ColumnInference(col, "hide", "no values", distinct)
+        if col.jdbc_type in BOOLEAN_TYPES:
+            return ColumnInference(col, "cat", "boolean", distinct, distinct or 2)
+        if col.jdbc_type in STRING_TYPES:
+            if few_values:
+                return ColumnInference(col, "cat", "few values", distinct, distinct)
+            return ColumnInference(col, "hide", "too many values" if distinct else "uncounted string", distinct)
+        if not self.__is_numeric(col):
+            return ColumnInference(col, "hide", f"type {col.type_name}", distinct)
+
+        lower, upper = statistics.get("min"), statistics.get("max")
+        if few_values and is_integral(col) and lower is not None:
+            # Ordinal values are modeled over their whole range
+            if int(upper) - int(lower) < options.max_categories:
+                return ColumnInference(col, "ord", "narrow range", distinct, int(upper) - int(lower) + 1)
+            return ColumnInference(col, "cat", "few values", distinct, distinct)
+        if few_values and distinct <= options.bins:
+            return ColumnInference(col, "cat", "few values", distinct, distinct)
+
+        inference = ColumnInference(col, "cont", "numeric", distinct, options.bins)
+        inference.entry = ContinuousEntry(col.name, str(options.bins), *self.__bounds(col, lower, upper))
+        return inference
+
+    def __bounds(self, col: ColumnMeta, lower, upper):
+        """Method that returns the bounds of a continuous column as they appear in the continuous config
+
+        Args:
+            col (ColumnMeta): The metadata of the column
+            lower (int|float): Minimum of the column, None if it is not known
+            upper (int|float): Maximum of the column, None if it is not known
+
+        Returns:
+            (str,str): The bounds, empty if they are estimated with the preprocessing budget
+        """
+        source = self.inference_config.bounds
+        integral = is_integral(col)
+        if source == "exact" and lower is not None:
+            return format_bound(lower, integral), format_bound(upper, integral)
+        if source == "type":
+            bounds = type_bounds(col)
+            if bounds is not None:
+                return format_bound(bounds[0], integral), format_bound(bounds[1], integral)
+        # Floating point types have no useful bounds of their own
+        return "", ""
+
+    def __is_numeric(self, col: ColumnMeta):
+        return col.jdbc_type in INTEGER_RANGES or col.jdbc_type in DECIMAL_TYPES or col.jdbc_type in FLOAT_TYPES
+
+    def __print_inference(self, table: str, inferred: list[ColumnInference]):
+        print(f"Inferred classification of {table}:")
+        print(f"{'Column':<30}{'Type':>12}{'Distinct':>10}{'Class':>8}{'Domain':>8}  Reason")
+        for col in inferred:
+            distinct = "-" if col.distinct is None else col.distinct
+            domain = "-" if col.domain is None else col.domain
+            print(
+                f"{col.column.name:<30}{col.column.type_name:>12}{distinct:>10}{col.kind:>8}{domain:>8}  "
+                f"{col.reason}"
+            )
+
+
+def is_integral(col: ColumnMeta):
+    """Function that checks whether a column only holds integers according to its type
+
+    Args:
+        col (ColumnMeta): The metadata of the column
+
+    Returns:
+        bool: Whether the column is an integer column or a DECIMAL column with a scale of 0
+    """
+    return col.jdbc_type in INTEGER_RANGES or (col.jdbc_type in DECIMAL_TYPES and col.decimal_digits == 0)
+
+
+def type_bounds(col: ColumnMeta):
+    """Function that returns the range of the type of a numeric column
+
+    Args:
+        col (ColumnMeta): The metadata of the column
+
+    Returns:
+        (int|Decimal,int|Decimal): The bounds, None if the type has no range that is useful as bounds
+    """
+    if col.jdbc_type in INTEGER_RANGES:
+        return INTEGER_RANGES[col.jdbc_type]
+    if col.jdbc_type in DECIMAL_TYPES and col.size and col.decimal_digits is not None:
+        digits = col.size - col.decimal_digits
+        if digits <= MAX_BOUND_DIGITS:
+            high = Decimal(10) ** digits - Decimal(10) ** -col.decimal_digits
+            return -high, high
+    return None
+
+
+def format_bound(value, integral: bool):
+    """Function that writes a bound the way the preprocessor parses it
+
+    The preprocessor parses bounds with a decimal point as floats and all others as integers, hence the
+    bounds of columns that are not integral are written in positional notation with a decimal point.
+
+    Args:
+        value (int|float|Decimal): The bound
+        integral (bool): Whether the column only holds integers
+
+    Returns:
+        str: The bound
+    """
+    if integral:
+        return str(int(value))
+    # repr gives the shortest string of a float, the Decimal of it has no binary rounding noise
+    text = format(value if isinstance(value, Decimal) else Decimal(repr(float(value))), "f")
+    return text if "." in text else text + ".0"
@@ -0,0 +1,247 @@
+"""A module that computes the correlation maps of the evaluation report on wide tables
+"""
+import json
+import os
+import warnings
+import numpy as np
+import pandas as pd
+
+# Measures of the correlation engine, "pearson" correlates the absolute values and factorization codes of
+# all columns, "association" uses Cramér's V for pairs of categorical and the correlation ratio for mixed pairs
+METHODS = ("pearson", "association")
+# Number of columns per block of the matrix products
+BLOCK_COLUMNS = 256
+# Contingency tables with up to this many cells per row are counted densely
+DENSE_CELLS_PER_ROW = 4
+
+
+def blocked_pearson(values: np.ndarray, block_columns: int = BLOCK_COLUMNS):
+    """Function that computes the Pearson correlation of all columns in blocks of float32 matrix products
+
+    Like pd.DataFrame.corr, every pair of columns only takes the rows into account where both are present.
+
+    Args:
+        values (np.ndarray): Matrix with one column per column, NaN for missing values
+        block_columns (int, optional): Number of columns per block
+
+    Returns:
+        np.ndarray: The correlation matrix, NaN for pairs with less than two rows or without spread
+    """
+    with warnings.catch_warnings():
+        # Columns without values are not centered
+        warnings.simplefilter("ignore", RuntimeWarning)
+        means = np.nan_to_num(np.nanmean(values, axis=0, dtype=np.float64))
+    # Centered values keep the float32 sums accurate
+    centered = (values - means).astype(np.float32)
+    present = ~np.isnan(centered)
+    complete = bool(present.all())
+    filled = np.where(present, centered, np.float32(0))
+    mask = present.astype(np.float32)
+    squares = filled * filled
+
+    width = values.shape[1]
+    correlation = np.empty((width, width))
+    for i in range(0, width, block_columns):
+        rows_block = slice(i, i + block_columns)
+        for j in range(i, width, block_columns):
+            cols_block = slice(j, j + block_columns)
+            products = (filled[:, rows_block].T @ filled[:, cols_block]).astype(np.float64)
+            if complete:
+                # Without missing values all pairs share the rows and the sums of the columns
+                count = np.float64(len(values))
+                sums_i = filled[:, rows_block].sum(axis=0, dtype=np.float64)[:, None]
+                sums_j = filled[:, cols_block].sum(axis=0, dtype=np.float64)[None, :]
+                squares_i = squares[:, rows_block].sum(axis=0, dtype=np.float64)[:, None]
+                squares_j = squares[:, cols_block].sum(axis=0, dtype=np.float64)[None, :]
+            else:
+                count = (mask[:, rows_block].T @ mask[:, cols_block]).astype(np.float64)
+                sums_i = (filled[:, rows_block].T @ mask[:, cols_block]).astype(np.float64)
+                sums_j = (mask[:, rows_block].T @ filled[:, cols_block]).astype(np.float64)
+                squares_i = (squares[:, rows_block].T @ mask[:, cols_block]).astype(np.float64)
+                squares_j = (mask[:, rows_block].T @ squares[:, cols_block]).astype(np.float64)
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                block = (count * products - sums_i * sums_j) / np.sqrt(
+                    (count * squares_i - sums_i**2) * (count * squares_j - sums_j**2)
+                )
+            block[np.broadcast_to(count, block.shape) < 2] = np.nan
+            correlation[rows_block, cols_block] = block
+            correlation[cols_block, rows_block] = block.T
+    return np.clip(correlation, -1, 1)
+
+
+def cramers_v(codes_a: np.ndarray, size_a: int, codes_b: np.ndarray, size_b: int):
+    """Function that computes Cramér's V of two factorized columns
+
+    Args:
+        codes_a (np.ndarray): Codes of the first column in [0, size_a)
+        size_a (int): Number of distinct values of the first column
+        codes_b (np.ndarray): Codes of the second column in [0, size_b)
+        size_b (int): Number of distinct values of the second column
+
+    Returns:
+        float: The association in [0, 1], NaN if a column has only one value
+    """
+    rows = len(codes_a)
+    if rows == 0 or min(size_a, size_b) < 2:
+        return np.nan
+    cells = codes_a * np.int64(size_b) + codes_b
+    if size_a * size_b <= DENSE_CELLS_PER_ROW * rows:
+        table = np.bincount(cells, minlength=size_a * size_b)
+        cells = np.flatnonzero(table)
+        observed = table[cells]
+    else:
+        cells, observed = np.unique(cells, return_counts=True)
+    totals_a = np.bincount(codes_a, minlength=size_a)
+    totals_b = np.bincount(codes_b, minlength=size_b)
+    expected = totals_a[cells // size_b].astype(np.float64) * totals_b[cells % size_b]
+    phi_squared = (observed.astype(np.float64) ** 2 / expected).sum() - 1
+    return float(np.sqrt(max(phi_squared, 0.0) / (min(size_a, size_b) - 1)))
+
+
+def correlation_ratios(codes: np.ndarray, values: np.ndarray):
+    """Function that computes the correlation ratio of a factorized column and every numeric column
+
+    Args:
+        codes (np.ndarray): Codes of the categorical column
+        values (np.ndarray): Matrix of the numeric columns, NaN for missing values
+
+    Returns:
+        np.ndarray: The correlation ratio in [0, 1] per numeric column, NaN for columns without spread
+    """
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0).astype(np.float64)
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0]) if len(codes) else np.empty(0, np.intp)
+    if len(starts) == 0:
+        return np.full(values.shape[1], np.nan)
+
+    # Sums per distinct value and numeric column
+    group_counts = np.add.reduceat(present[order].astype(np.float64), starts, axis=0)
+    group_sums = np.add.reduceat(filled[order], starts, axis=0)
+    counts = group_counts.sum(axis=0)
+    sums = group_sums.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        between = np.nansum(np.where(group_counts > 0, group_sums**2 / group_counts, 0), axis=0) - sums**2 / counts
+        total = (filled**2).sum(axis=0) - sums**2 / counts
+        ratios = np.sqrt(np.clip(between / total, 0, 1))
+    ratios[(counts < 2) | (total <= 0)] = np.nan
+    return ratios
+
+
+def save_matrix(matrix: pd.DataFrame, output_dir: str, name: str):
+    """Function that writes a correlation matrix as <name>.json with the column names and as <name>.npy
+
+    Args:
+        matrix (pd.DataFrame): The correlation matrix
+        output_dir (str): The directory
+        name (str): The file name without extension
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    values = matrix.to_numpy(dtype=np.float64)
+    np.save(os.path.join(output_dir, f"{name}.npy"), values, allow_pickle=False)
+    rows = [[None if np.isnan(value) else float(value) for value in row] for row in values]
+    with open(os.path.join(output_dir, f"{name}.json"), "w", encoding="utf-8") as outfile:
+        json.dump({"columns": [str(col) for col in matrix.columns], "matrix": rows}, outfile)
+
+
+def load_matrix(output_dir: str, name: str):
+    """Function that reads a correlation matrix written by save_matrix
+
+    Args:
+        output_dir (str): The directory
+        name (str): The file name without extension
+
+    Returns:
+        pd.DataFrame: The correlation matrix
+    """
+    with open(os.path.join(output_dir, f"{name}.json"), "r", encoding="utf-8") as infile:
+        columns = json.load(infile)["columns"]
+    values = np.load(os.path.join(output_dir, f"{name}.npy"), allow_pickle=False)
+    return pd.DataFrame(values, index=columns, columns=columns)
+
+
+class CorrelationEngine:
+    """
+    A class to represent the computation of the correlation matrix of a table
+
+    Attributes
+    ----------
+    method : str
+        One of METHODS
+    sample_rows : int
+        Number of random rows the matrix is computed on, None uses all rows
+    block_columns : int
+        Number of columns per block of the matrix products
+    seed : int
+        Seed of the row sample
+    """
+
+    def __init__(
+        self, method: str = "pearson", sample_rows: int = None, block_columns: int = BLOCK_COLUMNS, seed: int = 0
+    ):
+        if method not in METHODS:
+            raise ValueError(f"Unknown correlation method '{method}', expected one of {METHODS}")
+        self.method = method
+        self.sample_rows = sample_rows
+        self.block_columns = block_columns
+        self.seed = seed
+
+    def matrix(self, dataset: pd.DataFrame, categorical: list[str]):
+        """Method that computes the correlation matrix of all columns
+
+        Args:
+            dataset (pd.DataFrame): The data
+            categorical (list[str]): The columns that are factorized, all others are numeric
+
+        Returns:
+            pd.DataFrame: The correlation matrix
+        """
+        if self.sample_rows is not None and len(dataset) > self.sample_rows:
+            dataset = dataset.sample(n=self.sample_rows, random_state=self.seed)
+
+        columns = list(dataset.columns)
+        categorical = set(categorical)
+        if self.method == "pearson":
+            values = np.empty((len(dataset), len(columns)), dtype=np.float32)
+            for i, col in enumerate(columns):
+                values[:, i] = self.__values(dataset[col], col in categorical)
+            # The codes of missing values are -1, their absolute value is correlated as well
+            correlation = blocked_pearson(np.abs(values), self.block_columns)
+            return pd.DataFrame(correlation, index=columns, columns=columns)
+
+        return self.__association(dataset, columns, categorical)
+
+    def __association(self, dataset: pd.DataFrame, columns: list, categorical: set):
+        numeric = [col for col in columns if col not in categorical]
+        factorized = [col for col in columns if col in categorical]
+        values = np.empty((len(dataset), len(numeric)), dtype=np.float32)
+        for i, col in enumerate(numeric):
+            values[:, i] = self.__values(dataset[col], False)
+        codes = {}
+        for col in factorized:
+            col_codes, uniques = pd.factorize(dataset[col])
+            if (col_codes < 0).any():
+                # Missing values are a category of their own
+                codes[col] = (col_codes + 1, len(uniques) + 1)
+            else:
+                codes[col] = (col_codes, len(uniques))
+
+        association = pd.DataFrame(np.nan, index=columns, columns=columns)
+        association.loc[numeric, numeric] = np.abs(blocked_pearson(values, self.block_columns))
+        for i, col in enumerate(factorized):
+            col_codes, size = codes[col]
+            ratios = correlation_ratios(col_codes, values)
+            association.loc[col, numeric] = ratios
+            association.loc[numeric, col] = ratios
+            for other in factorized[i:]:
+                other_codes, other_size = codes[other]
+                strength = cramers_v(col_codes, size, other_codes, other_size)
+                association.loc[col, other] = strength
+                association.loc[other, col] = strength
+        return association
+
+    def __values(self, column: pd.Series, categorical: bool):
+        if categorical:
+            return pd.factorize(column)[0]
+        return column.to_numpy(dtype=np.float64, na_value=np.nan)
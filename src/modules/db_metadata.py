@@ -0,0 +1,480 @@
+"""A module that reads table metadata from the JDBC DatabaseMetaData and caches it per database
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import jaydebeapi
+
+DEFAULT_METADATA_DIR = "../output/metadata"
+# Seconds after which cached metadata is read from the database again
+DEFAULT_METADATA_AGE = 600
+# Value of the TYPE column of DatabaseMetaData.getIndexInfo for the row that describes the table itself
+TABLE_INDEX_STATISTIC = 0
+# Value of the NULLABLE column of DatabaseMetaData.getColumns for columns that accept NULL
+COLUMN_NULLABLE = 1
+
+# Query of the estimated number of rows of MySQL and MariaDB
+MYSQL_ROW_ESTIMATE = (
+    "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{table}'"
+)
+# Catalog queries of the estimated number of rows per database product, which do not report
+# table statistics through getIndexInfo
+ROW_ESTIMATE_QUERIES = {
+    "postgresql": "SELECT reltuples FROM pg_class WHERE oid = to_regclass('{table}')",
+    "mysql": MYSQL_ROW_ESTIMATE,
+    "mariadb": MYSQL_ROW_ESTIMATE,
+}
+
+_MEMORY_LOCK = threading.Lock()
+_MEMORY = {}
+
+
+class ColumnMeta:
+    """
+    A class to represent the metadata of a column
+
+    Attributes
+    ----------
+    name : str
+        Name of the column
+    jdbc_type : int
+        SQL type from java.sql.Types
+    type_name : str
+        Name of the type in the database
+    nullable : bool
+        Whether the column accepts NULL, None if the database does not know
+    size : int
+        Column size, i.e. the precision of numbers or the length of strings, None if not applicable
+    decimal_digits : int
+        Number of fractional digits, None if not applicable
+    """
+
+    def __init__(
+        self,
+        name: str,
+        jdbc_type: int,
+        type_name: str,
+        nullable: bool = None,
+        size: int = None,
+        decimal_digits: int = None,
+    ):
+        self.name = name
+        self.jdbc_type = jdbc_type
+        self.type_name = type_name
+        self.nullable = nullable
+        self.size = size
+        self.decimal_digits = decimal_digits
+
+    def to_dict(self):
+        """Method that returns the metadata as a JSON dictionary
+
+        Returns:
+            dict: The metadata
+        """
+        return {
+            "name": self.name,
+            "jdbcType": self.jdbc_type,
+            "typeName": self.type_name,
+            "nullable": self.nullable,
+            "size": self.size,
+            "decimalDigits": self.decimal_digits,
+        }
+
+    @classmethod
+    def from_dict(cls, dict_object: dict):
+        """Method that restores the metadata from a JSON dictionary written by to_dict
+
+        Args:
+            dict_object (dict): The metadata
+
+        Returns:
+            ColumnMeta: The metadata
+        """
+        return cls(
+            dict_object["name"],
+            dict_object["jdbcType"],
+            dict_object["typeName"],
+            dict_object.get("nullable"),
+            dict_object.get("size"),
+            dict_object.get("decimalDigits"),
+        )
+
+
+class TableMeta:
+    """
+    A class to represent the metadata of a table
+
+    Attributes
+    ----------
+    name : str
+        Name of the table as requested
+    columns : list[ColumnMeta]
+        The columns in their order in the table
+    primary_key : list[str]
+        The primary key columns in key order
+    foreign_keys : list[dict]
+        The imported keys with "column", "refTable" and "refColumn"
+    row_estimate : int
+        Estimated number of rows from the statistics of the database, None if there are none
+    fetched : float
+        Time at which the metadata was read from the database
+    """
+
+    def __init__(
+        self,
+        name: str,
+        columns: list[ColumnMeta],
+        primary_key: list[str],
+        foreign_keys: list[dict],
+        row_estimate: int = None,
+        fetched: float = None,
+    ):
+        self.name = name
+        self.columns = columns
+        self.primary_key = primary_key
+        self.foreign_keys = foreign_keys
+        self.row_estimate = row_estimate
+        self.fetched = time.time() if fetched is None else fetched
+
+    def column_names(self):
+        """Method that returns the names of the columns
+
+        Returns:
+            list[str]: The names
+        """
+        return [col.name for col in self.columns]
+
+    def to_dict(self):
+        """Method that returns the metadata as a JSON dictionary
+
+        Returns:
+            dict: The metadata
+        """
+        return {
+            "name": self.name,
+            "columns": [col.to_dict() for col in self.columns],
+            "primaryKey": self.primary_key,
+            "foreignKeys": self.foreign_keys,
+            "rowEstimate": self.row_estimate,
+            "fetched": self.fetched,
+        }
+
+    @classmethod
+    def from_dict(cls, dict_object: dict):
+        """Method that restores the metadata from a JSON dictionary written by to_dict
+
+        Args:
+            dict_object (dict): The metadata
+
+        Returns:
+            TableMeta: The metadata
+        """
+        return cls(
+            dict_object["name"],
+            [ColumnMeta.from_dict(col) for col in dict_object["columns"]],
+            dict_object["primaryKey"],
+            dict_object["foreignKeys"],
+            dict_object.get("rowEstimate"),
+            dict_object["fetched"],
+        )
+
+
+def read_tables_metadata(conn: jaydebeapi.Connection, tables: list[str], row_estimates: bool = True):
+    """Function that reads the metadata of tables from the DatabaseMetaData of a connection
+
+    No query touches the tables themselves, so views and partitioned tables cause no work on the server.
+    Tables that are not found have no columns.
+
+    Args:
+        conn (jaydebeapi.Connection): Connection to the database
+        tables (list[str]): Names of the tables, optionally qualified by their schema
+        row_estimates (bool, optional): Whether the estimated number of rows is read from the statistics
+
+    Returns:
+        dict: The TableMeta per table name
+    """
+    meta = conn.jconn.getMetaData()
+    product = str(meta.getDatabaseProductName()).lower()
+    current_schema = _current_schema(conn)
+    result = {}
+    for table in tables:
+        schema, name, columns = _resolve_columns(meta, table, current_schema)
+        if not columns:
+            result[table] = TableMeta(table, [], [], [])
+            continue
+        result[table] = TableMeta(
+            table,
+            columns,
+            _primary_key(meta, schema, name),
+            _foreign_keys(meta, schema, name),
+            _row_estimate(conn, meta, product, schema, name) if row_estimates else None,
+        )
+    return result
+
+
+def _current_schema(conn: jaydebeapi.Connection):
+    try:
+        schema = conn.jconn.getSchema()
+    except Exception:  # pylint: disable=broad-exception-caught
+        # Drivers before JDBC 4.1 do not know the current schema
+        return None
+    return str(schema) if schema is not None else None
+
+
+def _resolve_columns(meta, table: str, current_schema: str):
+    """Function that looks up the columns of a table under the spellings a database may store it as
+
+    Tables without a schema are looked up in the current schema of the connection first.
+
+    Args:
+        meta (java.sql.DatabaseMetaData): The metadata of the connection
+        table (str): Name of the table, optionally qualified by its schema
+        current_schema (str): Current schema of the connection, None if it is unknown
+
+    Returns:
+        (str,str,list[ColumnMeta]): The schema and table name as stored and the columns, which are empty
+        if the table is not found
+    """
+    schema, _, name = table.rpartition(".")
+    schemas = [None] if schema else list(dict.fromkeys([current_schema, None]))
+    for default_schema in schemas:
+        # Databases store unquoted identifiers either in lower or in upper case
+        for case in (str, str.lower, str.upper):
+            candidate = case(name)
+            found_schema, columns = _columns(meta, case(schema) if schema else default_schema, candidate)
+            if columns:
+                return found_schema, candidate, columns
+    return schema or None, name, []
+
+
+def _columns(meta, schema: str, table: str):
+    """Function that reads the columns of a table
+
+    Args:
+        meta (java.sql.DatabaseMetaData): The metadata of the connection
+        schema (str): Schema of the table as stored, None searches all schemas
+        table (str): Name of the table as stored
+
+    Returns:
+        (str,list[ColumnMeta]): The schema the columns belong to and the columns in their order, only the
+        first schema is taken if the table exists in several
+    """
+    rs = meta.getColumns(None, schema, table, "%")
+    columns = []
+    try:
+        while rs.next():
+            # Underscores in the name are wildcards of the pattern
+            if str(rs.getString("TABLE_NAME")) != table:
+                continue
+            found_schema = rs.getString("TABLE_SCHEM")
+            found_schema = None if found_schema is None else str(found_schema)
+            if columns and found_schema != schema:
+                continue
+            schema = found_schema
+            nullable = rs.getInt("NULLABLE")
+            size = rs.getInt("COLUMN_SIZE")
+            size = None if rs.wasNull() else int(size)
+            digits = rs.getInt("DECIMAL_DIGITS")
+            digits = None if rs.wasNull() else int(digits)
+            columns.append(
+                (
+                    int(rs.getInt("ORDINAL_POSITION")),
+                    ColumnMeta(
+                        str(rs.getString("COLUMN_NAME")),
+                        int(rs.getInt("DATA_TYPE")),
+                        str(rs.getString("TYPE_NAME")),
+                        None if nullable > COLUMN_NULLABLE else nullable == COLUMN_NULLABLE,
+                        size,
+                        digits,
+                    ),
+                )
+            )
+    finally:
+        rs.close()
+    return schema, [col for _, col in sorted(columns, key=lambda entry: entry[0])]
+
+
+def _primary_key(meta, schema: str, table: str):
+    rs = meta.getPrimaryKeys(None, schema, table)
+    keys = []
+    try:
+        while rs.next():
+            keys.append((int(rs.getInt("KEY_SEQ")), str(rs.getString("COLUMN_NAME"))))
+    finally:
+        rs.close()
+    return [name for _, name in sorted(keys)]
+
+
+def _foreign_keys(meta, schema: str, table: str):
+    rs = meta.getImportedKeys(None, schema, table)
+    keys = []
+    try:
+        while rs.next():
+            keys.append(
+                {
+                    "column": str(rs.getString("FKCOLUMN_NAME")),
+                    "refTable": str(rs.getString("PKTABLE_NAME")),
+                    "refColumn": str(rs.getString("PKCOLUMN_NAME")),
+                }
+            )
+    finally:
+        rs.close()
+    return keys
+
+
+def _row_estimate(conn: jaydebeapi.Connection, meta, product: str, schema: str, table: str):
+    """Function that reads the estimated number of rows of a table from the statistics of the database
+
+    Args:
+        conn (jaydebeapi.Connection): Connection to the database
+        meta (java.sql.DatabaseMetaData): The metadata of the connection
+        product (str): Lower case name of the database product
+        schema (str): Schema of the table as stored, None for the default schema
+        table (str): Name of the table as stored
+
+    Returns:
+        int: The estimate, None if the database keeps no statistics of the table
+    """
+    try:
+        for name, query in ROW_ESTIMATE_QUERIES.items():
+            if name in product:
+                qualified = f"{schema}.{table}" if schema else table
+                curs = conn.cursor()
+                try:
+                    curs.execute(query.format(table=qualified if name == "postgresql" else table))
+                    row = curs.fetchone()
+                finally:
+                    curs.close()
+                # Tables that were never analyzed have no or a negative estimate
+                return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+        # The approximate statistics are allowed to be out of date, so the driver does not count the rows
+        rs = meta.getIndexInfo(None, schema, table, False, True)
+        try:
+            while rs.next():
+                if rs.getInt("TYPE") == TABLE_INDEX_STATISTIC:
+                    cardinality = rs.getLong("CARDINALITY")
+                    return None if rs.wasNull() else int(cardinality)
+        finally:
+            rs.close()
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        print(f"No row estimate for {table}: {error}", file=sys.stderr)
+    return None
+
+
+class MetadataCache:
+    """
+    A class to represent the table metadata of databases, kept in memory and in a directory
+
+    The metadata is cached per connection URL and user, so other processes such as the next call of
+    meta_from_DB.py get it without starting the JVM. No credentials are written to the directory.
+
+    Attributes
+    ----------
+    cache_dir : str
+        Directory that holds one JSON file per database, None keeps the metadata in memory only
+    max_age : float
+        Seconds after which cached metadata is read from the database again, None never expires it
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_METADATA_DIR, max_age: float = DEFAULT_METADATA_AGE):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+
+    def tables(self, handler, tables: list[str], refresh: bool = False):
+        """Method that returns the metadata of tables, reading only the missing or expired ones from the database
+
+        All missing tables are read over one connection, which is only opened if there are any.
+
+        Args:
+            handler (JDBCHandler): Handler of the database
+            tables (list[str]): Names of the tables, optionally qualified by their schema
+            refresh (bool, optional): Whether the metadata is read from the database regardless of the cache
+
+        Returns:
+            dict: The TableMeta per table name in the requested order
+        """
+        key = self.key(handler.url, handler.username)
+        cached = {} if refresh else self.__load(key)
+        now = time.time()
+        missing = [
+            table
+            for table in tables
+            if table not in cached
+            or (self.max_age is not None and now - cached[table].fetched > self.max_age)
+            # Tables that did not exist may have been created since
+            or not cached[table].columns
+        ]
+        if missing:
+            handler.start_jvm()
+            with handler.connection() as conn:
+                fetched = read_tables_metadata(conn, list(dict.fromkeys(missing)))
+            self.__store(key, fetched)
+            cached = {**cached, **fetched}
+        return {table: cached[table] for table in tables}
+
+    def invalidate(self, url: str, username: str):
+        """Method that drops the cached metadata of a database
+
+        Args:
+            url (str): Connection URL of the database
+            username (str): Database user
+        """
+        key = self.key(url, username)
+        with _MEMORY_LOCK:
+            _MEMORY.pop(key, None)
+        if self.cache_dir:
+            try:
+                os.remove(self.__path(key))
+            except FileNotFoundError:
+                pass
+
+    def key(self, url: str, username: str):
+        """Method that derives the cache key of a database
+
+        Args:
+            url (str): Connection URL of the database
+            username (str): Database user, whose privileges decide which tables are visible
+
+        Returns:
+            str: The cache key
+        """
+        return hashlib.sha256(json.dumps([url, username]).encode()).hexdigest()
+
+    def __load(self, key: str):
+        with _MEMORY_LOCK:
+            if key in _MEMORY:
+                return dict(_MEMORY[key])
+        if not self.cache_dir or not os.path.exists(self.__path(key)):
+            return {}
+        try:
+            with open(self.__path(key), "r", encoding="utf-8") as infile:
+                tables = json.load(infile)["tables"]
+            loaded = {name: TableMeta.from_dict(entry) for name, entry in tables.items()}
+        except (OSError, ValueError, KeyError) as error:
+            print(f"Ignoring unreadable metadata cache {self.__path(key)}: {error}", file=sys.stderr)
+            return {}
+        with _MEMORY_LOCK:
+            _MEMORY.setdefault(key, {}).update(loaded)
+            return dict(_MEMORY[key])
+
+    def __store(self, key: str, fetched: dict):
+        with _MEMORY_LOCK:
+            entries = _MEMORY.setdefault(key, {})
+            entries.update(fetched)
+            tables = {name: entry.to_dict() for name, entry in entries.items()}
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.__path(key)
+        # Concurrent calls must never read a partially written file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as outfile:
+            json.dump({"tables": tables}, outfile)
+        os.replace(tmp_path, path)
+
+    def __path(self, key: str):
+        return os.path.join(self.cache_dir, f"{key}.json")
@@ -2,9 +2,71 @@
 """
 import time
 from snsynth import Synthesizer
+import numpy as np
 import pandas as pd
-from configuration.configurations import DPConfig, ContinuousConfig
+from configuration.configurations import DPConfig, ContinuousConfig, SamplingConfig
 from modules.preprocessor import Preprocessor
+from modules.chunk_sampler import ChunkSampler
+from modules.model_cache import ModelCache, data_fingerprint
+
+
+def amplified_epsilon(epsilon: float, fraction: float):
+    """Function that returns the privacy budget of a mechanism that runs on a Poisson subsample
+
+    Args:
+        epsilon (float): Privacy budget of the mechanism on the subsample
+        fraction (float): Probability of a row to be part of the subsample
+
+    Returns:
+        float: The privacy budget with respect to the full table
+    """
+    return float(np.log1p(fraction * np.expm1(epsilon)))
+
+
+def subsample_epsilon(epsilon: float, fraction: float):
+    """Function that returns the privacy budget a mechanism on a Poisson subsample may spend
+
+    It is the inverse of amplified_epsilon.
+
+    Args:
+        epsilon (float): Privacy budget with respect to the full table
+        fraction (float): Probability of a row to be part of the subsample
+
+    Returns:
+        float: The privacy budget of the mechanism on the subsample
+    """
+    return float(np.log1p(np.expm1(epsilon) / fraction))
+
+
+def continued_values(values: pd.Series, positions: np.ndarray):
+    """Function that takes the values of a hidden column at positions that may lie beyond its end
+
+    Positions beyond the end continue integer columns after their largest value and repeat the values
+    of string columns with the number of the repetition as suffix, so keys stay unique if more rows
+    than the table has are sampled. Values of other columns are repeated cyclically.
+
+    Args:
+        values (pd.Series): The values of the column
+        positions (np.ndarray): The positions to take
+
+    Returns:
+        np.ndarray: The values at the positions
+    """
+    count = max(len(values), 1)
+    taken = values.iloc[positions % count].to_numpy()
+    beyond = positions >= count
+    if not beyond.any():
+        return taken
+
+    if pd.api.types.is_integer_dtype(values.dtype):
+        taken[beyond] = values.max() + 1 + positions[beyond] - count
+    elif pd.api.types.is_string_dtype(values):
+        taken = taken.astype(object)
+        taken[beyond] = [
+            None if value is None else f"{value}_{repetition}"
+            for value, repetition in zip(taken[beyond], (positions[beyond] // count).tolist())
+        ]
+    return taken
 
 
 class DifferentialPrivacyAnonymizer:
@@ -19,6 +81,11 @@ class DifferentialPrivacyAnonymizer:
         The configuration options
     cont_config : ContinuousConfig
         The configuration options for continuous columns
+    population : pd.DataFrame
+        The hidden columns of the full table if dataset is a subsample of `fit_fraction`, which has
+        one row per row of the table. The anonymized data has as many rows as the population.
+    spent_epsilon : float
+        The privacy budget spent by the last anonymization run
     
     """
     def __init__(
@@ -26,10 +93,13 @@ class DifferentialPrivacyAnonymizer:
         dataset: pd.DataFrame,
         anon_config: DPConfig,
         cont_config: ContinuousConfig,
+        population: pd.DataFrame = None,
     ):
         self.dataset = dataset
         self.anon_config = anon_config
         self.cont_config = cont_config
+        self.population = population
+        self.spent_epsilon = 0.0
 
     def run_anonymization(self):
         """Method that starts the anonymization process
@@ -37,49 +107,15 @@ class DifferentialPrivacyAnonymizer:
         Returns:
             pd.DataFrame: Differentially private data
         """
-
-        alg = self.anon_config.algorithm
-        eps = float(self.anon_config.epsilon)
-        pre_eps = float(self.anon_config.preproc_eps)
-        cat = self.anon_config.column_classification.categorical
-        cont = self.anon_config.column_classification.continuous
-        ordi = self.anon_config.column_classification.ordinal
-
+        rows = self.__table_rows()
         saved_columns, saved_indexes = self.__remove_ignorable()
 
-        nullable_flag = self.dataset.isnull().values.any()
-
-        anon_data = pd.DataFrame()
-
+        eps = float(self.anon_config.epsilon)
         if eps > 0:
             # For epsilon > 0 we run the anonymization
-            synth = Synthesizer.create(alg, epsilon=eps, verbose=True)
             start_time = time.perf_counter()
-
-            # If there is a preprocessing configuration for continuous columns, we need the Preprocessor
-            if self.cont_config:
-                sample = synth.fit_sample(
-                    self.dataset,
-                    preprocessor_eps=pre_eps,
-                    categorical_columns=cat,
-                    continuous_columns=cont,
-                    ordinal_columns=ordi,
-                    transformer=Preprocessor(self.anon_config).get_transformer(
-                        self.dataset, self.cont_config
-                    ),
-                    nullable=nullable_flag,
-                )
-                anon_data = pd.DataFrame(sample)
-            else:
-                sample = synth.fit_sample(
-                    self.dataset,
-                    preprocessor_eps=pre_eps,
-                    categorical_columns=cat,
-                    continuous_columns=cont,
-                    ordinal_columns=ordi,
-                    nullable=nullable_flag,
-                )
-                anon_data = pd.DataFrame(sample)
+            synth = self.__fit()
+            anon_data = pd.DataFrame(synth.sample(rows))
 
             end_time = time.perf_counter()
             print(f"Process took: {(end_time-start_time):0.2f} seconds")
@@ -92,20 +128,133 @@ class DifferentialPrivacyAnonymizer:
 
         return anon_data
 
+    def iter_anonymization(self):
+        """Generator that fits once and samples the size given by the sampling config chunk by chunk
+
+        Hidden columns are continued by continued_values if more rows than the table has are sampled.
+
+        Yields:
+            pd.DataFrame: The next chunk of differentially private data
+        """
+        sampling = self.anon_config.sampling or SamplingConfig()
+        rows = sampling.target_rows(self.__table_rows())
+        saved_columns, saved_indexes = self.__remove_ignorable()
+
+        if float(self.anon_config.epsilon) > 0:
+            start_time = time.perf_counter()
+            sampler = ChunkSampler(self.__fit(), sampling.chunk_rows, sampling.workers, sampling.seed)
+            chunks = sampler.chunks(rows)
+        else:
+            print("Epsilon = 0. Anonymization will return the original data")
+            start_time = time.perf_counter()
+            positions = np.arange(rows) % max(len(self.dataset), 1)
+            chunks = (
+                self.dataset.iloc[positions[start : start + sampling.chunk_rows]].reset_index(drop=True)
+                for start in range(0, rows, sampling.chunk_rows)
+            )
+
+        offset = 0
+        for anon_data in chunks:
+            yield self.__add_ignorable(anon_data, saved_indexes, saved_columns, offset)
+            offset += len(anon_data)
+
+        end_time = time.perf_counter()
+        print(f"Process took: {(end_time-start_time):0.2f} seconds")
+
+    def __fit(self):
+        """Method that fits a synthesizer or loads it from the model cache
+
+        Returns:
+            Synthesizer: The fitted synthesizer including its transformer
+        """
+        alg = self.anon_config.algorithm
+        eps = float(self.anon_config.epsilon)
+        pre_eps = float(self.anon_config.preproc_eps)
+        cat = self.anon_config.column_classification.categorical
+        cont = self.anon_config.column_classification.continuous
+        ordi = self.anon_config.column_classification.ordinal
+
+        nullable_flag = any(column.hasnans for _, column in self.dataset.items())
+
+        cache = ModelCache(self.anon_config.cache_dir) if self.anon_config.cache_dir else None
+        cache_key = None
+        synth = None
+        if cache is not None:
+            cache_key = cache.key(self.anon_config, self.cont_config, data_fingerprint(self.dataset))
+            synth = cache.load(cache_key)
+
+        if synth is not None:
+            print("Loaded the fitted synthesizer from the model cache")
+            return synth
+
+        fit_eps = eps
+        if self.population is not None:
+            # Fitting on a subsample amplifies the privacy, which allows a larger budget on the subsample
+            fraction = float(self.anon_config.fit_fraction)
+            fit_eps = subsample_epsilon(eps, fraction)
+            print(
+                f"Fitting on {len(self.dataset)} of {len(self.population)} rows with epsilon {fit_eps:0.3f}, "
+                f"which amounts to epsilon {amplified_epsilon(fit_eps, fraction):0.3f} on the full table"
+            )
+
+        synth = Synthesizer.create(alg, epsilon=fit_eps, verbose=True)
+
+        # If there is a preprocessing configuration for continuous columns, we need the Preprocessor
+        transformer = None
+        if self.cont_config:
+            transformer = Preprocessor(self.anon_config).get_transformer(
+                self.dataset, self.cont_config
+            )
+        synth.fit(
+            self.dataset,
+            preprocessor_eps=pre_eps,
+            categorical_columns=cat,
+            continuous_columns=cont,
+            ordinal_columns=ordi,
+            transformer=transformer,
+            nullable=nullable_flag,
+        )
+        # The preprocessing budget is part of epsilon
+        self.spent_epsilon = eps
+
+        if cache is not None:
+            # The fitted transformer is stored as part of the synthesizer
+            cache.store(cache_key, synth)
+        return synth
+
+    def __table_rows(self):
+        if self.population is not None:
+            return len(self.population)
+        return len(self.dataset)
+
     def __remove_ignorable(self):
         saved_columns = []
         saved_indexes = []
         ignore_columns = self.anon_config.column_classification.hidden
         if ignore_columns:
-            saved_columns = self.dataset[ignore_columns]
+            # Hidden columns of a subsample are taken from the full table
+            saved_columns = self.population
+            if saved_columns is None:
+                saved_columns = pd.DataFrame({col: self.dataset[col] for col in ignore_columns}, copy=False)
             for col in ignore_columns:
                 saved_indexes.append(self.dataset.columns.get_loc(col))
 
-        self.dataset = self.dataset.drop(ignore_columns, axis=1)
+        # Unlike drop, selecting the remaining columns this way does not copy their data
+        hidden = set(ignore_columns)
+        remaining = {
+            i: self.dataset.iloc[:, i] for i, col in enumerate(self.dataset.columns) if col not in hidden
+        }
+        columns = [col for col in self.dataset.columns if col not in hidden]
+        self.dataset = pd.DataFrame(remaining, index=self.dataset.index, copy=False)
+        self.dataset.columns = columns
         return saved_columns, saved_indexes
 
-    def __add_ignorable(self, dataset, saved_indexes, saved_columns):
+    def __add_ignorable(self, dataset, saved_indexes, saved_columns, offset=None):
         ignore_columns = self.anon_config.column_classification.hidden
         for ind, col in enumerate(ignore_columns):
-            dataset.insert(saved_indexes[ind], col, saved_columns[col])
+            values = saved_columns[col]
+            if offset is not None:
+                # Chunks continue where the previous chunk stopped, also beyond the end of the table
+                values = continued_values(values, np.arange(len(dataset)) + offset)
+            dataset.insert(saved_indexes[ind], col, values)
         return dataset
@@ -0,0 +1,139 @@
+"""A module that shrinks the memory footprint of a table before it is anonymized
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from configuration.configurations import DPColumnConfig
+
+
+def frame_memory(dataset: pd.DataFrame, deep: bool = False):
+    """Function that returns the memory used by a DataFrame
+
+    Args:
+        dataset (pd.DataFrame): The data
+        deep (bool, optional): Whether the contents of object columns are measured, which visits every
+            Python object, otherwise only their references are counted
+
+    Returns:
+        int: The size in bytes
+    """
+    return int(dataset.memory_usage(index=True, deep=deep).sum())
+
+
+def column_memory(dataset: pd.DataFrame, indexes: list[int]):
+    """Function that returns the memory used by the contents of some columns of a DataFrame
+
+    Args:
+        dataset (pd.DataFrame): The data
+        indexes (list[int]): The indexes of the columns
+
+    Returns:
+        int: The size in bytes, including the contents of object columns
+    """
+    return sum(int(dataset.iloc[:, i].memory_usage(index=False, deep=True)) for i in indexes)
+
+
+class DtypePlanner:
+    """
+    A class to represent a planner that picks compact dtypes based on the DP column classification
+
+    String columns that are categorical or ordinal become pandas categories, integer columns are
+    downcast to the smallest integer type and float columns to float32 if no value changes.
+    Hidden and time-related columns are not touched, neither are columns without classification.
+
+    Attributes
+    ----------
+    column_classification : DPColumnConfig
+        The classification of the table columns
+    """
+
+    def __init__(self, column_classification: DPColumnConfig):
+        self.column_classification = column_classification
+
+    def plan(self, dataset: pd.DataFrame, timestamp_indexes: list[int]):
+        """Method that picks the dtype of every column that can be stored more compactly
+
+        Args:
+            dataset (pd.DataFrame): The data
+            timestamp_indexes (list[int]): A list of indexes for all time-related columns
+
+        Returns:
+            dict: The new dtype per column name
+        """
+        classification = self.column_classification
+        hidden = set(classification.hidden)
+        temporal = {dataset.columns[i] for i in timestamp_indexes}
+        discrete = set(classification.categorical) | set(classification.ordinal)
+        numeric = discrete | set(classification.continuous)
+
+        dtypes = {}
+        for col in dataset.columns:
+            if col in hidden or col in temporal or col not in numeric:
+                continue
+            column = dataset[col]
+            if pd.api.types.is_bool_dtype(column.dtype):
+                continue
+            if pd.api.types.is_integer_dtype(column.dtype):
+                dtype = self.__smallest_integer(column)
+            elif pd.api.types.is_float_dtype(column.dtype):
+                dtype = self.__smallest_float(column)
+            elif col in discrete and pd.api.types.infer_dtype(column, skipna=True) == "string":
+                dtype = "category"
+            else:
+                dtype = None
+            if dtype is not None and dtype != column.dtype:
+                dtypes[col] = dtype
+        return dtypes
+
+    def apply(self, dataset: pd.DataFrame, timestamp_indexes: list[int], label: str = "table"):
+        """Method that converts the columns of a DataFrame to the planned dtypes and reports the savings
+
+        The reported sizes are the deep sizes of the converted columns, unchanged columns are not measured
+        as they are shared with the input.
+
+        Args:
+            dataset (pd.DataFrame): The data
+            timestamp_indexes (list[int]): A list of indexes for all time-related columns
+            label (str, optional): Name of the data that is used in the report
+
+        Returns:
+            pd.DataFrame: The data with compact dtypes, unchanged columns are shared with the input
+        """
+        start_time = time.perf_counter()
+        dtypes = self.plan(dataset, timestamp_indexes)
+        changed = [i for i, col in enumerate(dataset.columns) if col in dtypes]
+        memory_before = column_memory(dataset, changed)
+
+        columns = {}
+        for i, col in enumerate(dataset.columns):
+            column = dataset.iloc[:, i]
+            columns[i] = column.astype(dtypes[col]) if col in dtypes else column
+        planned = pd.DataFrame(columns, copy=False)
+        planned.columns = dataset.columns
+
+        memory_after = column_memory(planned, changed)
+        print(
+            f"Planned dtypes of {len(dtypes)} columns of {label}: {memory_before / 2**20:0.1f} MiB -> "
+            f"{memory_after / 2**20:0.1f} MiB in {time.perf_counter() - start_time:0.2f} seconds"
+        )
+        return planned
+
+    def __smallest_integer(self, column: pd.Series):
+        if column.empty:
+            return None
+        lower, upper = column.min(), column.max()
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= lower and upper <= info.max:
+                return np.dtype(dtype)
+        return None
+
+    def __smallest_float(self, column: pd.Series):
+        values = column.to_numpy()
+        # Only exactly representable values may be narrowed, infinities and NaN survive the round trip
+        with np.errstate(over="ignore"):
+            narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+            return np.dtype(np.float32)
+        return None
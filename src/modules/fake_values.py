@@ -0,0 +1,516 @@
+"""A module that generates fake values in batches
+"""
+import base64
+import functools
+import hashlib
+import string
+import threading
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+from modules.vocab_cache import VocabularyCache
+
+# Maximum number of distinct values that are generated with Faker per (method, locales, seed)
+POOL_SIZE = 100000
+# Upper bounds of the ranges keyed integers are permuted within, those of the signed integer types and of
+# the integers a float64 column holds exactly, as integer keys with NULL values are read as floats
+KEYED_INTEGER_RANGES = (2**7, 2**15, 2**31, 2**53, 2**63)
+# Number of rounds of the Feistel network of the keyed integer permutation
+FEISTEL_ROUNDS = 8
+# Number of Faker calls per distinct value that generate the table of keyed pseudonyms
+KEYED_POOL_FACTOR = 2
+# Separator of the suffixes that make repeated fake values unique
+UNIQUE_SEPARATOR = "#"
+# Largest number of distinct random strings that is enumerated to draw without replacement
+MAX_ENUMERATED_STRINGS = 2**62
+# Characters of random strings, the same as the ones of Faker's pystr
+ALPHABET = np.frombuffer(string.ascii_letters.encode("ascii"), dtype=np.uint8)
+
+# The cached Faker instances are shared, a seeded generation must not be interleaved with another one
+_FAKER_LOCK = threading.Lock()
+# Pools that were generated by another process, by (method, locales, seed, size)
+_PRELOADED_POOLS = {}
+
+
+def numpy_seed(seed):
+    """Function that turns a Faker seed into a seed of a NumPy random generator
+
+    Args:
+        seed (int|str): The seed, None draws a fresh seed
+
+    Returns:
+        int: The seed
+    """
+    if seed is None or isinstance(seed, int):
+        return seed
+    return int.from_bytes(hashlib.sha256(str(seed).encode("utf-8")).digest()[:8], "little")
+
+
+@functools.lru_cache(maxsize=16)
+def locale_faker(locales: tuple):
+    """Function that creates a Faker instance per set of locales, the instances are kept as loading locales is slow
+
+    Args:
+        locales (tuple[str]): The locales, the default locale is used if it is empty
+
+    Returns:
+        Faker: The instance
+    """
+    return Faker(list(locales)) if len(locales) > 0 else Faker()
+
+
+@functools.lru_cache(maxsize=32)
+def has_method(method: str, locales: tuple):
+    """Function that checks whether Faker provides a method for the locales
+
+    Args:
+        method (str): Name of the Faker method
+        locales (tuple[str]): The locales
+
+    Returns:
+        bool: True if the method exists
+    """
+    return hasattr(locale_faker(locales), method)
+
+
+def preload_pools(pools: dict):
+    """Function that registers pools that were generated by another process
+
+    Args:
+        pools (dict): The pools by (method, locales, seed, size)
+    """
+    _PRELOADED_POOLS.update(pools)
+
+
+@functools.lru_cache(maxsize=32)
+def fake_pool(method: str, locales: tuple, seed, size: int, cache: VocabularyCache = None):
+    """Function that generates a pool of fake values, the pools are kept for the following calls
+
+    The values equal the ones of `size` consecutive calls of a Faker seeded with `seed`. Seeded pools
+    are loaded from and stored in the vocabulary cache if there is one.
+
+    Args:
+        method (str): Name of the Faker method
+        locales (tuple[str]): The locales
+        seed (int|str): The seed
+        size (int): Number of values
+        cache (VocabularyCache, optional): The on-disk cache
+
+    Returns:
+        np.ndarray: The read-only values
+    """
+    if (method, locales, seed, size) in _PRELOADED_POOLS:
+        return _PRELOADED_POOLS[(method, locales, seed, size)]
+
+    key = None
+    if cache is not None and seed is not None:
+        key = cache.key(method, locales, seed, size)
+        pool = cache.load(key)
+        if pool is not None:
+            return pool
+
+    with _FAKER_LOCK:
+        fake = locale_faker(locales)
+        fake.seed_instance(seed)
+        fake_func = getattr(fake, method)
+        pool = np.empty(size, dtype=object)
+        for i in range(size):
+            pool[i] = fake_func()
+
+    if key is not None and cache.store(key, pool):
+        return cache.load(key)
+    pool.flags.writeable = False
+    return pool
+
+
+def chunk_rng(seed, chunk_index: int = 0):
+    """Function that creates the random generator of a chunk of rows
+
+    The generator only depends on the seed and the position of the chunk, hence chunks can be
+    processed in any order and by any process.
+
+    Args:
+        seed (int|str): The seed, None draws a fresh seed
+        chunk_index (int, optional): Position of the chunk
+
+    Returns:
+        np.random.Generator: The generator
+    """
+    if seed is None:
+        return np.random.default_rng()
+    return np.random.default_rng(np.random.SeedSequence(numpy_seed(seed), spawn_key=(chunk_index,)))
+
+
+def draw_fake_values(
+    method: str,
+    locales: tuple,
+    seed,
+    count: int,
+    rng: np.random.Generator,
+    cache: VocabularyCache = None,
+    rows: slice = slice(None),
+):
+    """Function that draws fake values from the pool of a Faker method
+
+    Up to POOL_SIZE values are taken from the pool as they are, more values are sampled from the pool.
+
+    Args:
+        method (str): Name of the Faker method
+        locales (tuple[str]): The locales
+        seed (int|str): The seed
+        count (int): Number of values of the whole column
+        rng (np.random.Generator): The random generator that samples from the pool
+        cache (VocabularyCache, optional): The on-disk cache of the pools
+        rows (slice, optional): The rows of the column to draw values for, defaults to all rows
+
+    Returns:
+        np.ndarray: The values
+    """
+    # Unseeded pools must not be shared, otherwise every column would get the same values
+    generate = fake_pool if seed is not None else fake_pool.__wrapped__
+    pool = generate(method, locales, seed, min(count, POOL_SIZE), cache)
+    if count <= len(pool):
+        return pool[:count][rows].copy()
+    return pool.take(rng.integers(0, len(pool), len(range(count)[rows])))
+
+
+def unique_fake_values(
+    method: str, locales: tuple, seed, count: int, rng: np.random.Generator, cache: VocabularyCache = None
+):
+    """Function that generates `count` distinct fake values in O(count)
+
+    The distinct values of the pool are used first. If the method does not generate enough distinct
+    values, the remaining rows repeat them with a suffix UNIQUE_SEPARATOR<n>. Values that contain the
+    separator are left out, so the suffixed values can not collide.
+
+    Args:
+        method (str): Name of the Faker method
+        locales (tuple[str]): The locales
+        seed (int|str): The seed
+        count (int): Number of values
+        rng (np.random.Generator): The random generator that spreads the suffixed values
+        cache (VocabularyCache, optional): The on-disk cache of the pools
+
+    Raises:
+        ValueError: The method generates no value that can be made unique
+
+    Returns:
+        np.ndarray: The values
+    """
+    generate = fake_pool if seed is not None else fake_pool.__wrapped__
+    distinct = pd.unique(generate(method, locales, seed, min(2 * count, POOL_SIZE), cache))
+    if len(distinct) >= count:
+        return distinct[:count].copy()
+
+    texts = pd.Series(distinct, dtype=object).astype(str)
+    texts = texts[~texts.str.contains(UNIQUE_SEPARATOR, regex=False)].to_numpy()
+    if len(texts) == 0 and count > 0:
+        raise ValueError(f"Faker method '{method}' generates no values that can be made unique")
+    print(
+        f"Faker method '{method}' generated {len(texts)} distinct values, "
+        f"appending suffixes to reach {count} unique values"
+    )
+    positions = rng.permutation(count)
+    rounds = positions // len(texts)
+    suffixes = np.where(rounds > 0, UNIQUE_SEPARATOR + rounds.astype(str).astype(object), "")
+    return (pd.Series(texts.take(positions % len(texts))) + pd.Series(suffixes, dtype=object)).to_numpy()
+
+
+def unique_random_strings(rng: np.random.Generator, count: int, min_chars: int, max_chars: int):
+    """Function that generates `count` distinct random strings with lengths in [min_chars, max_chars]
+
+    The strings are identified by their position in the list of all strings ordered by length. Positions
+    are drawn with replacement until there are enough distinct ones, which rarely takes more than a few
+    rounds, so the memory grows with `count` and not with the number of strings. Only if `count` is at
+    least half of all strings, they are drawn from a permutation of all positions.
+
+    Args:
+        rng (np.random.Generator): The random generator
+        count (int): Number of strings
+        min_chars (int): Minimum length
+        max_chars (int): Maximum length
+
+    Raises:
+        ValueError: There are less than `count` strings of the given lengths
+
+    Returns:
+        np.ndarray: The strings
+    """
+    sizes = [len(ALPHABET) ** length for length in range(min_chars, max_chars + 1)]
+    capacity = sum(sizes)
+    if count > capacity:
+        raise ValueError(
+            f"There are only {capacity} strings of {min_chars} to {max_chars} letters, {count} are requested"
+        )
+
+    if capacity > MAX_ENUMERATED_STRINGS:
+        values = pd.unique(random_strings(rng, count, min_chars, max_chars))
+        while len(values) < count:
+            more = random_strings(rng, count - len(values), min_chars, max_chars)
+            values = pd.unique(np.concatenate([values, more]))
+        return values
+
+    if 2 * count >= capacity:
+        indexes = rng.permutation(capacity)[:count].astype(np.uint64)
+    else:
+        indexes = pd.unique(rng.integers(0, capacity, count, dtype=np.int64))
+        while len(indexes) < count:
+            more = rng.integers(0, capacity, count - len(indexes), dtype=np.int64)
+            indexes = pd.unique(np.concatenate([indexes, more]))
+        indexes = indexes.astype(np.uint64)
+    offsets = np.cumsum([0] + sizes[:-1]).astype(np.uint64)
+    lengths = min_chars + np.searchsorted(offsets, indexes, side="right") - 1
+    numbers = indexes - offsets[lengths - min_chars]
+    chars = np.zeros((count, max(max_chars, 1)), dtype=np.uint8)
+    for i in range(max_chars):
+        digit = ALPHABET[(numbers % np.uint64(len(ALPHABET))).astype(np.intp)]
+        chars[:, i] = np.where(i < lengths, digit, 0)
+        numbers = numbers // np.uint64(len(ALPHABET))
+    return chars.view(f"S{chars.shape[1]}").ravel().astype(str).astype(object)
+
+
+def random_strings(rng: np.random.Generator, count: int, min_chars: int, max_chars: int):
+    """Function that generates random strings of ASCII letters with lengths in [min_chars, max_chars]
+
+    Args:
+        rng (np.random.Generator): The random generator
+        count (int): Number of strings
+        min_chars (int): Minimum length
+        max_chars (int): Maximum length
+
+    Returns:
+        np.ndarray: The strings
+    """
+    if max_chars == 0:
+        return np.full(count, "", dtype=object)
+    lengths = rng.integers(min_chars, max_chars + 1, count)
+    chars = ALPHABET[rng.integers(0, len(ALPHABET), (count, max_chars))]
+    # Trailing zero bytes are stripped when the rows are read as fixed-width byte strings
+    chars[np.arange(max_chars) >= lengths[:, None]] = 0
+    return chars.view(f"S{max_chars}").ravel().astype(str).astype(object)
+
+
+def hash_key(seed):
+    """Function that derives the 16 character key of pandas' keyed SipHash from a seed
+
+    Args:
+        seed (int|str): The seed
+
+    Returns:
+        str: The key
+    """
+    return base64.b64encode(hashlib.sha256(str(seed).encode("utf-8")).digest()).decode("ascii")[:16]
+
+
+def keyed_hashes(values: np.ndarray, seed):
+    """Function that computes the keyed hash of every value
+
+    Args:
+        values (np.ndarray): The values as strings
+        seed (int|str): The seed the key is derived from
+
+    Raises:
+        ValueError: There is no seed
+
+    Returns:
+        np.ndarray: The 64 bit hashes
+    """
+    if seed is None:
+        raise ValueError("The keyed mode requires a seed")
+    return pd.util.hash_array(np.asarray(values, dtype=object), hash_key=hash_key(seed))
+
+
+def mix_bits(numbers: np.ndarray):
+    """Function that scrambles 64 bit numbers with the finalizer of SplitMix64
+
+    Args:
+        numbers (np.ndarray): The unsigned 64 bit numbers
+
+    Returns:
+        np.ndarray: The scrambled numbers
+    """
+    numbers = (numbers ^ (numbers >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    numbers = (numbers ^ (numbers >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return numbers ^ (numbers >> np.uint64(31))
+
+
+def keyed_permutation(numbers: np.ndarray, size: int, seed):
+    """Function that maps numbers in [0, size) to numbers in [0, size) by a keyed permutation
+
+    A balanced Feistel network permutes the numbers of the smallest even number of bits that covers
+    [0, size). Results outside of [0, size) are permuted again until they are inside, which keeps the
+    mapping a permutation of [0, size) and takes less than 4 rounds of the network on average.
+
+    Args:
+        numbers (np.ndarray): The unsigned 64 bit numbers
+        size (int): Number of numbers that are permuted, less than 2^64
+        seed (int|str): The seed the round keys are derived from
+
+    Returns:
+        np.ndarray: The permuted numbers
+    """
+    half = max(((size - 1).bit_length() + 1) // 2, 1)
+    mask = np.uint64((1 << half) - 1)
+    round_keys = keyed_hashes([f"{size}:{i}" for i in range(FEISTEL_ROUNDS)], seed)
+    result = numbers.astype(np.uint64)
+    pending = np.arange(len(result))
+    while len(pending):
+        left = result[pending] >> np.uint64(half)
+        right = result[pending] & mask
+        for round_key in round_keys:
+            left, right = right, left ^ (mix_bits(right ^ round_key) & mask)
+        result[pending] = (left << np.uint64(half)) | right
+        pending = pending[result[pending] >= np.uint64(size)]
+    return result
+
+
+def keyed_integers(values: np.ndarray, seed):
+    """Function that maps every integer to a pseudonym by a keyed permutation of the integers
+
+    Non-negative values stay in their range of KEYED_INTEGER_RANGES and negative values in the mirrored
+    range, so the pseudonyms fit into the integer type of the column. Equal values get equal pseudonyms
+    and distinct values distinct pseudonyms in every table, chunk, process and run with the same seed.
+
+    Args:
+        values (np.ndarray): The values as 64 bit integers
+        seed (int|str): The seed
+
+    Raises:
+        ValueError: There is no seed
+
+    Returns:
+        np.ndarray: The pseudonyms as 64 bit integers
+    """
+    if seed is None:
+        raise ValueError("The keyed mode requires a seed")
+    values = np.asarray(values, dtype=np.int64)
+    negative = values < 0
+    # -1 - value maps the negative values onto the non-negative ones without overflow
+    magnitudes = np.where(negative, -1 - values, values).astype(np.uint64)
+    result = magnitudes.copy()
+    low = 0
+    for high in KEYED_INTEGER_RANGES:
+        inside = (magnitudes >= np.uint64(low)) & (magnitudes < np.uint64(high))
+        if inside.any():
+            offsets = keyed_permutation(magnitudes[inside] - np.uint64(low), high - low, seed)
+            result[inside] = offsets + np.uint64(low)
+        low = high
+    result = result.astype(np.int64)
+    return np.where(negative, -1 - result, result)
+
+
+def keyed_slots(values: np.ndarray, seed):
+    """Function that assigns every distinct value its own slot of a table with one slot per distinct value
+
+    Every value starts at the slot of its keyed hash modulo the number of slots. Collisions are resolved
+    by linear probing in the order of the keyed hashes: a value takes its slot if it is free and the
+    next free slot otherwise, wrapping around to the first free slots. As the order does not depend on
+    the order of the rows, the slots only depend on the set of distinct values and the seed.
+
+    Args:
+        values (np.ndarray): The values as strings
+        seed (int|str): The seed
+
+    Returns:
+        (np.ndarray,np.ndarray): The code of every value and the slot of every code
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object), sort=True)
+    count = len(uniques)
+    if count == 0:
+        return codes, np.empty(0, dtype=np.int64)
+    hashes = keyed_hashes(uniques, seed)
+    homes = (hashes % np.uint64(count)).astype(np.int64)
+    order = np.lexsort((hashes, homes))
+    # The i-th value in probing order takes the first free slot at or after its home slot
+    positions = np.arange(count)
+    slots = positions + np.maximum.accumulate(homes[order] - positions)
+    # Values that probed past the last slot take the slots that are still free, in probing order
+    wrapped = slots >= count
+    free = np.setdiff1d(positions, slots[~wrapped], assume_unique=True)
+    slots[wrapped] = free
+    slot_of_code = np.empty(count, dtype=np.int64)
+    slot_of_code[order] = slots
+    return codes, slot_of_code
+
+
+def keyed_fake_values(
+    method: str, locales: tuple, seed, values: np.ndarray, max_chars: int, cache: VocabularyCache = None
+):
+    """Function that maps every value to a distinct fake value of a Faker method by its keyed hash
+
+    The table of fake values has one distinct value of at most `max_chars` characters per distinct value,
+    the values are assigned to them by keyed_slots. Equal values get equal pseudonyms and distinct values
+    distinct pseudonyms, which are the same in every run and every column with the same distinct values.
+
+    Args:
+        method (str): Name of the Faker method
+        locales (tuple[str]): The locales
+        seed (int|str): The seed
+        values (np.ndarray): The values as strings
+        max_chars (int): Maximum length of the fake values
+        cache (VocabularyCache, optional): The on-disk cache of the tables
+
+    Returns:
+        np.ndarray: The fake values
+    """
+    codes, slots = keyed_slots(values, seed)
+    table = keyed_table(method, locales, seed, len(slots), max_chars, cache)
+    return table.take(slots).take(codes)
+
+
+def keyed_table(method: str, locales: tuple, seed, count: int, max_chars: int, cache: VocabularyCache = None):
+    """Function that returns `count` distinct values of a Faker method with at most `max_chars` characters
+
+    The values are the first ones of the pool of the method. The pool starts with KEYED_POOL_FACTOR * `count`
+    values and doubles until it has enough of them, up to the larger of POOL_SIZE and its initial size. As a
+    seeded pool starts with the values of the smaller ones, the values do not depend on the final size.
+
+    Args:
+        method (str): Name of the Faker method
+        locales (tuple[str]): The locales
+        seed (int|str): The seed
+        count (int): Number of values
+        max_chars (int): Maximum length of the values
+        cache (VocabularyCache, optional): The on-disk cache of the pools
+
+    Raises:
+        ValueError: The method does not generate `count` distinct values that are short enough
+
+    Returns:
+        np.ndarray: The values as strings
+    """
+    size = max(KEYED_POOL_FACTOR * count, 1)
+    max_size = max(POOL_SIZE, size)
+    while True:
+        texts = pd.Series(pd.unique(fake_pool(method, locales, seed, size, cache)), dtype=object).astype(str)
+        texts = texts[texts.str.len() <= max_chars].to_numpy()
+        if len(texts) >= count or size == max_size:
+            break
+        size = min(2 * size, max_size)
+    if len(texts) < count:
+        raise ValueError(
+            f"Faker method '{method}' generated {len(texts)} distinct values of at most {max_chars} characters, "
+            f"the keyed mode needs {count}"
+        )
+    return texts[:count]
+
+
+def keyed_strings(values: np.ndarray, seed, min_chars: int, max_chars: int):
+    """Function that maps every value to a distinct random string of ASCII letters by its keyed hash
+
+    The table of strings has one distinct string with a length in [min_chars, max_chars] per distinct
+    value, the values are assigned to them by keyed_slots.
+
+    Args:
+        values (np.ndarray): The values as strings
+        seed (int|str): The seed
+        min_chars (int): Minimum length of the strings
+        max_chars (int): Maximum length of the strings
+
+    Returns:
+        np.ndarray: The strings
+    """
+    codes, slots = keyed_slots(values, seed)
+    table = unique_random_strings(np.random.default_rng(numpy_seed(seed)), len(slots), min_chars, max_chars)
+    return table.take(slots).take(codes)
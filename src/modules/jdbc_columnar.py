@@ -0,0 +1,212 @@
+"""A module that converts between the rows of the jaydebeapi cursor API and typed columns
+
+Rows are fetched and written with the public cursor API of jaydebeapi, which converts every value on
+its own as it crosses the JPype bridge. The rows of a fetched chunk are turned into one typed NumPy
+column per result column, whose dtype follows the type in `curs.description`, and the parameters of the
+write path are converted column by column before they are zipped into rows.
+"""
+import itertools
+import jaydebeapi
+import numpy as np
+import pandas as pd
+
+# Date of java.sql.Time values
+TIME_DATE_PREFIX = "1970-01-01 "
+
+
+class ColumnReader:
+    """
+    A class to represent the conversion of the fetched values of a single result set column
+
+    Attributes
+    ----------
+    kind : str
+        One of "number", "str" or "object"
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def convert(self, values: tuple):
+        """Method that turns the fetched values of the column into a typed column
+
+        Numbers become integer, float or boolean columns depending on the values jaydebeapi returns for
+        the column type. Integer columns with NULL values become float columns as they would in pandas.
+
+        Args:
+            values (tuple): The values as converted by jaydebeapi, None for NULL values
+
+        Returns:
+            pd.Series: The column
+        """
+        if self.kind == "str":
+            return pd.Series([None if val is None else str(val) for val in values], dtype=object)
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        mask = np.equal(column, None)
+        present = column[~mask]
+        if self.kind == "object" or not len(present) or isinstance(present[0], bool):
+            return pd.Series(column if mask.any() or not len(present) else column.astype(np.bool_))
+
+        if mask.any():
+            filled = np.full(len(column), np.nan)
+            filled[~mask] = present.astype(np.float64)
+            return pd.Series(filled)
+        try:
+            # jaydebeapi returns integers for integer and DECIMAL columns without scale
+            return pd.Series(column.astype(np.int64 if isinstance(present[0], int) else np.float64))
+        except OverflowError:
+            return pd.Series(column)
+
+
+def column_readers(description: list):
+    """Function that derives a reader for every column of a result set from its description
+
+    Args:
+        description (list[tuple]): The `description` of the cursor that holds the result set
+
+    Returns:
+        list[ColumnReader]: One reader per column
+    """
+    readers = []
+    for entry in description:
+        if entry[1] in (jaydebeapi.NUMBER, jaydebeapi.FLOAT, jaydebeapi.DECIMAL):
+            readers.append(ColumnReader("number"))
+        elif entry[1] in (jaydebeapi.STRING, jaydebeapi.TEXT):
+            readers.append(ColumnReader("str"))
+        else:
+            # Temporal and binary columns keep the values of jaydebeapi
+            readers.append(ColumnReader("object"))
+    return readers
+
+
+def read_chunk(rows: list, readers: list[ColumnReader]):
+    """Function that turns fetched rows into typed columns
+
+    Args:
+        rows (list[tuple]): The rows as returned by `fetchmany`
+        readers (list[ColumnReader]): The readers of all columns
+
+    Returns:
+        list[pd.Series]: The columns of the chunk
+    """
+    columns = list(zip(*rows)) if rows else [()] * len(readers)
+    return [reader.convert(values) for reader, values in zip(readers, columns)]
+
+
+def column_parameters(df: pd.DataFrame, timestamp_indexes: list[int]):
+    """Function that converts every column of a DataFrame into a list of statement parameters
+
+    Each column is converted at once, NULL values are represented by None.
+
+    Args:
+        df (pd.DataFrame): The data
+        timestamp_indexes (list[int]): A list of indexes of time-related columns
+
+    Returns:
+        list[list]: The values of every column
+    """
+    time_zone = None
+    if timestamp_indexes:
+        # This is a dynamic import that only works once the JVM is running
+        import java  # pylint: disable=import-outside-toplevel,import-error
+
+        time_zone = str(java.util.TimeZone.getDefault().getID())
+
+    parameters = []
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        if i in timestamp_indexes:
+            parameters.append(timestamp_values(column, time_zone))
+            continue
+
+        values = column.tolist()
+        for row in np.flatnonzero(column.isna().to_numpy()):
+            values[row] = None
+        parameters.append(values)
+
+    return parameters
+
+
+def parameter_rows(parameters: list, start: int, stop: int, rows_per_insert: int):
+    """Function that zips the parameters of a range of rows into the parameter sequences of a statement
+
+    Args:
+        parameters (list[list]): The values of every column
+        start (int): First row
+        stop (int): Row after the last row, `stop - start` is a multiple of `rows_per_insert`
+        rows_per_insert (int): Number of rows per statement
+
+    Returns:
+        list[tuple]: The parameters of every execution of the statement
+    """
+    rows = list(zip(*(values[start:stop] for values in parameters)))
+    if rows_per_insert == 1:
+        return rows
+    return [
+        tuple(itertools.chain.from_iterable(rows[first : first + rows_per_insert]))
+        for first in range(0, len(rows), rows_per_insert)
+    ]
+
+
+def timestamp_parts(column: pd.Series, time_zone: str):
+    """Function that converts a time-related column into epoch milliseconds and nanoseconds of the second
+
+    Values without time zone are wall clock times of `time_zone`, which matches the conversion of
+    datetime objects to java.sql.Timestamp in JPype.
+
+    Args:
+        column (pd.Series): The column
+        time_zone (str): Name of the default time zone of the JVM
+
+    Returns:
+        (np.ndarray,np.ndarray,np.ndarray): The milliseconds, the nanoseconds and the NULL mask
+    """
+    if not pd.api.types.is_datetime64_any_dtype(column):
+        first = column.first_valid_index()
+        if first is not None and isinstance(column.loc[first], str) and column.loc[first][2:3] == ":":
+            # TIME values are read as strings without date, like java.sql.Time they are times of the epoch day
+            column = TIME_DATE_PREFIX + column.astype("string")
+        # A fixed format is parsed for the whole column at once, unlike "mixed" which parses value by value
+        column = pd.to_datetime(column, format="ISO8601")
+    mask = column.isna().to_numpy()
+
+    if column.dt.tz is None:
+        # Like java.sql.Timestamp, ambiguous times are resolved to daylight saving time
+        # and times skipped by daylight saving time are shifted forward
+        column = column.dt.tz_localize(
+            time_zone, ambiguous=np.ones(len(column), dtype=np.bool_), nonexistent="shift_forward"
+        )
+    nanos = column.dt.tz_convert("UTC").dt.tz_localize(None).astype("datetime64[ns]").to_numpy().view(np.int64)
+
+    return nanos // 10**6, nanos % 10**9, mask
+
+
+def timestamp_values(column: pd.Series, time_zone: str):
+    """Function that converts a time-related column into a list of java.sql.Timestamp objects
+
+    Args:
+        column (pd.Series): The column
+        time_zone (str): Name of the default time zone of the JVM
+
+    Returns:
+        list[java.sql.Timestamp]: The timestamps, None for NULL values
+    """
+    # This is a dynamic import that only works once the JVM is running
+    import java  # pylint: disable=import-outside-toplevel,import-error
+
+    millis, nanos, mask = timestamp_parts(column, time_zone)
+    valid = np.flatnonzero(~mask)
+    timestamp = java.sql.Timestamp
+
+    values = [None] * len(millis)
+    if (nanos[valid] % 10**6).any():
+        # Timestamp(long) only keeps milliseconds
+        for row, milli, nano in zip(valid.tolist(), millis[valid].tolist(), nanos[valid].tolist()):
+            value = timestamp(milli)
+            value.setNanos(nano)
+            values[row] = value
+    else:
+        for row, milli in zip(valid.tolist(), millis[valid].tolist()):
+            values[row] = timestamp(milli)
+    return values
@@ -1,10 +1,137 @@
 """A module that handles all things related to JDBC
 """
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import jpype
 import jpype.imports
 import jaydebeapi
 import pandas as pd
-import numpy as np
+
+from configuration.configurations import TransferConfig
+from modules.bulk_loader import BulkLoader
+from modules.jdbc_columnar import column_parameters, column_readers, parameter_rows, read_chunk
+from modules.metrics import ThroughputReporter
+
+# Lowest limit of bind parameters per statement among the common drivers, the one of SQL Server
+MAX_STATEMENT_PARAMETERS = 2100
+# Limits of bind parameters per statement of the products that allow more than MAX_STATEMENT_PARAMETERS
+STATEMENT_PARAMETER_LIMITS = {
+    "postgresql": 32767,
+    "sqlite": 32766,
+}
+# Connection properties that set the number of rows fetched per round trip, per JDBC URL prefix
+FETCH_SIZE_PROPERTIES = {
+    "jdbc:postgresql:": "defaultRowFetchSize",
+    "jdbc:oracle:": "defaultRowPrefetch",
+}
+# Number of idle connections that are kept open per database
+MAX_IDLE_CONNECTIONS = 8
+# Seconds to wait for a pooled connection to prove that it is still usable
+VALIDATION_TIMEOUT = 2
+
+# SQL expressions of a uniformly random number in [0, 1) per database product
+RANDOM_FUNCTIONS = {
+    "postgresql": "random()",
+    "oracle": "DBMS_RANDOM.VALUE",
+    "microsoft sql server": "RAND(CHECKSUM(NEWID()))",
+    "sqlite": "((RANDOM() / 18446744073709551616.0) + 0.5)",
+}
+
+_JVM_LOCK = threading.Lock()
+_POOLS_LOCK = threading.Lock()
+_POOLS = {}
+
+
+class ConnectionPool:
+    """
+    A class to represent a pool of reusable JDBC connections to one database
+
+    Attributes
+    ----------
+    driver : str
+        jdbc driver
+    url : str
+        database url
+    username : str
+        database username
+    password : str
+        database password
+    properties : dict[str,str]
+        additional connection properties
+    max_idle : int
+        maximum number of idle connections that are kept open
+    """
+
+    def __init__(self, driver: str, url: str, username: str, password: str, properties: dict, max_idle: int):
+        self.driver = driver
+        self.url = url
+        self.username = username
+        self.password = password
+        self.properties = properties
+        self.max_idle = max_idle
+        self.__idle = []
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        """Method that hands out an idle connection or opens a new one
+
+        Returns:
+            (jaydebeapi.Connection): JDBC connection
+        """
+        while True:
+            with self.__lock:
+                if not self.__idle:
+                    break
+                conn = self.__idle.pop()
+            if self.__is_usable(conn):
+                return conn
+            self.__close(conn)
+        return jaydebeapi.connect(
+            self.driver, self.url, {"user": self.username, "password": self.password, **self.properties}
+        )
+
+    def release(self, conn: jaydebeapi.Connection):
+        """Method that takes back a connection and keeps it open for reuse if the pool is not full
+
+        Args:
+            conn (jaydebeapi.Connection): JDBC connection
+        """
+        try:
+            if not conn.jconn.getAutoCommit():
+                # Pending work of a failed transaction must not leak into the next user
+                conn.jconn.rollback()
+                conn.jconn.setAutoCommit(True)
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.__close(conn)
+            return
+
+        with self.__lock:
+            if len(self.__idle) < self.max_idle:
+                self.__idle.append(conn)
+                return
+        self.__close(conn)
+
+    def close(self):
+        """Method that closes all idle connections
+        """
+        with self.__lock:
+            idle = self.__idle
+            self.__idle = []
+        for conn in idle:
+            self.__close(conn)
+
+    def __is_usable(self, conn: jaydebeapi.Connection):
+        try:
+            return bool(conn.jconn.isValid(VALIDATION_TIMEOUT))
+        except Exception:  # pylint: disable=broad-exception-caught
+            return False
+
+    def __close(self, conn: jaydebeapi.Connection):
+        try:
+            conn.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
 
 
 class JDBCHandler:
@@ -21,55 +148,466 @@ class JDBCHandler:
         database username
     password : str
         database password
+    jar_path : str
+        path to the jdbc driver jar
+    transfer_config : TransferConfig
+        options for reading and writing tables
     """
 
-    def __init__(self, driver: str, url: str, username: str, password: str, jar_path:str):
+    def __init__(
+        self,
+        driver: str,
+        url: str,
+        username: str,
+        password: str,
+        jar_path: str,
+        transfer_config: TransferConfig = None,
+    ):
         self.driver = driver
         self.url = url
         self.username = username
         self.password = password
         self.jar_path = jar_path
+        self.transfer_config = transfer_config or TransferConfig()
 
     def start_jvm(self):
-        """Helper function that starts the JVM
+        """Helper function that starts the JVM unless it is already running in this process
         """
-        jpype.startJVM(classpath=[self.jar_path])
+        with _JVM_LOCK:
+            if not jpype.isJVMStarted():
+                jpype.startJVM(classpath=[self.jar_path])
+            elif self.jar_path not in jpype.getClassPath():
+                print(f"The JVM is already running without {self.jar_path} on its classpath")
 
     def get_connection(self):
-        """Helper function that starts and returns a JDBC connection 
+        """Helper function that hands out a JDBC connection from the connection pool
+
+        The connection should be handed back with `release_connection`, closing it works as well
+        but prevents its reuse.
 
         Returns:
             (jaydebeapi.Connection): JDBC connection
         """
-        return jaydebeapi.connect(self.driver, self.url, [self.username, self.password])
+        return self.__pool().acquire()
+
+    def release_connection(self, conn: jaydebeapi.Connection):
+        """Helper function that hands a connection back to the connection pool
+
+        Args:
+            conn (jaydebeapi.Connection): JDBC connection
+        """
+        self.__pool().release(conn)
+
+    @contextmanager
+    def connection(self):
+        """Context manager that hands out a pooled JDBC connection and releases it afterwards
+
+        Yields:
+            (jaydebeapi.Connection): JDBC connection
+        """
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            self.release_connection(conn)
+
+    def close_connections(self):
+        """Helper function that closes all idle connections of the connection pool
+        """
+        self.__pool().close()
+
+    def __pool(self):
+        """Helper function that returns the process-wide connection pool of the database
+
+        Returns:
+            ConnectionPool: The pool
+        """
+        properties = self.__connection_properties()
+        key = (self.driver, self.url, self.username, self.password, tuple(sorted(properties.items())))
+        with _POOLS_LOCK:
+            if key not in _POOLS:
+                _POOLS[key] = ConnectionPool(
+                    self.driver, self.url, self.username, self.password, properties, MAX_IDLE_CONNECTIONS
+                )
+            return _POOLS[key]
+
+    def __connection_properties(self):
+        """Helper function that returns the connection properties beyond the credentials
 
-    def data_from_table(self, conn: jaydebeapi.Connection, table: str):
+        The cursor API of jaydebeapi does not allow to configure a statement before it is executed, hence
+        drivers that only stream results with a fetch size set in advance receive it as a connection property.
+
+        Returns:
+            dict[str,str]: The properties
+        """
+        for prefix, name in FETCH_SIZE_PROPERTIES.items():
+            if self.url.startswith(prefix):
+                return {name: str(self.transfer_config.fetch_size)}
+        return {}
+
+    def data_from_table(self, conn: jaydebeapi.Connection, table: str, observer=None):
         """Function that pulls data from a specific table of the database
 
+        The table is streamed in chunks of `fetch_size` rows and assembled column by column,
+        so the peak memory stays close to the size of the final DataFrame.
+
         Args:
             conn (jaydebeapi.Connection): Connection to the database
             table (str): Name of the table
+            observer (callable, optional): Function that is called with every chunk as it arrives
+
+        Returns:
+            (pd.DataFrame,list[int]): The table as a DataFrame and a list of indexes for all time-related columns
+        """
+        chunks = self.iter_table_chunks(conn, table)
+        if observer is not None:
+            chunks = self.__observe_chunks(chunks, observer)
+        column_chunks, cols, timestamp_indexes = self.__collect_column_chunks(chunks)
+        frame = self.__frame_from_column_chunks(column_chunks, cols)
+
+        return frame, timestamp_indexes
+
+    def partitioned_data_from_table(self, table: str):
+        """Function that pulls data from a table over `partitions` concurrent connections
+
+        The value range of the partition column is split into disjoint ranges, each range is read on its
+        own connection and the pieces are concatenated in the order of the ranges.
+
+        Args:
+            table (str): Name of the table
 
         Returns:
             (pd.DataFrame,list[int]): The table as a DataFrame and a list of indexes for all time-related columns
         """
+        with self.connection() as conn:
+            column = self.transfer_config.partition_column or self.__primary_key_column(conn, table)
+            lower, upper = self.__column_bounds(conn, table, column)
+            if lower is None:
+                # Empty table, there is nothing to partition
+                return self.data_from_table(conn, table)
+
+        predicates = self.__range_predicates(column, lower, upper, self.transfer_config.partitions)
+        print(f"Reading {table} in {len(predicates)} partitions of column {column}")
+
+        with ThreadPoolExecutor(max_workers=len(predicates)) as executor:
+            results = list(
+                executor.map(lambda predicate: self.__read_partition(table, predicate), predicates)
+            )
+
+        cols = results[0][1]
+        timestamp_indexes = results[0][2]
+        column_chunks = [[] for _ in cols]
+        for partition_chunks, _, _ in results:
+            for i, pieces in enumerate(partition_chunks):
+                column_chunks[i].extend(pieces)
+        del results
+        frame = self.__frame_from_column_chunks(column_chunks, cols)
+
+        return frame, timestamp_indexes
+
+    def __read_partition(self, table: str, predicate: str):
+        """Function that reads the rows of a table matching a predicate on a connection of its own
+
+        Args:
+            table (str): Name of the table
+            predicate (str): SQL condition selecting the partition
+
+        Returns:
+            (list[list[pd.Series]],list[str],list[int]): The column chunks, column names and timestamp indexes
+        """
+        with self.connection() as conn:
+            return self.__collect_column_chunks(
+                self.__iter_query_chunks(
+                    conn, f"SELECT * FROM {table} WHERE {predicate}", f"{table} ({predicate})"
+                )
+            )
+
+    def sampled_data_from_table(self, conn: jaydebeapi.Connection, table: str, fraction: float, hidden: list[str]):
+        """Function that pulls a uniformly random subsample of a table and the hidden columns of all rows
+
+        Every row is selected independently with probability `fraction` by the database, hence only the
+        subsample is transferred. TABLESAMPLE SYSTEM is not used as it selects whole blocks of rows.
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            table (str): Name of the table
+            fraction (float): Probability of a row to be selected
+            hidden (list[str]): Names of the columns that are not anonymized
+
+        Returns:
+            (pd.DataFrame,list[int],pd.DataFrame): The subsample, a list of indexes for all time-related columns
+            and the hidden columns of the full table, which has one row per row of the table even if no column
+            is hidden
+        """
+        query = f"SELECT * FROM {table} WHERE {self.__random_function(conn)} < {float(fraction)}"
+        column_chunks, cols, timestamp_indexes = self.__collect_column_chunks(
+            self.__iter_query_chunks(conn, query, f"{table} (sample of {fraction})")
+        )
+        sample = self.__frame_from_column_chunks(column_chunks, cols)
+
+        if hidden:
+            column_chunks, cols, _ = self.__collect_column_chunks(
+                self.__iter_query_chunks(conn, f"SELECT {', '.join(hidden)} FROM {table}", f"{table} (hidden)")
+            )
+            population = self.__frame_from_column_chunks(column_chunks, cols)
+        else:
+            population = pd.DataFrame(index=pd.RangeIndex(self.row_count(conn, table)))
+
+        return sample, timestamp_indexes, population
+
+    def row_count(self, conn: jaydebeapi.Connection, table: str):
+        """Function that counts the rows of a table
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            table (str): Name of the table
+
+        Returns:
+            int: The number of rows
+        """
         curs = conn.cursor()
-        curs.execute(f"SELECT * FROM {table}")
+        try:
+            curs.execute(f"SELECT COUNT(*) FROM {table}")
+            return int(curs.fetchone()[0])
+        finally:
+            curs.close()
 
-        res = curs.fetchall()
-        meta = curs.description
-        curs.close()
+    def __random_function(self, conn: jaydebeapi.Connection):
+        """Function that returns the SQL expression of a uniformly random number of the database
 
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+
+        Returns:
+            str: The expression, RAND() for products that are not listed in RANDOM_FUNCTIONS
+        """
+        product = str(conn.jconn.getMetaData().getDatabaseProductName()).lower()
+        for name, function in RANDOM_FUNCTIONS.items():
+            if name in product:
+                return function
+        return "RAND()"
+
+    def __primary_key_column(self, conn: jaydebeapi.Connection, table: str):
+        """Function that looks up the first primary key column of a table in the database metadata
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            table (str): Name of the table
+
+        Raises:
+            ValueError: The table has no primary key
+
+        Returns:
+            str: Name of the column
+        """
+        meta = conn.jconn.getMetaData()
+        # Databases store unquoted identifiers either in lower or in upper case
+        for name in dict.fromkeys((table, table.lower(), table.upper())):
+            rs = meta.getPrimaryKeys(None, None, name)
+            try:
+                while rs.next():
+                    if rs.getInt("KEY_SEQ") == 1:
+                        return str(rs.getString("COLUMN_NAME"))
+            finally:
+                rs.close()
+        raise ValueError(f"Table {table} has no primary key, please configure a partition column")
+
+    def __column_bounds(self, conn: jaydebeapi.Connection, table: str, column: str):
+        """Function that queries the minimum and maximum of a numeric column
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            table (str): Name of the table
+            column (str): Name of the column
+
+        Raises:
+            ValueError: The column is not numeric
+
+        Returns:
+            (int|float,int|float): The bounds, which are None if the table is empty
+        """
+        curs = conn.cursor()
+        try:
+            curs.execute(f"SELECT MIN({column}), MAX({column}) FROM {table}")
+            if curs.description[0][1] not in (jaydebeapi.NUMBER, jaydebeapi.FLOAT, jaydebeapi.DECIMAL):
+                raise ValueError(f"Partition column {column} must be numeric")
+            lower, upper = curs.fetchone()
+        finally:
+            curs.close()
+
+        if lower is None:
+            return None, None
+        if isinstance(lower, float) or isinstance(upper, float):
+            return float(lower), float(upper)
+        return int(lower), int(upper)
+
+    def __range_predicates(self, column: str, lower, upper, partitions: int):
+        """Function that splits the range of a column into disjoint predicates
+
+        The first predicate also selects NULL values, the last one is open towards the top.
+
+        Args:
+            column (str): Name of the column
+            lower (int|float): Minimum of the column
+            upper (int|float): Maximum of the column
+            partitions (int): Number of partitions
+
+        Returns:
+            list[str]: One SQL condition per partition
+        """
+        if isinstance(lower, int):
+            boundaries = [lower + (upper - lower + 1) * k // partitions for k in range(1, partitions)]
+        else:
+            boundaries = [lower + (upper - lower) * k / partitions for k in range(1, partitions)]
+        # Small ranges can not be split into as many partitions
+        boundaries = sorted(set(b for b in boundaries if lower < b <= upper))
+
+        if not boundaries:
+            return ["1=1"]
+
+        predicates = [f"({column} < {boundaries[0]} OR {column} IS NULL)"]
+        for low, high in zip(boundaries, boundaries[1:]):
+            predicates.append(f"({column} >= {low} AND {column} < {high})")
+        predicates.append(f"{column} >= {boundaries[-1]}")
+        return predicates
+
+    def iter_table_chunks(self, conn: jaydebeapi.Connection, table: str):
+        """Generator that streams a table from the database in chunks of `fetch_size` rows
+
+        At least one chunk is yielded, which is empty if the table has no rows.
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            table (str): Name of the table
+
+        Yields:
+            (pd.DataFrame,list[int]): A chunk of the table and a list of indexes for all time-related columns
+        """
+        yield from self.__iter_query_chunks(conn, f"SELECT * FROM {table}", table)
+
+    def __iter_query_chunks(self, conn: jaydebeapi.Connection, query: str, label: str):
+        """Generator that streams the result of a query in chunks of `fetch_size` rows
+
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            query (str): The query to execute
+            label (str): Name of the read that is used for progress reports
+
+        Yields:
+            (pd.DataFrame,list[int]): A chunk of the result and a list of indexes for all time-related columns
+        """
+        autocommit = conn.jconn.getAutoCommit()
+        # Some drivers (e.g. PostgreSQL) only honour the fetch size inside of a transaction
+        conn.jconn.setAutoCommit(False)
+        curs = conn.cursor()
+        try:
+            curs.execute(query)
+            meta = curs.description
+            cols = []
+            col_types = []
+            for entry in meta:
+                cols.append(str(entry[0]))
+                col_types.append(entry[1])
+            timestamp_indexes = self.__get_timestamp_indexes(col_types)
+
+            readers = column_readers(meta)
+
+            reporter = ThroughputReporter(f"Fetched from {label}")
+            while True:
+                fetched = curs.fetchmany(self.transfer_config.fetch_size)
+                chunk = read_chunk(fetched, readers)
+                rows = len(fetched)
+                if rows == 0 and reporter.rows > 0:
+                    break
+                frame = pd.DataFrame(dict(enumerate(chunk)), copy=False)
+                frame.columns = cols
+                yield frame, timestamp_indexes
+                reporter.update(rows)
+                if rows < self.transfer_config.fetch_size:
+                    break
+            reporter.finish()
+        finally:
+            curs.close()
+            # The read transaction must not hold its snapshot or locks until the next user of the connection
+            conn.jconn.rollback()
+            conn.jconn.setAutoCommit(autocommit)
+
+    def __observe_chunks(self, chunks, observer):
+        """Generator that passes streamed chunks on after handing them to an observer
+
+        Args:
+            chunks (Iterator[(pd.DataFrame,list[int])]): The streamed chunks
+            observer (callable): Function that is called with every chunk
+
+        Yields:
+            (pd.DataFrame,list[int]): The streamed chunks
+        """
+        for chunk, timestamp_indexes in chunks:
+            if observer is not None:
+                observer = self.__notify(observer, chunk)
+            yield chunk, timestamp_indexes
+
+    def __notify(self, observer, chunk: pd.DataFrame):
+        """Function that hands a chunk to an observer without letting its errors reach the transfer
+
+        Args:
+            observer (callable): Function that is called with the chunk
+            chunk (pd.DataFrame): The chunk
+
+        Returns:
+            callable: The observer, None if it failed and must not be called again
+        """
+        try:
+            observer(chunk)
+            return observer
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(f"The observer of the transfer failed and is no longer called: {e}")
+            return None
+
+    def __collect_column_chunks(self, chunks):
+        """Function that splits streamed chunks into the chunks of every column
+
+        Args:
+            chunks (Iterator[(pd.DataFrame,list[int])]): The streamed chunks
+
+        Returns:
+            (list[list[pd.Series]],list[str],list[int]): The column chunks, column names and timestamp indexes
+        """
+        column_chunks = []
         cols = []
-        col_types = []
-        for entry in meta:
-            cols.append(str(entry[0]))
-            col_types.append(entry[1])
-        timestamp_indexes = self.__get_timestamp_indexes(col_types)
+        timestamp_indexes = []
+        for chunk, timestamp_indexes in chunks:
+            cols = list(chunk.columns)
+            if not column_chunks:
+                column_chunks = [[] for _ in cols]
+            for i, pieces in enumerate(column_chunks):
+                pieces.append(chunk.iloc[:, i])
+            del chunk
+        return column_chunks, cols, timestamp_indexes
 
-        frame = pd.DataFrame(res, columns=cols)
+    def __frame_from_column_chunks(self, column_chunks: list, cols: list[str]):
+        """Function that concatenates column-wise chunks into a DataFrame
 
-        return frame, timestamp_indexes
+        The chunks of each column are released as soon as the column is assembled.
+
+        Args:
+            column_chunks (list[list[pd.Series]]): The chunks of every column
+            cols (list[str]): The column names
+
+        Returns:
+            pd.DataFrame: The assembled DataFrame
+        """
+        columns = {}
+        for i, pieces in enumerate(column_chunks):
+            column = pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0]
+            pieces.clear()
+            if column.dtype == object:
+                # A chunk of only NULL values does not carry the type of the column
+                column = column.infer_objects()
+            columns[i] = column.reset_index(drop=True)
+        frame = pd.DataFrame(columns, copy=False)
+        frame.columns = cols
+        return frame
 
     def __get_timestamp_indexes(self, col_types: list):
         """Function that analyzes table metadata and returns a list of indexes of time-related columns
@@ -110,42 +648,118 @@ class JDBCHandler:
         df: pd.DataFrame,
         table: str,
         timestamp_indexes,
+        observer=None,
     ):
         """Function that pushed data to a table on the database
 
+        The rows are sent in batches of `batch_size` rows within explicit transactions that are
+        committed every `commit_batches` batches. If `multi_row` is greater than 1, multiple rows
+        are inserted per INSERT statement.
+
         Args:
             conn (jaydebeapi.Connection): Connection to the database
             df (pd.DataFrame): Data to push
             table (str): Name of the table that receives the data
             timestamp_indexes (list[int]): A list of indexes of time-related
+            observer (callable, optional): Function that is called with every batch once it is sent, it is no
+                longer called once it fails and its errors never fail the write
         """
-        # NaN replacement with NONE
-        df = df.replace(np.nan, None)
+        config = self.transfer_config
+        column_count = len(df.columns)
+        parameter_limit = self.__parameter_limit(conn)
+        rows_per_insert = max(1, min(config.multi_row, parameter_limit // max(column_count, 1)))
+        insert_queries = {}
+
+        reporter = ThroughputReporter(f"Inserted into {table}")
+        autocommit = conn.jconn.getAutoCommit()
+        conn.jconn.setAutoCommit(False)
+        curs = conn.cursor()
+        try:
+            for batch, start in enumerate(range(0, len(df), config.batch_size), 1):
+                stop = min(start + config.batch_size, len(df))
+                parameters = column_parameters(df.iloc[start:stop], timestamp_indexes)
+                rows = stop - start
+
+                full_rows = rows - rows % rows_per_insert
+                for group_start, group_stop, group_size in (
+                    (0, full_rows, rows_per_insert),
+                    (full_rows, rows, rows - full_rows),
+                ):
+                    if group_stop > group_start:
+                        if group_size not in insert_queries:
+                            insert_queries[group_size] = self.__insert_query(table, column_count, group_size)
+                        curs.executemany(
+                            insert_queries[group_size],
+                            parameter_rows(parameters, group_start, group_stop, group_size),
+                        )
 
-        # Parsing timestamps to datetime format
-        for ind in timestamp_indexes:
-            name = df.columns[ind]
-            df[name] = pd.to_datetime(df[name], format="mixed")
+                reporter.update(rows)
+                if observer is not None:
+                    # The observer runs within the write transaction, its errors must not roll back the rows
+                    observer = self.__notify(observer, df.iloc[start:stop])
+                if batch % config.commit_batches == 0:
+                    conn.jconn.commit()
+            conn.jconn.commit()
+        except BaseException:
+            # An interrupted write must not leave a partial transaction behind either
+            conn.jconn.rollback()
+            raise
+        finally:
+            curs.close()
+            conn.jconn.setAutoCommit(autocommit)
 
-        tuples = [tuple(x) for x in df.values]
+        reporter.finish()
 
-        if len(timestamp_indexes):
+    def bulk_load_anonymized_table(
+        self,
+        conn: jaydebeapi.Connection,
+        df: pd.DataFrame,
+        table: str,
+        timestamp_indexes,
+        observer=None,
+    ):
+        """Function that pushes data to a table with the native bulk loader of the database
 
-            # This is a dynamic import that only works once the JVM is running
-            import java  # pylint: disable=import-outside-toplevel,import-error
+        Falls back to batched inserts if the database has no supported bulk loader.
 
-            for i, tup in enumerate(tuples):
-                li = list(tup)
-                for j in timestamp_indexes:
-                    if pd.isnull(li[j]):
-                        li[j] = None
-                    else:
-                        li[j] = java.sql.Timestamp @ li[j]
-                tuples[i] = tuple(li)
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+            df (pd.DataFrame): Data to push
+            table (str): Name of the table that receives the data
+            timestamp_indexes (list[int]): A list of indexes of time-related
+            observer (callable, optional): Function that is called with the pushed data
+        """
+        if not BulkLoader(self.transfer_config.batch_size).load(conn, df, table):
+            print("The database has no supported bulk loader. Resorting to batched inserts")
+            self.populate_anonymized_table(conn, df, table, timestamp_indexes, observer)
+        elif observer is not None:
+            self.__notify(observer, df)
 
-        column_slots = f"({','.join('?' for _ in df.columns)})"
-        insert_query = f"insert into {table} values {column_slots}"
+    def __parameter_limit(self, conn: jaydebeapi.Connection):
+        """Function that returns the maximum number of bind parameters per statement of the database
 
-        curs = conn.cursor()
-        curs.executemany(insert_query, tuples)
-        curs.close()
+        Args:
+            conn (jaydebeapi.Connection): Connection to the database
+
+        Returns:
+            int: The limit, MAX_STATEMENT_PARAMETERS for products that are not listed in STATEMENT_PARAMETER_LIMITS
+        """
+        product = str(conn.jconn.getMetaData().getDatabaseProductName()).lower()
+        for name, limit in STATEMENT_PARAMETER_LIMITS.items():
+            if name in product:
+                return limit
+        return MAX_STATEMENT_PARAMETERS
+
+    def __insert_query(self, table: str, column_count: int, rows: int):
+        """Function that builds an INSERT statement for a number of rows
+
+        Args:
+            table (str): Name of the table that receives the data
+            column_count (int): Number of columns
+            rows (int): Number of rows per statement
+
+        Returns:
+            str: The statement
+        """
+        column_slots = f"({','.join('?' for _ in range(column_count))})"
+        return f"insert into {table} values {','.join(column_slots for _ in range(rows))}"
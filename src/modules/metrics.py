@@ -0,0 +1,119 @@
+"""A module that contains helpers to report runtime metrics of the pipeline
+"""
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # The resource module is not available on Windows
+    resource = None
+
+
+def peak_memory():
+    """Function that returns the high-water mark of the resident memory of the process
+
+    Returns:
+        int: The size in bytes, None if the platform does not report it
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ThroughputReporter:
+    """
+    A class to represent a progress reporter for row based operations
+
+    Attributes
+    ----------
+    label : str
+        Name of the reported operation
+    interval : float
+        Minimum number of seconds between two progress reports
+    rows : int
+        Number of rows processed so far
+    """
+
+    def __init__(self, label: str, interval: float = 5.0):
+        self.label = label
+        self.interval = interval
+        self.rows = 0
+        self.start_time = time.perf_counter()
+        self.__last_report = self.start_time
+
+    def update(self, rows: int):
+        """Method that registers processed rows and prints the progress once the interval has passed
+
+        Args:
+            rows (int): Number of newly processed rows
+        """
+        self.rows += rows
+        now = time.perf_counter()
+        if now - self.__last_report >= self.interval:
+            self.__last_report = now
+            self.__print(now)
+
+    def finish(self):
+        """Method that prints the final throughput
+
+        Returns:
+            float: The elapsed time in seconds
+        """
+        now = time.perf_counter()
+        self.__print(now)
+        return now - self.start_time
+
+    def __print(self, now: float):
+        elapsed = now - self.start_time
+        rate = self.rows / elapsed if elapsed > 0 else 0.0
+        print(f"{self.label}: {self.rows} rows in {elapsed:0.2f} seconds ({rate:0.0f} rows/s)")
+
+
+class StageTimer:
+    """
+    A class to represent a recorder of the wall time of pipeline stages
+
+    Attributes
+    ----------
+    timings : dict
+        Seconds spent per stage name
+    on_stage : callable
+        Optional function that is called with the stage name and its duration after every stage
+    """
+
+    def __init__(self, on_stage=None):
+        self.timings = {}
+        self.on_stage = on_stage
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager that measures the wall time of a stage
+
+        Args:
+            name (str): Name of the stage
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start_time)
+
+    def record(self, name: str, elapsed: float):
+        """Method that records the wall time of a stage that was measured elsewhere
+
+        Args:
+            name (str): Name of the stage
+            elapsed (float): Seconds spent in the stage
+        """
+        self.timings[name] = self.timings.get(name, 0.0) + elapsed
+        peak = peak_memory()
+        if peak is None:
+            print(f"Stage '{name}' took: {elapsed:0.2f} seconds")
+        else:
+            print(f"Stage '{name}' took: {elapsed:0.2f} seconds (peak memory {peak / 2**20:0.1f} MiB)")
+        if self.on_stage is not None:
+            self.on_stage(name, elapsed)
@@ -0,0 +1,109 @@
+"""A module that persists fitted synthesizers on disk
+"""
+import hashlib
+import json
+import os
+import pickle
+import pandas as pd
+
+from configuration.configurations import DPConfig, ContinuousConfig
+
+DEFAULT_CACHE_DIR = "../output/models"
+
+
+def data_fingerprint(dataset: pd.DataFrame):
+    """Function that computes a fingerprint of the content of a DataFrame
+
+    Args:
+        dataset (pd.DataFrame): The data
+
+    Returns:
+        str: A hex digest that changes whenever a value, column or dtype changes
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in dataset.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(dataset, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ModelCache:
+    """
+    A class to represent a directory of fitted synthesizers
+
+    Attributes
+    ----------
+    cache_dir : str
+        Directory that holds the pickled synthesizers
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def key(
+        self,
+        anon_config: DPConfig,
+        cont_config: ContinuousConfig,
+        fingerprint: str,
+    ):
+        """Method that derives the cache key of a fitted synthesizer
+
+        Args:
+            anon_config (DPConfig): The configuration options
+            cont_config (ContinuousConfig): The configuration options for continuous columns
+            fingerprint (str): Fingerprint of the training data
+
+        Returns:
+            str: The cache key
+        """
+        classification = anon_config.column_classification
+        parts = {
+            "table": anon_config.table_name,
+            "algorithm": anon_config.algorithm,
+            "epsilon": float(anon_config.epsilon),
+            "preproc_eps": float(anon_config.preproc_eps),
+            "fit_fraction": anon_config.fit_fraction,
+            "hidden": classification.hidden,
+            "categorical": classification.categorical,
+            "continuous": classification.continuous,
+            "ordinal": classification.ordinal,
+            "bins": [
+                [entry.name, entry.bins, entry.lower, entry.upper] for entry in cont_config.columns
+            ]
+            if cont_config
+            else None,
+            "data": fingerprint,
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def load(self, key: str):
+        """Method that loads a fitted synthesizer
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            Synthesizer: The synthesizer including its fitted transformer, None if it is not cached
+        """
+        path = self.__path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as infile:
+            return pickle.load(infile)
+
+    def store(self, key: str, synth):
+        """Method that stores a fitted synthesizer
+
+        Args:
+            key (str): The cache key
+            synth (Synthesizer): The synthesizer including its fitted transformer
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.__path(key)
+        # Concurrent runs must never read a partially written model
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as outfile:
+            pickle.dump(synth, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def __path(self, key: str):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
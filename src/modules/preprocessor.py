@@ -34,7 +34,7 @@ class Preprocessor:
 
         tt = TableTransformer.create(
             dataset,
-            nullable=dataset.isnull().values.any(),
+            nullable=any(column.hasnans for _, column in dataset.items()),
             categorical_columns=self.config.column_classification.categorical,
             continuous_columns=self.config.column_classification.continuous,
             ordinal_columns=self.config.column_classification.ordinal,
@@ -77,7 +77,7 @@ class Preprocessor:
                 else:
                     max_bound = int(upper)
 
-            null_flag = dataset[col_name].isnull().values.any()
+            null_flag = dataset[col_name].hasnans
             constraints[col_name] = BinTransformer(
                 bins=bins, lower=min_bound, upper=max_bound, nullable=null_flag
             )
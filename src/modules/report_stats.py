@@ -0,0 +1,582 @@
+"""A module that accumulates the statistics of the evaluation report chunk by chunk
+
+All accumulators can be merged, so a table can be described while it streams through the pipeline
+without keeping it in memory or reading it twice.
+"""
+import warnings
+import numpy as np
+import pandas as pd
+
+# Number of values per level of the quantile sketches
+SKETCH_SIZE = 2048
+# Number of rows that are kept for the KDE curves if no sample size is configured
+KDE_SAMPLE_ROWS = 100000
+# Number of rows the accumulators process at once
+UPDATE_ROWS = 100000
+# Seed of the row sample, a fixed seed keeps reports of the same data comparable
+SAMPLE_SEED = 0
+
+
+def numeric_matrix(dataset: pd.DataFrame, columns: list):
+    """Function that converts numeric columns to a float matrix with NaN for missing values
+
+    Args:
+        dataset (pd.DataFrame): The data
+        columns (list[str]): The columns
+
+    Returns:
+        np.ndarray: Matrix with one row per row of the data and one column per column
+    """
+    matrix = np.empty((len(dataset), len(columns)))
+    for i, col in enumerate(columns):
+        matrix[:, i] = dataset[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return matrix
+
+
+class Moments:
+    """
+    A class to represent the count, mean, variance and range of columns that are merged with Chan's formulas
+
+    Attributes
+    ----------
+    count : np.ndarray
+        Number of values per column
+    mean : np.ndarray
+        Mean per column
+    m2 : np.ndarray
+        Sum of the squared deviations from the mean per column
+    minimum : np.ndarray
+        Minimum per column, NaN if there are no values
+    maximum : np.ndarray
+        Maximum per column, NaN if there are no values
+    """
+
+    def __init__(self, width: int):
+        self.count = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.minimum = np.full(width, np.nan)
+        self.maximum = np.full(width, np.nan)
+
+    def update(self, values: np.ndarray):
+        """Method that adds a chunk of rows
+
+        Args:
+            values (np.ndarray): Matrix of the rows, NaN values are skipped
+        """
+        present = ~np.isnan(values)
+        count = present.sum(axis=0).astype(np.float64)
+        filled = np.where(present, values, 0.0)
+        mean = np.divide(filled.sum(axis=0), count, out=np.zeros_like(count), where=count > 0)
+        m2 = (np.where(present, values - mean, 0.0) ** 2).sum(axis=0)
+        chunk = Moments(len(count))
+        chunk.count, chunk.mean, chunk.m2 = count, mean, m2
+        if len(values):
+            with warnings.catch_warnings():
+                # Columns without values have no range
+                warnings.simplefilter("ignore", RuntimeWarning)
+                chunk.minimum = np.nanmin(values, axis=0)
+                chunk.maximum = np.nanmax(values, axis=0)
+        self.merge(chunk)
+
+    def merge(self, other: "Moments"):
+        """Method that adds the moments of other rows
+
+        Args:
+            other (Moments): The moments of the other rows
+        """
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        weight = np.divide(other.count, count, out=np.zeros_like(count), where=count > 0)
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + other.m2 + delta**2 * self.count * weight
+        self.count = count
+        self.minimum = np.fmin(self.minimum, other.minimum)
+        self.maximum = np.fmax(self.maximum, other.maximum)
+
+    def std(self):
+        """Method that returns the sample standard deviation per column
+
+        Returns:
+            np.ndarray: The standard deviations, NaN for columns with less than two values
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+
+class QuantileSketch:
+    """
+    A class to represent a mergeable quantile sketch of compactors (KLL)
+
+    Every level holds up to SKETCH_SIZE values of weight 2^level. A full level is sorted and every other
+    value is promoted to the next level, starting at a random position. The quantiles of up to SKETCH_SIZE
+    values are exact, beyond that the rank error is about log2(count / SKETCH_SIZE) / SKETCH_SIZE.
+
+    Attributes
+    ----------
+    levels : list[np.ndarray]
+        The values per level
+    """
+
+    def __init__(self):
+        self.levels = [np.empty(0)]
+        self.__rng = np.random.default_rng(SAMPLE_SEED)
+
+    def update(self, values: np.ndarray):
+        """Method that adds values
+
+        Args:
+            values (np.ndarray): The values, NaN values are skipped
+        """
+        self.levels[0] = np.concatenate([self.levels[0], values[~np.isnan(values)]])
+        self.__compact()
+
+    def merge(self, other: "QuantileSketch"):
+        """Method that adds the values of another sketch
+
+        Args:
+            other (QuantileSketch): The other sketch
+        """
+        for level, values in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.__compact()
+
+    def quantiles(self, fractions: list[float]):
+        """Method that estimates quantiles, exact ones are interpolated linearly as by pandas
+
+        Args:
+            fractions (list[float]): The quantiles to estimate in [0, 1]
+
+        Returns:
+            np.ndarray: The estimates, NaN if the sketch is empty
+        """
+        if len(self.levels) == 1:
+            if len(self.levels[0]) == 0:
+                return np.full(len(fractions), np.nan)
+            return np.quantile(self.levels[0], fractions)
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(values), 2.0**level) for level, values in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        ranks = np.asarray(fractions) * (cumulative[-1] - 1)
+        return values[order][np.searchsorted(cumulative, ranks, side="right")]
+
+    def __compact(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > SKETCH_SIZE:
+                values = np.sort(values)
+                # An odd value stays on its level, so the total weight is preserved
+                kept = values[: len(values) % 2]
+                pairs = values[len(values) % 2 :]
+                promoted = pairs[self.__rng.integers(2) :: 2]
+                self.levels[level] = kept
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+
+class CategoryCounter:
+    """
+    A class to represent an incremental factorization that also counts the values
+
+    The codes follow the order in which the values first appear, as with pd.factorize.
+
+    Attributes
+    ----------
+    codes : dict
+        Code per value
+    counts : np.ndarray
+        Number of rows per code
+    """
+
+    def __init__(self):
+        self.codes = {}
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def update(self, column: pd.Series):
+        """Method that counts the values of a chunk and returns their codes
+
+        Args:
+            column (pd.Series): The values of the chunk
+
+        Returns:
+            np.ndarray: The code of every value, -1 for missing values
+        """
+        local_codes, uniques = pd.factorize(column)
+        if len(uniques) == 0:
+            return local_codes
+        mapping = np.array([self.codes.setdefault(value, len(self.codes)) for value in uniques], dtype=np.int64)
+        codes = np.where(local_codes >= 0, mapping.take(local_codes), -1)
+        self.counts = np.bincount(codes[codes >= 0], minlength=len(self.codes)) + np.pad(
+            self.counts, (0, len(self.codes) - len(self.counts))
+        )
+        return codes
+
+    def merge(self, other: "CategoryCounter"):
+        """Method that adds the counts of another counter, values are matched by label and the new values of
+        the other counter get the following codes
+
+        Args:
+            other (CategoryCounter): The other counter
+
+        Returns:
+            np.ndarray: The code of every code of the other counter
+        """
+        remap = np.array([self.codes.setdefault(value, len(self.codes)) for value in other.codes], dtype=np.int64)
+        counts = np.pad(self.counts, (0, len(self.codes) - len(self.counts)))
+        np.add.at(counts, remap, other.counts)
+        self.counts = counts
+        return remap
+
+    def value_counts(self):
+        """Method that returns the counts like pd.Series.value_counts
+
+        Returns:
+            pd.Series: Number of rows per value, sorted descending
+        """
+        counts = pd.Series(self.counts, index=list(self.codes), dtype=np.int64)
+        return counts.sort_values(ascending=False, kind="stable")
+
+
+class CoMoments:
+    """
+    A class to represent the pairwise sums of shifted columns that yield their Pearson correlation
+
+    Like pd.DataFrame.corr, every pair of columns only takes the rows into account where both are present.
+    The values are shifted by the means of the first chunk to keep the sums accurate.
+
+    Attributes
+    ----------
+    shift : np.ndarray
+        Value that is subtracted per column, None before the first chunk
+    count : np.ndarray
+        Number of rows per pair where both columns are present
+    sums : np.ndarray
+        Sum of the first column of every pair over these rows
+    squares : np.ndarray
+        Sum of the squares of the first column of every pair over these rows
+    products : np.ndarray
+        Sum of the products of every pair
+    unknown : np.ndarray
+        Whether the sums of a column mix different codes of the same value, its correlations are then unknown
+    """
+
+    def __init__(self, width: int):
+        self.shift = None
+        self.unknown = np.zeros(width, dtype=bool)
+        self.count = np.zeros((width, width))
+        self.sums = np.zeros((width, width))
+        self.squares = np.zeros((width, width))
+        self.products = np.zeros((width, width))
+
+    def update(self, values: np.ndarray):
+        """Method that adds a chunk of rows
+
+        Args:
+            values (np.ndarray): Matrix of the rows, NaN values are skipped
+        """
+        if len(values) == 0:
+            return
+        if self.shift is None:
+            with warnings.catch_warnings():
+                # Columns without values are not shifted
+                warnings.simplefilter("ignore", RuntimeWarning)
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0))
+        present = (~np.isnan(values)).astype(np.float64)
+        shifted = np.where(present > 0, values - self.shift, 0.0)
+        self.count += present.T @ present
+        self.sums += shifted.T @ present
+        self.squares += (shifted**2).T @ present
+        self.products += shifted.T @ shifted
+
+    def merge(self, other: "CoMoments"):
+        """Method that adds the sums of other rows, which are moved to the shift of these sums
+
+        Args:
+            other (CoMoments): The sums of the other rows
+        """
+        if other.shift is None:
+            return
+        if self.shift is None:
+            self.shift = other.shift
+        delta = (self.shift - other.shift)[:, None]
+        # Sums of x - s from sums of x - t, with d = s - t: sum(x - t) - d * n
+        sums = other.sums - delta * other.count
+        self.squares += other.squares - 2 * delta * other.sums + delta**2 * other.count
+        self.products += other.products - delta * other.sums.T - delta.T * other.sums + delta * delta.T * other.count
+        self.sums += sums
+        self.count += other.count
+        self.unknown |= other.unknown
+
+    def correlation(self):
+        """Method that returns the Pearson correlation of every pair of columns
+
+        Returns:
+            np.ndarray: The correlation matrix, NaN for pairs without spread
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covariance = self.count * self.products - self.sums * self.sums.T
+            variance = self.count * self.squares - self.sums**2
+            correlation = covariance / np.sqrt(variance * variance.T)
+        correlation[self.count < 2] = np.nan
+        correlation[self.unknown, :] = np.nan
+        correlation[:, self.unknown] = np.nan
+        return np.clip(correlation, -1, 1)
+
+
+class RowSample:
+    """
+    A class to represent a uniform sample of rows that keeps the rows with the smallest random keys
+
+    The sample of merged samples is a uniform sample of all rows.
+
+    Attributes
+    ----------
+    size : int
+        Maximum number of rows
+    keys : np.ndarray
+        Random key per sampled row
+    rows : np.ndarray
+        The sampled rows
+    """
+
+    def __init__(self, size: int, width: int):
+        self.size = size
+        self.keys = np.empty(0)
+        self.rows = np.empty((0, width))
+        self.__rng = np.random.default_rng(SAMPLE_SEED)
+
+    def update(self, values: np.ndarray):
+        """Method that offers a chunk of rows to the sample
+
+        Args:
+            values (np.ndarray): Matrix of the rows
+        """
+        self.__keep(np.concatenate([self.keys, self.__rng.random(len(values))]), np.vstack([self.rows, values]))
+
+    def merge(self, other: "RowSample"):
+        """Method that merges the sample of other rows
+
+        Args:
+            other (RowSample): The other sample
+        """
+        self.__keep(np.concatenate([self.keys, other.keys]), np.vstack([self.rows, other.rows]))
+
+    def __keep(self, keys: np.ndarray, rows: np.ndarray):
+        if len(keys) > self.size:
+            kept = np.argpartition(keys, self.size)[: self.size]
+            keys, rows = keys[kept], rows[kept]
+        self.keys, self.rows = keys, rows
+
+
+class ReportStatistics:
+    """
+    A class to represent the statistics of a table that the evaluation report is generated from
+
+    The columns are split into numeric and other columns by the dtypes of the first chunk, as in
+    visu.generateVisu. Other columns are factorized for the correlation map.
+
+    Attributes
+    ----------
+    columns : list[str]
+        All columns in table order, None before the first chunk
+    continuous : list[str]
+        Numeric columns
+    categorical : list[str]
+        Other columns
+    sample_rows : int
+        Number of rows that are kept for the KDE curves
+    failed : bool
+        Whether a chunk could not be observed, the statistics are then incomplete
+    """
+
+    def __init__(self, columns: list[str] = None, continuous: list[str] = None, sample_rows: int = None):
+        self.columns = None
+        self.continuous = None
+        self.categorical = None
+        self.sample_rows = sample_rows or KDE_SAMPLE_ROWS
+        self.failed = False
+        self.__moments = None
+        self.__sketches = None
+        self.__counters = None
+        self.__comoments = None
+        self.__sample = None
+        if columns is not None:
+            self.__start(columns, continuous)
+
+    def empty_like(self):
+        """Method that creates empty statistics of the same columns, e.g. for the anonymized table
+
+        Returns:
+            ReportStatistics: The empty statistics
+        """
+        return ReportStatistics(self.columns, self.continuous, self.sample_rows)
+
+    def update(self, dataset: pd.DataFrame):
+        """Method that adds a chunk of rows of the table
+
+        Args:
+            dataset (pd.DataFrame): The rows
+        """
+        if self.columns is None:
+            self.__start(list(dataset.columns), list(dataset.select_dtypes(include=[np.number])))
+
+        positions = {col: i for i, col in enumerate(self.continuous)}
+        for start in range(0, len(dataset), UPDATE_ROWS):
+            chunk = dataset.iloc[start : start + UPDATE_ROWS]
+            numeric = numeric_matrix(chunk, self.continuous)
+            self.__moments.update(numeric)
+            for i, sketch in enumerate(self.__sketches):
+                sketch.update(numeric[:, i])
+            self.__sample.update(numeric)
+
+            # Like the pearson method of the correlation engine, missing values get the code -1 and the
+            # correlation is of absolute values
+            factorized = np.empty((len(chunk), len(self.columns)))
+            for i, col in enumerate(self.columns):
+                if col in self.__counters:
+                    factorized[:, i] = self.__counters[col].update(chunk[col])
+                else:
+                    factorized[:, i] = numeric[:, positions[col]]
+            self.__comoments.update(np.abs(factorized))
+
+    def observe(self, dataset: pd.DataFrame):
+        """Method that adds a chunk of rows like update, but never raises, so it can observe a transfer
+
+        After the first error the statistics are marked as failed and no further chunks are added.
+
+        Args:
+            dataset (pd.DataFrame): The rows
+        """
+        if self.failed:
+            return
+        try:
+            self.update(dataset)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            self.failed = True
+            print(f"The statistics of the streaming evaluation report are no longer collected: {error}")
+
+    def merge(self, other: "ReportStatistics"):
+        """Method that adds the statistics of other rows of the table
+
+        The values of categorical columns are matched by label, so the value counts are exact. The sums of the
+        correlations are of the codes, which can not be changed after the fact, hence the correlations of a
+        column whose values were coded in a different order by the other statistics are unknown.
+
+        Args:
+            other (ReportStatistics): The statistics of the other rows
+        """
+        self.failed |= other.failed
+        if other.columns is None:
+            return
+        if self.columns is None:
+            self.__start(other.columns, other.continuous)
+
+        self.__moments.merge(other.moments)
+        for sketch, other_sketch in zip(self.__sketches, other.sketches):
+            sketch.merge(other_sketch)
+        self.__comoments.merge(other.comoments)
+        for col, counter in self.__counters.items():
+            other_counter = other.counter(col)
+            remap = counter.merge(other_counter)
+            # Only the codes of counted values entered the sums
+            counted = remap[: len(other_counter.counts)][other_counter.counts > 0]
+            if np.any(counted != np.flatnonzero(other_counter.counts > 0)):
+                self.__comoments.unknown[self.columns.index(col)] = True
+        self.__sample.merge(other.row_sample)
+
+    @property
+    def moments(self):
+        """Moments: The moments of the numeric columns"""
+        return self.__moments
+
+    @property
+    def sketches(self):
+        """list[QuantileSketch]: The quantile sketch of every numeric column"""
+        return self.__sketches
+
+    @property
+    def comoments(self):
+        """CoMoments: The sums of the correlations of all columns"""
+        return self.__comoments
+
+    @property
+    def row_sample(self):
+        """RowSample: The sampled rows of the numeric columns"""
+        return self.__sample
+
+    def counter(self, col: str):
+        """Method that returns the counter of a categorical column
+
+        Args:
+            col (str): The column
+
+        Returns:
+            CategoryCounter: The counter
+        """
+        return self.__counters[col]
+
+    def describe(self):
+        """Method that returns the statistics of visu.DESCRIBE_ROWS of the numeric columns
+
+        Returns:
+            np.ndarray: The statistics, one column per numeric column
+        """
+        quantiles = np.array([sketch.quantiles([0.25, 0.5, 0.75]) for sketch in self.__sketches]).reshape(-1, 3)
+        moments = self.__moments
+        return np.vstack(
+            [
+                moments.count,
+                np.where(moments.count > 0, moments.mean, np.nan),
+                moments.std(),
+                moments.minimum,
+                quantiles.T,
+                moments.maximum,
+            ]
+        )
+
+    def value_counts(self, col: str):
+        """Method that returns the counts of the values of a categorical column
+
+        Args:
+            col (str): The column
+
+        Returns:
+            pd.Series: Number of rows per value, sorted descending
+        """
+        return self.__counters[col].value_counts()
+
+    def sample(self, col: str):
+        """Method that returns the sampled values of a numeric column
+
+        Args:
+            col (str): The column
+
+        Returns:
+            np.ndarray: The values, NaN for missing values
+        """
+        return self.__sample.rows[:, self.continuous.index(col)]
+
+    def correlation(self):
+        """Method that returns the correlation of all columns like the pearson method of the correlation engine
+
+        Returns:
+            pd.DataFrame: The correlation matrix
+        """
+        return pd.DataFrame(self.__comoments.correlation(), index=self.columns, columns=self.columns)
+
+    def __start(self, columns: list[str], continuous: list[str]):
+        self.columns = columns
+        self.continuous = continuous
+        self.categorical = [col for col in columns if col not in continuous]
+        self.__moments = Moments(len(continuous))
+        self.__sketches = [QuantileSketch() for _ in continuous]
+        self.__counters = {col: CategoryCounter() for col in self.categorical}
+        self.__comoments = CoMoments(len(columns))
+        self.__sample = RowSample(self.sample_rows, len(continuous))
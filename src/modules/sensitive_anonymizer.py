@@ -1,10 +1,30 @@
 """Module that handles the anonymization of sensitive value
 """
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
-from faker import Faker
 
-from configuration.configurations import SensitiveConfig
+from configuration.configurations import SensitiveConfig, SensitiveEntry
+from modules.fake_values import (
+    POOL_SIZE,
+    chunk_rng,
+    draw_fake_values,
+    fake_pool,
+    has_method,
+    keyed_fake_values,
+    keyed_integers,
+    keyed_strings,
+    preload_pools,
+    random_strings,
+    unique_fake_values,
+    unique_random_strings,
+)
+from modules.vocab_cache import VocabularyCache
 
+# Number of rows per task in the modes that fake every row on its own, it is part of the seed derivation
+CHUNK_ROWS = 1000000
 
 
 class SensitiveAnonymizer:
@@ -23,77 +43,286 @@ class SensitiveAnonymizer:
     def run_anonymization(self):
         """Method that starts the anonymization of sensitive values
 
+        With more than one worker the columns, and chunks of rows of the natural mode and of integer
+        columns of the keyed mode, are faked in a pool of processes. The output is the same as the one
+        of a single worker.
+
         Returns:
             pd.DataFrame: Anonymized data
         """
-        anon_data = self.dataset.copy()
+        # Only the faked columns are new, all other columns are shared with the input
+        columns = dict(self.dataset.items())
         list_of_mappings = []
         if self.sens_config:
-            for col in self.sens_config.columns:
-                anon_data, mapping = self.__fake_column(
-                    anon_data, col.name, col.method, col.mode, col.locales, col.seed
+            entries = self.sens_config.columns
+            tasks = self.__tasks()
+            pieces = [[] for _ in entries]
+            mappings = [{} for _ in entries]
+            seconds = [0.0] * len(entries)
+            for (entry_index, _), (piece, mapping, elapsed) in zip(tasks, self.__run_tasks(tasks)):
+                pieces[entry_index].append(piece)
+                mappings[entry_index].update(mapping)
+                seconds[entry_index] += elapsed
+
+            for entry_index, col in enumerate(entries):
+                parts = pieces[entry_index]
+                columns[col.name] = pd.concat(parts) if len(parts) > 1 else parts[0]
+                list_of_mappings.append(mappings[entry_index])
+                # The rate is the one of a single worker, as the chunks of a column may run concurrently
+                rate = len(columns[col.name]) / seconds[entry_index] if seconds[entry_index] > 0 else 0.0
+                print(
+                    f"Faked {col.name} ({col.mode}): {len(columns[col.name])} rows in "
+                    f"{seconds[entry_index]:0.2f} seconds ({rate:0.0f} rows/s)"
                 )
-                list_of_mappings.append(mapping)
-        return anon_data
-
-    def __fake_column(
-        self,
-        dataset: pd.DataFrame,
-        col_name: str,
-        method: str,
-        mode: str,
-        locales: list,
-        seed=0,
-    ):
-        if len(locales) > 0:
-            fake = Faker(locales)
-        else:
-            fake = Faker()
-
-        fake.seed_instance(seed)
-        sensDict = {}
-        replacementValues = []
-        minValueLength = 0
-        maxValueLength = 1
-        dataset[col_name] = dataset[col_name].astype(str)
-        try:
-            if mode == "unique":
-                fakerFunc = getattr(fake.unique, method)
-            else:
-                fakerFunc = getattr(fake, method)
-            exists = True
-        except AttributeError:
-            exists = False
-            minValueLength = len(min(dataset[col_name].tolist(), key=len))
-            maxValueLength = len(max(dataset[col_name].tolist(), key=len))
-            print("Faker method '" + method + "' not found. Resorting to random String")
-        # Fitting mode requires each distinct value to have their own translation
-        collection = (
-            dataset[col_name].unique() if mode == "fitting" else dataset[col_name]
-        )
-        for val in collection:
-            if exists:
-                fakeValue = fakerFunc()
-                if mode == "fitting":
-                    sensDict[val] = fakeValue
-                else:
-                    replacementValues.append(fakeValue)
-            else:
-                if mode == "natural":
-                    replacementValues.append(
-                        fake.pystr(min_chars=minValueLength, max_chars=maxValueLength)
-                    )
-                else:
-                    fakeString = fake.unique.pystr(
-                        min_chars=minValueLength, max_chars=maxValueLength
+        return pd.DataFrame(columns, index=self.dataset.index, copy=False)
+
+    def __tasks(self):
+        """Method that splits the faking into tasks
+
+        Returns:
+            list[(int,dict)]: The index of the sensitive entry and the arguments of fake_column_chunk per task
+        """
+        tasks = []
+        for entry_index, col in enumerate(self.sens_config.columns):
+            column = self.dataset[col.name]
+            value_lengths = (0, 1)
+            # Integer keys are permuted value by value, independent of the Faker method and the other rows
+            integer_keys = col.mode == "keyed" and is_integer_column(column)
+            if not integer_keys and not has_method(col.method, tuple(col.locales)):
+                print("Faker method '" + col.method + "' not found. Resorting to random String")
+                lengths = column.astype(str).str.len()
+                if len(column):
+                    value_lengths = (int(lengths.min()), int(lengths.max()))
+
+            chunk_rows = CHUNK_ROWS if col.mode == "natural" or integer_keys else max(len(column), 1)
+            for chunk_index, start in enumerate(range(0, max(len(column), 1), chunk_rows)):
+                tasks.append(
+                    (
+                        entry_index,
+                        {
+                            "column": column.iloc[start : start + chunk_rows],
+                            "entry": col,
+                            "vocab_dir": self.sens_config.vocab_dir,
+                            "rows": len(column),
+                            "chunk_index": chunk_index,
+                            "value_lengths": value_lengths,
+                        },
                     )
-                    if mode == "fitting":
-                        sensDict[val] = fakeString
-                    else:
-                        replacementValues.append(fakeString)
-        if mode == "fitting":
-            dataset[col_name] = dataset[col_name].map(sensDict)
+                )
+        return tasks
+
+    def __run_tasks(self, tasks: list):
+        """Generator that runs the tasks in order, in a pool of processes if there is more than one worker
+
+        Args:
+            tasks (list[(int,dict)]): The tasks
+
+        Yields:
+            (pd.Series,dict,float): The faked values, the mapping and the duration of every task
+        """
+        workers = min(self.sens_config.workers, len(tasks))
+        if workers <= 1:
+            for _, kwargs in tasks:
+                yield fake_column_chunk(**kwargs)
+            return
+
+        # Forking a process that runs a JVM is not safe, hence the workers are spawned
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            # The pools shared by the chunks of a column are generated once and sent along with the chunks
+            vocab_dir = self.sens_config.vocab_dir
+            cache = VocabularyCache(vocab_dir) if vocab_dir else None
+            pool_futures = {}
+            for _, kwargs in tasks:
+                key = self.__pool_key(kwargs)
+                if key is not None and key not in pool_futures:
+                    pool_futures[key] = executor.submit(fake_pool, *key, cache)
+
+            # Tasks that wait for a pool are submitted last, so the others run in the meantime
+            futures = [None] * len(tasks)
+            order = sorted(range(len(tasks)), key=lambda i: self.__pool_key(tasks[i][1]) is not None)
+            for i in order:
+                kwargs = tasks[i][1]
+                key = self.__pool_key(kwargs)
+                pools = {key: pool_futures[key].result()} if key is not None else None
+                futures[i] = executor.submit(fake_column_chunk, **kwargs, pools=pools)
+            for future in futures:
+                yield future.result()
+
+    def __pool_key(self, kwargs: dict):
+        """Method that returns the pool a task shares with the other chunks of its column
+
+        Args:
+            kwargs (dict): The arguments of fake_column_chunk
+
+        Returns:
+            tuple: The (method, locales, seed, size) of the pool, None if the task does not share a pool
+        """
+        entry = kwargs["entry"]
+        locales = tuple(entry.locales)
+        if kwargs["rows"] <= CHUNK_ROWS or entry.seed is None or not has_method(entry.method, locales):
+            return None
+        if entry.mode == "natural":
+            return (entry.method, locales, entry.seed, min(kwargs["rows"], POOL_SIZE))
+        return None
+
+
+def fake_column_chunk(
+    column: pd.Series,
+    entry: SensitiveEntry,
+    vocab_dir: str,
+    rows: int,
+    chunk_index: int,
+    value_lengths: tuple,
+    pools: dict = None,
+):
+    """Function that fakes a column or a chunk of CHUNK_ROWS rows of it
+
+    Args:
+        column (pd.Series): The original values of the chunk
+        entry (SensitiveEntry): The configuration of the column
+        vocab_dir (str): Directory of the vocabulary cache, None disables the cache
+        rows (int): Number of rows of the whole column
+        chunk_index (int): Position of the chunk
+        value_lengths (tuple[int,int]): Minimum and maximum length of the values of the whole column
+        pools (dict, optional): Fake-value pools generated by another process, by (method, locales, seed, size)
+
+    Returns:
+        (pd.Series,dict,float): The faked values, the mapping of original to fake values of the fitting modes
+        and the duration in seconds
+    """
+    start_time = time.perf_counter()
+    if pools:
+        preload_pools(pools)
+    method = entry.method
+    mode = entry.mode
+    seed = entry.seed
+    locales = tuple(entry.locales)
+    cache = VocabularyCache(vocab_dir) if vocab_dir else None
+    rng = chunk_rng(seed, chunk_index)
+    sens_dict = {}
+    min_value_length, max_value_length = value_lengths
+    if mode == "keyed":
+        # Keyed mode derives the fake value from a keyed hash of the original value instead of a mapping
+        return fake_keyed(column, entry, cache), sens_dict, time.perf_counter() - start_time
+
+    column = column.astype(str)
+    exists = has_method(method, locales)
+
+    if mode == "unique" or (mode == "fitting" and not exists):
+        column, sens_dict = fake_unique(column, entry, cache, rng, value_lengths)
+    elif mode == "fitting":
+        # Fitting mode requires each distinct value to have their own translation
+        codes, uniques = pd.factorize(column)
+        fake_values = draw_fake_values(method, locales, seed, len(uniques), rng, cache)
+        sens_dict = dict(zip(uniques, fake_values))
+        column = pd.Series(fake_values.take(codes), index=column.index, name=column.name)
+    else:
+        if exists:
+            start = chunk_index * CHUNK_ROWS
+            replacement_values = draw_fake_values(
+                method, locales, seed, rows, rng, cache, slice(start, start + len(column))
+            )
         else:
-            dataset[col_name] = replacementValues
-        fake.unique.clear()
-        return dataset, sensDict
+            replacement_values = random_strings(rng, len(column), min_value_length, max_value_length)
+        column = pd.Series(replacement_values, index=column.index, name=column.name)
+
+    return column, sens_dict, time.perf_counter() - start_time
+
+
+def fake_unique(
+    column: pd.Series,
+    entry: SensitiveEntry,
+    cache: VocabularyCache,
+    rng: np.random.Generator,
+    value_lengths: tuple,
+):
+    """Function that fakes a whole column with distinct values per row or per distinct value
+
+    Args:
+        column (pd.Series): The original values as strings
+        entry (SensitiveEntry): The configuration of the column
+        cache (VocabularyCache): The vocabulary cache, None disables the cache
+        rng (np.random.Generator): The random generator
+        value_lengths (tuple[int,int]): Minimum and maximum length of random strings
+
+    Returns:
+        (pd.Series,dict): The faked values and the mapping of original to fake values of the fitting mode
+    """
+    sens_dict = {}
+    locales = tuple(entry.locales)
+    if entry.mode == "fitting":
+        codes, uniques = pd.factorize(column)
+        count = len(uniques)
+    else:
+        count = len(column)
+
+    if has_method(entry.method, locales):
+        fake_values = unique_fake_values(entry.method, locales, entry.seed, count, rng, cache)
+    else:
+        fake_values = unique_random_strings(rng, count, *value_lengths)
+
+    if entry.mode == "fitting":
+        sens_dict = dict(zip(uniques, fake_values))
+        fake_values = fake_values.take(codes)
+    column = pd.Series(fake_values, index=column.index, name=column.name)
+    return column, sens_dict
+
+
+def is_integer_column(column: pd.Series):
+    """Function that checks whether a column holds integer keys
+
+    Float columns whose values are all integral count as well, as integer keys with NULL values are read
+    as floats.
+
+    Args:
+        column (pd.Series): The values
+
+    Returns:
+        bool: Whether the column holds integers
+    """
+    if pd.api.types.is_integer_dtype(column.dtype):
+        return True
+    if not pd.api.types.is_float_dtype(column.dtype):
+        return False
+    values = column.dropna().to_numpy()
+    return bool(np.all(np.isfinite(values) & (np.trunc(values) == values) & (np.abs(values) < 2**63)))
+
+
+def fake_keyed(column: pd.Series, entry: SensitiveEntry, cache: VocabularyCache):
+    """Function that fakes a column with the keyed mode, keeping its type, its width and its NULL values
+
+    Integer columns get a keyed permutation of the integers, which maps every key to the same pseudonym in
+    every table, so joins on them hold. String columns get distinct values of at most the length of the
+    longest original value, their pseudonyms are the same for columns with the same distinct values.
+
+    Args:
+        column (pd.Series): The original values
+        entry (SensitiveEntry): The configuration of the column
+        cache (VocabularyCache): The vocabulary cache, None disables the cache
+
+    Raises:
+        ValueError: The column holds numbers that are not integers
+
+    Returns:
+        pd.Series: The faked values
+    """
+    present = column.notna().to_numpy()
+    if is_integer_column(column):
+        values = column.to_numpy().copy()
+        values[present] = keyed_integers(values[present].astype(np.int64), entry.seed)
+        return pd.Series(values, index=column.index, name=column.name)
+    if pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype):
+        raise ValueError(f"The keyed mode of column '{column.name}' requires integer or string values")
+
+    texts = column[present].astype(str)
+    lengths = texts.str.len()
+    min_chars, max_chars = (int(lengths.min()), int(lengths.max())) if len(texts) else (0, 0)
+    locales = tuple(entry.locales)
+    if has_method(entry.method, locales):
+        fake_values = keyed_fake_values(entry.method, locales, entry.seed, texts.to_numpy(), max_chars, cache)
+    else:
+        fake_values = keyed_strings(texts.to_numpy(), entry.seed, min_chars, max_chars)
+    values = np.full(len(column), None, dtype=object)
+    values[present] = fake_values
+    return pd.Series(values, index=column.index, name=column.name)
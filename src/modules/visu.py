@@ -2,54 +2,71 @@
 from an original and anonymized DataFrame
 """
 import json
-import pandas as pd
+import os
+import time
+import warnings
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+from modules.correlation import CorrelationEngine, load_matrix, save_matrix
+
 DESCRIBE_ROWS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+OUTPUT_DIR = "../output"
+# Options of the KDE curves, the defaults of seaborn's kdeplot with Scott's bandwidth
+KDE_GRIDSIZE = 200
+KDE_CUT = 3
+# Number of bins the data is linearly binned into before it is convolved with the kernel
+KDE_BINS = 2048
+# Number of rows the correlation matrices are computed on, larger tables are sampled
+CORRELATION_ROWS = 1000000
+# Seed of the row sample of the report, a fixed seed keeps reports of the same data comparable
+REPORT_SEED = 0
 
 
-def compareNumericalCols(dataset, synthFrame, continuous):
-    jsonDict = []
-    numPlots = len(continuous)
+def compareNumericalCols(dataset, synthFrame, continuous, outputDir=OUTPUT_DIR):
+    columnValues = ((col, numericValues(dataset[col]), numericValues(synthFrame[col])) for col in continuous)
+    writeKdeInfo(columnValues, outputDir)
 
-    if numPlots < 1:
-        print("No numerical columns found!")
-    else:
-        for _, col in enumerate(continuous):
-            pltO = sns.kdeplot(data=dataset[col])
-            pltA = sns.kdeplot(data=synthFrame[col])
+    boxNumerical(dataset, synthFrame, continuous, outputDir)
 
-            x, y = pltO.get_lines()[0].get_data()
 
-            xA, yA = pltA.get_lines()[1].get_data()
-            jsonObj = {
-                "column": col,
-                "origX": list(x),
-                "origY": list(y),
-                "anonX": list(xA),
-                "anonY": list(yA),
-            }
-            jsonDict.append(jsonObj)
-            plt.clf()
+def writeKdeInfo(columnValues, outputDir=OUTPUT_DIR):
+    # columnValues yields the name, original and anonymized values of every numerical column
+    jsonDict = []
+    for col, values, valuesA in columnValues:
+        # Both curves are evaluated on the same grid
+        x, y, yA = kdeCurves(values, valuesA)
+        jsonObj = {
+            "column": col,
+            "origX": list(x),
+            "origY": list(y),
+            "anonX": list(x),
+            "anonY": list(yA),
+        }
+        jsonDict.append(jsonObj)
 
-    with open("../output/kdeInfo.json", "w", encoding="utf-8") as outfile:
+    if len(jsonDict) < 1:
+        print("No numerical columns found!")
+    with open(f"{outputDir}/kdeInfo.json", "w", encoding="utf-8") as outfile:
         json.dump(jsonDict, outfile)
 
-    boxNumerical(dataset, synthFrame, continuous)
+
+def boxNumerical(dataset, synthFrame, continuous, outputDir=OUTPUT_DIR):
+    describedO = describeColumns(dataset, continuous) if continuous else None
+    describedA = describeColumns(synthFrame, continuous) if continuous else None
+    writeNumInfo(continuous, describedO, describedA, outputDir)
 
 
-def boxNumerical(dataset, synthFrame, continuous):
+def writeNumInfo(continuous, describedO, describedA, outputDir=OUTPUT_DIR):
+    # The described arrays hold the statistics of DESCRIBE_ROWS, one column per numerical column
     jsonDict = []
     rows = len(continuous)
 
     if rows > 0:
-        for column in continuous:
-            colOrig = dataset[column]
-            colAnon = synthFrame[column]
-            dscO = list(colOrig.describe())
-            dscA = list(colAnon.describe())
+        for i, column in enumerate(continuous):
+            dscO = describedO[:, i]
+            dscA = describedA[:, i]
             celltext = []
             for j, origVal in enumerate(dscO):
                 celltext.append(
@@ -61,17 +78,105 @@ def boxNumerical(dataset, synthFrame, continuous):
                 )
             jsonObj = {"column": column, "data": celltext}
             jsonDict.append(jsonObj)
-    with open("../output/numInfo.json", "w", encoding="utf-8") as outfile:
+    with open(f"{outputDir}/numInfo.json", "w", encoding="utf-8") as outfile:
         json.dump(jsonDict, outfile)
 
 
-def compareCategorical(dataset, synthFrame, categorical):
+def numericValues(column):
+    # Float values of a numeric column with NaN for missing values
+    return column.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def describeColumns(df, columns):
+    # The statistics of DESCRIBE_ROWS of all columns at once, one column of the result per column
+    values = np.vstack([numericValues(df[col]) for col in columns])
+    counts = (~np.isnan(values)).sum(axis=1)
+    described = np.full((len(DESCRIBE_ROWS), len(columns)), np.nan)
+    described[0] = counts
+    if values.shape[1] == 0:
+        return described
+
+    with warnings.catch_warnings():
+        # Undefined statistics of empty and single-valued columns are NaN as with describe
+        warnings.simplefilter("ignore", RuntimeWarning)
+        described[1] = np.nanmean(values, axis=1)
+        described[2] = np.nanstd(values, axis=1, ddof=1)
+
+        # Linearly interpolated quantiles of the sorted rows, NaN values are sorted to the end
+        ordered = np.sort(values, axis=1)
+        last = np.maximum(counts - 1, 0)[:, None]
+        positions = last * np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+        lower = np.floor(positions).astype(np.intp)
+        upper = np.minimum(lower + 1, last)
+        lowerValues = np.take_along_axis(ordered, lower, axis=1)
+        upperValues = np.take_along_axis(ordered, upper, axis=1)
+        fraction = positions - lower
+        quantiles = np.where(fraction > 0, lowerValues + fraction * (upperValues - lowerValues), lowerValues)
+        described[3:] = np.where(counts[:, None] > 0, quantiles, np.nan).T
+    return described
+
+
+def scottBandwidth(values):
+    # Standard deviation of the Gaussian kernel, as the one of scipy's gaussian_kde that seaborn uses
+    if len(values) < 2:
+        return 0.0
+    return float(np.std(values, ddof=1)) * len(values) ** (-1 / 5)
+
+
+def kdeCurves(orig, anon):
+    # Returns the shared grid and the densities of both value arrays, columns without spread have no curve
+    orig = orig[np.isfinite(orig)]
+    anon = anon[np.isfinite(anon)]
+    bandwidths = [scottBandwidth(orig), scottBandwidth(anon)]
+    supports = [
+        (values.min() - KDE_CUT * bandwidth, values.max() + KDE_CUT * bandwidth)
+        for values, bandwidth in zip((orig, anon), bandwidths)
+        if bandwidth > 0
+    ]
+    if not supports:
+        return np.empty(0), np.empty(0), np.empty(0)
+
+    grid = np.linspace(min(s[0] for s in supports), max(s[1] for s in supports), KDE_GRIDSIZE)
+    densities = [
+        binnedKde(values, grid, bandwidth) if bandwidth > 0 else np.zeros(KDE_GRIDSIZE)
+        for values, bandwidth in zip((orig, anon), bandwidths)
+    ]
+    return grid, densities[0], densities[1]
+
+
+def binnedKde(values, grid, bandwidth):
+    # Gaussian KDE at the grid points, the linearly binned data is convolved with the kernel by FFT
+    bins = np.linspace(grid[0], grid[-1], KDE_BINS)
+    delta = bins[1] - bins[0]
+    position = (values - bins[0]) / delta
+    left = np.clip(np.floor(position).astype(np.intp), 0, KDE_BINS - 2)
+    weight = position - left
+    counts = np.bincount(left, 1 - weight, KDE_BINS) + np.bincount(left + 1, weight, KDE_BINS)
+
+    offsets = np.arange(-(KDE_BINS - 1), KDE_BINS) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    size = 4 * KDE_BINS
+    convolved = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)
+    density = np.maximum(convolved[KDE_BINS - 1 : 2 * KDE_BINS - 1], 0) / len(values)
+    return np.interp(grid, bins, density)
+
+
+def compareCategorical(dataset, synthFrame, categorical, outputDir=OUTPUT_DIR):
+    writeCatInfo(
+        categorical, lambda col: dataset[col].value_counts(), lambda col: synthFrame[col].value_counts(), outputDir
+    )
+
+
+def writeCatInfo(categorical, valueCounts, valueCountsA, outputDir=OUTPUT_DIR):
+    # valueCounts and valueCountsA return the value counts of a column of the original and anonymized data
     jsonDict = []
 
     for col in categorical:
-        if( dataset[col].count() / dataset[col].nunique() > 10):
-            catOrig = dataset[col].value_counts().reset_index()
-            catAnon = synthFrame[col].value_counts().reset_index()
+        counts = valueCounts(col)
+        # Rows per distinct value, categories without rows are not distinct values
+        if counts.sum() / max((counts > 0).sum(), 1) > 10:
+            catOrig = counts.reset_index()
+            catAnon = valueCountsA(col).reset_index()
 
             catOrig.columns = [col, "original"]
             catAnon.columns = [col, "anonymized"]
@@ -86,11 +191,11 @@ def compareCategorical(dataset, synthFrame, categorical):
                 "anonymized": list(combined["anonymized"]),
             }
             jsonDict.append(jsonObj)
-    with open("../output/catInfo.json", "w", encoding="utf-8") as outfile:
+    with open(f"{outputDir}/catInfo.json", "w", encoding="utf-8") as outfile:
         json.dump(jsonDict, outfile)
 
 
-def correlationMap(orig, anon):
+def correlationMap(orig, anon, outputDir=OUTPUT_DIR):
     # Make plot
     sns.set(font_scale=2.0)
     fig, axes = plt.subplots(1, 2, figsize=(24, 12))
@@ -121,24 +226,62 @@ def correlationMap(orig, anon):
         ax=axes[1],
     )
     plt.tight_layout()
-    fig.savefig("../output/corrMap.png")
-    fig.savefig("../output/corrMap.pdf")
+    fig.savefig(f"{outputDir}/corrMap.png")
+    fig.savefig(f"{outputDir}/corrMap.pdf")
     plt.close()
 
 
-def generateVisu(dataset, synthFrame):
+def generateVisu(dataset, synthFrame, outputDir=OUTPUT_DIR, corrMethod="pearson", renderCorr=True):
     continuous = list(dataset.select_dtypes(include=[np.number]))
     categorical = list(dataset.select_dtypes(exclude=[np.number]))
 
-    compareCategorical(dataset, synthFrame, categorical)
-    compareNumericalCols(dataset, synthFrame, continuous)
+    os.makedirs(outputDir, exist_ok=True)
+    compareCategorical(dataset, synthFrame, categorical, outputDir)
+    compareNumericalCols(dataset, synthFrame, continuous, outputDir)
+
+    engine = CorrelationEngine(corrMethod, CORRELATION_ROWS, seed=REPORT_SEED)
+    corrOrig = engine.matrix(dataset, categorical)
+    corrAnon = engine.matrix(synthFrame, categorical)
+
+    writeCorrelation(corrOrig, corrAnon, outputDir, renderCorr)
+
+
+def writeCorrelation(corrOrig, corrAnon, outputDir=OUTPUT_DIR, renderCorr=True):
+    # The matrices are always written, the heatmaps can be rendered later with renderCorrelation
+    save_matrix(corrOrig, outputDir, "corrOrig")
+    save_matrix(corrAnon, outputDir, "corrAnon")
+    if renderCorr:
+        correlationMap(corrOrig, corrAnon, outputDir)
+
+
+def renderCorrelation(outputDir=OUTPUT_DIR):
+    correlationMap(load_matrix(outputDir, "corrOrig"), load_matrix(outputDir, "corrAnon"), outputDir)
+
+
+def generateStreamingVisu(origStats, anonStats, outputDir=OUTPUT_DIR, renderCorr=True):
+    # Writes the files of generateVisu from two report_stats.ReportStatistics instead of the data
+    continuous = origStats.continuous
+    categorical = origStats.categorical
+
+    os.makedirs(outputDir, exist_ok=True)
+    writeCatInfo(categorical, origStats.value_counts, anonStats.value_counts, outputDir)
+    # The KDE curves are computed from uniform samples of the rows
+    writeKdeInfo(((col, origStats.sample(col), anonStats.sample(col)) for col in continuous), outputDir)
+    writeNumInfo(continuous, origStats.describe(), anonStats.describe(), outputDir)
+
+    writeCorrelation(origStats.correlation(), anonStats.correlation(), outputDir, renderCorr)
+
+
+def timedVisu(visuFunction, *args):
+    # Entry point of the report process, returns the seconds spent on the report
+    startTime = time.perf_counter()
+    visuFunction(*args)
+    return time.perf_counter() - startTime
 
-    dataset[categorical] = dataset[categorical].apply(lambda x: pd.factorize(x)[0])
-    synthFrame[categorical] = synthFrame[categorical].apply(
-        lambda x: pd.factorize(x)[0]
-    )
 
-    corrOrig = abs(dataset).corr()
-    corrAnon = abs(synthFrame).corr()
+def sampleRows(df, rows, seed=REPORT_SEED):
+    # The report only compares distributions, which a random sample of rows preserves
+    if rows is None or len(df) <= rows:
+        return df
+    return df.sample(n=rows, random_state=seed)
 
-    correlationMap(corrOrig, corrAnon)
@@ -0,0 +1,120 @@
+"""A module that persists generated fake-value vocabularies on disk
+"""
+import hashlib
+import json
+import os
+import numpy as np
+
+DEFAULT_VOCAB_DIR = "../output/vocab"
+# Total size of the cached vocabularies, the least recently used ones are evicted beyond it
+DEFAULT_VOCAB_BYTES = 2**30
+
+
+class VocabularyCache:
+    """
+    A class to represent a directory of generated fake-value arrays
+
+    The arrays are stored as .npy files with fixed-width dtypes, so they are loaded memory-mapped.
+    The modification time of a file is its last use, which drives the LRU eviction.
+
+    Attributes
+    ----------
+    cache_dir : str
+        Directory that holds the arrays
+    max_bytes : int
+        Maximum total size of the arrays
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_VOCAB_DIR, max_bytes: int = DEFAULT_VOCAB_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def __eq__(self, other):
+        return isinstance(other, VocabularyCache) and (self.cache_dir, self.max_bytes) == (
+            other.cache_dir,
+            other.max_bytes,
+        )
+
+    def __hash__(self):
+        return hash((self.cache_dir, self.max_bytes))
+
+    def key(self, method: str, locales: tuple, seed, count: int):
+        """Method that derives the cache key of a vocabulary
+
+        Args:
+            method (str): Name of the Faker method
+            locales (tuple[str]): The locales
+            seed (int|str): The seed
+            count (int): Number of values
+
+        Returns:
+            str: The cache key
+        """
+        parts = [method, list(locales), repr(seed), count]
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def load(self, key: str):
+        """Method that loads a vocabulary memory-mapped and marks it as recently used
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            np.ndarray: The read-only values, None if they are not cached
+        """
+        path = self.__path(key)
+        try:
+            values = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return values
+
+    def store(self, key: str, values: np.ndarray):
+        """Method that stores a vocabulary and evicts the least recently used ones beyond `max_bytes`
+
+        Only values of a single primitive type can be memory-mapped, object values are not stored.
+
+        Args:
+            key (str): The cache key
+            values (np.ndarray): The values
+
+        Returns:
+            bool: True if the values were stored
+        """
+        values = np.asarray(values.tolist())
+        if values.dtype.kind not in "biufU" or values.nbytes > self.max_bytes:
+            return False
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.__path(key)
+        # Concurrent runs must never read a partially written vocabulary
+        tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, values, allow_pickle=False)
+        os.replace(tmp_path, path)
+        self.__evict()
+        return True
+
+    def __evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npy") or ".tmp" in name:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def __path(self, key: str):
+        return os.path.join(self.cache_dir, f"{key}.npy")
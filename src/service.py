@@ -0,0 +1,164 @@
+"""Module that runs the anonymization pipeline as a long-running service
+
+Jobs are read as JSON lines from stdin, e.g.
+
+    {"id": "job-1", "jdbc": {...}, "anon": {...}, "sens": [...], "cont": [...]}
+
+where the four configs are the same JSON objects that anonymizer.py accepts as arguments.
+Multi-table anonymization configs are run like anonymizer.py runs them and report the summary
+of all tables. With more than one worker the evaluation reports always run in their own process,
+as plotting is not thread-safe.
+A line {"command": "shutdown"} stops the service once all queued jobs are done.
+Every status change of a job is reported as a JSON line on stdout, while the output of the
+pipeline itself is written to stderr, including the output of the JVM and of spawned worker processes.
+The JVM, the imported libraries and the connection pools stay alive between jobs.
+"""
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+
+from anonymizer import anonymize_db, anonymize_tables, infer_table_configs
+from configuration.config_parser import JSONParser
+from modules.metrics import StageTimer
+
+DEFAULT_WORKERS = 1
+DEFAULT_QUEUE_SIZE = 16
+CONFIG_KEYS = ("jdbc", "anon", "sens", "cont")
+
+
+class AnonymizationService:
+    """
+    A class to represent a service that runs anonymization jobs from a bounded queue
+
+    Attributes
+    ----------
+    workers : int
+        Number of jobs that run concurrently
+    queue_size : int
+        Number of jobs that can wait for a worker, reading further jobs blocks until there is space
+    """
+
+    def __init__(self, workers: int, queue_size: int, out_stream=sys.stdout):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.__jobs = queue.Queue(maxsize=queue_size)
+        self.__out = out_stream
+        self.__out_lock = threading.Lock()
+
+    def serve(self, in_stream):
+        """Method that reads jobs until the input ends or a shutdown command arrives
+
+        Args:
+            in_stream (TextIO): Stream of JSON lines
+        """
+        threads = [threading.Thread(target=self.__work, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        for line in in_stream:
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as error:
+                self.__report(None, "rejected", error=str(error))
+                continue
+            if job.get("command") == "shutdown":
+                break
+            missing = [key for key in CONFIG_KEYS if key not in job]
+            if missing:
+                self.__report(job.get("id"), "rejected", error=f"Missing configs: {missing}")
+                continue
+            self.__jobs.put(job)
+            self.__report(job.get("id"), "queued")
+
+        for _ in threads:
+            self.__jobs.put(None)
+        for thread in threads:
+            thread.join()
+
+    def __work(self):
+        while True:
+            job = self.__jobs.get()
+            if job is None:
+                return
+            self.__run(job)
+
+    def __run(self, job: dict):
+        job_id = job.get("id")
+        self.__report(job_id, "running")
+        timer = StageTimer(
+            on_stage=lambda name, seconds: self.__report(job_id, "progress", stage=name, seconds=seconds)
+        )
+        start_time = time.perf_counter()
+        try:
+            config_parser = JSONParser([None] + [json.dumps(job[key]) for key in CONFIG_KEYS])
+            jdbc_handler = config_parser.get_jdbc_config()
+            report_config = config_parser.get_report_config()
+            if self.workers > 1:
+                report_config.background = True
+
+            if config_parser.is_multi_table():
+                table_configs, workers = config_parser.get_table_configs()
+                table_configs = infer_table_configs(
+                    jdbc_handler, table_configs, config_parser.get_table_inference_configs()
+                )
+                summary = anonymize_tables(jdbc_handler, table_configs, workers, report_config)
+                self.__report(job_id, "done", seconds=time.perf_counter() - start_time, tables=summary)
+                return
+
+            configs = infer_table_configs(
+                jdbc_handler,
+                [(config_parser.get_anon_config(), config_parser.get_sens_config(), config_parser.get_cont_config())],
+                [config_parser.get_inference_config()],
+            )[0]
+            timings = anonymize_db(jdbc_handler, *configs, timer, report_config)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            traceback.print_exc()
+            self.__report(
+                job_id, "failed", seconds=time.perf_counter() - start_time, error=repr(error)
+            )
+            return
+        self.__report(job_id, "done", seconds=time.perf_counter() - start_time, timings=timings)
+
+    def __report(self, job_id, status: str, **fields):
+        message = {"id": job_id, "status": status, **fields}
+        with self.__out_lock:
+            self.__out.write(json.dumps(message) + "\n")
+            self.__out.flush()
+
+
+def redirect_stdout():
+    """Function that points stdout to stderr and returns a stream to the original stdout
+
+    The redirection happens on the file descriptor, so the JVM and every process started afterwards, which
+    inherit the descriptors, write to stderr as well. It has to run before the JVM or a pool is started.
+
+    Returns:
+        TextIO: Stream to the original stdout
+    """
+    sys.stdout.flush()
+    # The duplicate is not inheritable, hence only this process can write status messages
+    protocol_stream = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return protocol_stream
+
+
+def main():
+    """Entry method, accepts the optional arguments <workers> <queue_size>"""
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_WORKERS
+    queue_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_QUEUE_SIZE
+
+    # Status messages own stdout, everything the pipeline prints goes to stderr
+    protocol_stream = redirect_stdout()
+
+    AnonymizationService(workers, queue_size, protocol_stream).serve(sys.stdin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import operator
+
+import pytest
+
+pytest.importorskip("snsynth")
+
+from anonymizer import finish_report, submit_report
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_finish_report_logs_failed_reports(capsys, background):
+    report = submit_report(operator.truediv, (1, 0), background)
+    finish_report(report)
+    assert report.done()
+    assert "ZeroDivisionError" in capsys.readouterr().out
@@ -0,0 +1,53 @@
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+
+from modules.bulk_loader import NULL_MARKER, BulkLoader
+
+
+def csv_text(df: pd.DataFrame, chunk_size: int = 2, header: bool = False):
+    chunks = list(BulkLoader(chunk_size).csv_chunks(df, header))
+    return b"".join(data for data, _ in chunks).decode("utf-8"), [rows for _, rows in chunks]
+
+
+def test_csv_chunks_quote_strings_and_mark_nulls():
+    df = pd.DataFrame(
+        {
+            "s": ["x", None, "\\N", 'say "hi", bye'],
+            "f": [1.5, np.nan, 2.0, -0.25],
+            "i": [1, 2, 3, 4],
+            "b": [True, False, True, False],
+        }
+    )
+    text, rows = csv_text(df)
+    assert rows == [2, 2]
+    assert text.splitlines() == [
+        '"x",1.5,1,True',
+        "\\N,\\N,2,False",
+        '"\\N",2.0,3,True',
+        '"say ""hi"", bye",-0.25,4,False',
+    ]
+    # A quoted marker is a string, only the unquoted one is NULL
+    fields = list(csv.reader(io.StringIO(text)))
+    assert fields[2][0] == NULL_MARKER and fields[1][0] == NULL_MARKER
+    assert fields[3][0] == 'say "hi", bye'
+
+
+def test_csv_chunks_write_integral_floats_as_integers():
+    df = pd.DataFrame({"k": [1.0, np.nan, 3.0]})
+    text, _ = csv_text(df, chunk_size=10)
+    assert text.splitlines() == ["1", NULL_MARKER, "3"]
+
+
+def test_csv_chunks_header():
+    df = pd.DataFrame({"a": ["u"], "b": [pd.Timestamp("2020-01-01 12:30:00")]})
+    text, rows = csv_text(df, header=True)
+    assert rows == [1]
+    assert text.splitlines() == ['"a","b"', '"u","2020-01-01 12:30:00"']
+
+
+def test_csv_chunks_of_empty_frame():
+    df = pd.DataFrame({"a": pd.Series([], dtype=object)})
+    assert csv_text(df, header=True) == ('"a"\n', [0])
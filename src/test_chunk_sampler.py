@@ -0,0 +1,35 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from modules.chunk_sampler import ChunkSampler
+
+
+class UniformSynthesizer:
+    def sample(self, rows: int):
+        return pd.DataFrame({"a": np.random.random(rows), "b": [random.random() for _ in range(rows)]})
+
+
+def sampled(workers: int, chunk_rows: int = 4):
+    chunks = list(ChunkSampler(UniformSynthesizer(), chunk_rows, workers, seed=11).chunks(10))
+    return [len(chunk) for chunk in chunks], pd.concat(chunks, ignore_index=True)
+
+
+def test_chunks_do_not_depend_on_workers():
+    sizes, data = sampled(1)
+    assert sizes == [4, 4, 2]
+    parallel_sizes, parallel_data = sampled(2)
+    assert parallel_sizes == sizes
+    pd.testing.assert_frame_equal(parallel_data, data)
+    assert not data.iloc[:4].reset_index(drop=True).equals(data.iloc[4:8].reset_index(drop=True))
+
+
+def test_in_process_chunks_keep_the_global_random_state():
+    np.random.seed(3)
+    random.seed(3)
+    expected = (np.random.random(), random.random())
+    np.random.seed(3)
+    random.seed(3)
+    sampled(1)
+    assert (np.random.random(), random.random()) == expected
@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+import pytest
+
+from modules.config_inference import format_bound, is_integral, type_bounds
+from modules.db_metadata import ColumnMeta
+
+
+def numeric(size, decimal_digits):
+    return ColumnMeta("c", 2, "NUMERIC", True, size, decimal_digits)
+
+
+@pytest.mark.parametrize(
+    "value,integral,expected",
+    [
+        (1e-05, False, "0.00001"),
+        (1e20, False, "100000000000000000000.0"),
+        (-2.5, False, "-2.5"),
+        (3, False, "3.0"),
+        (Decimal("-999.99"), False, "-999.99"),
+        (7.0, True, "7"),
+        (Decimal("99999"), True, "99999"),
+    ],
+)
+def test_format_bound(value, integral, expected):
+    text = format_bound(value, integral)
+    assert text == expected
+    # The preprocessor parses bounds with a decimal point as floats and the others as integers
+    assert (float(text) if "." in text else int(text)) == float(value)
+
+
+def test_is_integral():
+    assert is_integral(ColumnMeta("c", 4, "INTEGER"))
+    assert is_integral(numeric(10, 0))
+    assert not is_integral(numeric(10, 2))
+    assert not is_integral(numeric(None, None))
+    assert not is_integral(ColumnMeta("c", 8, "DOUBLE"))
+
+
+def test_type_bounds():
+    assert type_bounds(ColumnMeta("c", 5, "SMALLINT")) == (-(2**15), 2**15 - 1)
+    assert type_bounds(numeric(5, 2)) == (Decimal("-999.99"), Decimal("999.99"))
+    assert type_bounds(numeric(6, 0)) == (-999999, 999999)
+    assert [format_bound(bound, False) for bound in type_bounds(numeric(5, 2))] == ["-999.99", "999.99"]
+    # Unknown scales and the precision of NUMERIC without precision give no bounds
+    assert type_bounds(numeric(10, None)) is None
+    assert type_bounds(numeric(131089, 0)) is None
+    assert type_bounds(ColumnMeta("c", 8, "DOUBLE")) is None
@@ -0,0 +1,170 @@
+import json
+
+import pytest
+
+from configuration.config_parser import JSONParser
+from modules.model_cache import DEFAULT_CACHE_DIR
+from modules.vocab_cache import DEFAULT_VOCAB_DIR
+
+JDBC_CONFIG = {
+    "driver": "org.postgresql.Driver",
+    "url": "jdbc:postgresql://localhost:5432/db",
+    "username": "user",
+    "password": "secret",
+    "jarPath": "postgresql.jar",
+    "fetchSize": 500,
+    "partitions": 4,
+    "writer": "bulk",
+}
+
+ANON_CONFIG = {
+    "table": "item",
+    "eps": "1.0",
+    "preEps": "0.5",
+    "alg": "aim",
+    "hide": ["i_id"],
+    "cat": ["i_name"],
+    "cont": ["i_price"],
+    "ord": [],
+}
+
+SENS_CONFIG = [{"name": "i_name", "method": "name", "mode": "keyed", "locales": ["en_US"], "seed": "0"}]
+
+CONT_CONFIG = [{"name": "i_price", "bins": "10", "lower": "1.0", "upper": "100.0"}]
+
+
+def parser(anon_config, sens_config=None, cont_config=None):
+    sens_config = SENS_CONFIG if sens_config is None else sens_config
+    cont_config = CONT_CONFIG if cont_config is None else cont_config
+    return JSONParser(
+        ["service", json.dumps(JDBC_CONFIG), json.dumps(anon_config), json.dumps(sens_config), json.dumps(cont_config)]
+    )
+
+
+def test_single_table_config():
+    config_parser = parser(ANON_CONFIG)
+    assert not config_parser.is_multi_table()
+
+    anon_config = config_parser.get_anon_config()
+    assert anon_config.table_name == "item"
+    assert anon_config.column_classification.continuous == ["i_price"]
+
+    sens_config = config_parser.get_sens_config()
+    assert [entry.mode for entry in sens_config.columns] == ["keyed"]
+
+    cont_config = config_parser.get_cont_config()
+    assert [(entry.name, entry.bins, entry.lower) for entry in cont_config.columns] == [("i_price", "10", "1.0")]
+    assert config_parser.get_inference_config() is None
+
+
+def test_transfer_config():
+    transfer_config = parser(ANON_CONFIG).get_transfer_config(JDBC_CONFIG)
+    assert transfer_config.fetch_size == 500
+    assert transfer_config.partitions == 4
+    assert transfer_config.writer == "bulk"
+    assert transfer_config.batch_size == 10000
+
+
+def test_inference_config():
+    infer = {"table": "item", "eps": "1.0", "preEps": "0.5", "alg": "aim", "infer": {"bins": 8, "bounds": "type"}}
+    config_parser = parser(infer)
+    inference_config = config_parser.get_inference_config()
+    assert inference_config.bins == 8
+    assert inference_config.bounds == "type"
+    assert inference_config.max_categories == 64
+
+    anon_config = config_parser.get_anon_config()
+    assert anon_config.column_classification.hidden == []
+    assert parser({**infer, "infer": True}).get_inference_config().bins == 16
+
+
+def test_multi_table_config():
+    tables = {
+        "workers": 2,
+        "infer": True,
+        "tables": [
+            ANON_CONFIG,
+            {
+                **ANON_CONFIG,
+                "table": "stock",
+                "cont": ["s_quantity"],
+                "contConfig": [{"name": "s_quantity", "bins": "5", "lower": "0", "upper": "100"}],
+                "sens": [],
+                "infer": {"bins": 4},
+            },
+        ],
+    }
+    config_parser = parser(tables)
+    assert config_parser.is_multi_table()
+
+    table_configs, workers = config_parser.get_table_configs()
+    assert workers == 2
+    (item_anon, item_sens, item_cont), (stock_anon, stock_sens, stock_cont) = table_configs
+    assert item_anon.table_name == "item"
+    assert [entry.name for entry in item_sens.columns] == ["i_name"]
+    assert [entry.name for entry in item_cont.columns] == ["i_price"]
+    assert stock_anon.table_name == "stock"
+    assert stock_anon.column_classification.continuous == ["s_quantity"]
+    assert stock_sens.columns == []
+    assert [(entry.name, entry.bins) for entry in stock_cont.columns] == [("s_quantity", "5")]
+
+    inference_configs = config_parser.get_table_inference_configs()
+    assert [inference_config.bins for inference_config in inference_configs] == [16, 4]
+
+
+def test_multi_table_list():
+    config_parser = parser([ANON_CONFIG, {**ANON_CONFIG, "table": "stock"}])
+    assert config_parser.is_multi_table()
+    table_configs, workers = config_parser.get_table_configs()
+    assert workers is None
+    assert [anon_config.table_name for anon_config, _, _ in table_configs] == ["item", "stock"]
+    assert config_parser.get_table_inference_configs() == [None, None]
+
+
+def test_model_cache():
+    assert parser({**ANON_CONFIG, "modelCache": "models"}).get_anon_config().cache_dir == "models"
+    assert parser({**ANON_CONFIG, "modelCache": True}).get_anon_config().cache_dir == DEFAULT_CACHE_DIR
+    assert parser(ANON_CONFIG).get_anon_config().cache_dir is None
+
+
+def test_sampling():
+    assert parser(ANON_CONFIG).get_anon_config().sampling is None
+    sampling = parser({**ANON_CONFIG, "scaleFactor": 2.0, "sampleWorkers": 4}).get_anon_config().sampling
+    assert sampling.target_rows(100) == 200
+    assert sampling.workers == 4
+    assert sampling.chunk_rows == 100000
+    assert parser({**ANON_CONFIG, "sampleRows": 7, "scaleFactor": 2.0}).get_anon_config().sampling.target_rows(100) == 7
+
+
+def test_vocab_cache():
+    assert parser(ANON_CONFIG).get_sens_config().vocab_dir is None
+    sens_config = parser(ANON_CONFIG, {"columns": SENS_CONFIG, "vocabCache": True}).get_sens_config()
+    assert sens_config.vocab_dir == DEFAULT_VOCAB_DIR
+    assert [entry.name for entry in sens_config.columns] == ["i_name"]
+
+
+def test_sens_workers():
+    assert parser(ANON_CONFIG).get_sens_config().workers == 1
+    assert parser(ANON_CONFIG, {"columns": SENS_CONFIG, "workers": 3}).get_sens_config().workers == 3
+
+
+@pytest.mark.parametrize(
+    "report,enabled,background,sample_rows",
+    [(None, True, True, None), (False, False, True, None), ({"background": False, "sampleRows": 10}, True, False, 10)],
+)
+def test_report_config(report, enabled, background, sample_rows):
+    anon_config = ANON_CONFIG if report is None else {**ANON_CONFIG, "report": report}
+    report_config = parser(anon_config).get_report_config()
+    assert report_config.enabled == enabled
+    assert report_config.background == background
+    assert report_config.sample_rows == sample_rows
+
+
+def test_report_correlation():
+    report_config = parser(ANON_CONFIG).get_report_config()
+    assert report_config.correlation == "pearson" and report_config.render_correlation
+    report = {"streaming": True, "correlation": "association", "renderCorrelation": False}
+    report_config = parser({**ANON_CONFIG, "report": report}).get_report_config()
+    assert report_config.streaming
+    assert report_config.correlation == "association"
+    assert not report_config.render_correlation
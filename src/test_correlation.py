@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.correlation import (
+    CorrelationEngine,
+    blocked_pearson,
+    correlation_ratios,
+    cramers_v,
+    load_matrix,
+    save_matrix,
+)
+
+
+def frame(rows: int = 2000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=rows)
+    dataset = pd.DataFrame(
+        {
+            "x": x,
+            "y": 2 * x + rng.normal(size=rows),
+            "n": rng.integers(0, 10, rows).astype(float),
+            "c": rng.choice(["a", "b", "c"], rows),
+            "d": np.where(x > 0, "pos", "neg"),
+        }
+    )
+    dataset.loc[rng.random(rows) < 0.1, "y"] = np.nan
+    dataset.loc[rng.random(rows) < 0.1, "c"] = None
+    return dataset
+
+
+def factorized(dataset: pd.DataFrame, categorical: list):
+    columns = {}
+    for col in dataset.columns:
+        columns[col] = pd.factorize(dataset[col])[0] if col in categorical else dataset[col]
+    return pd.DataFrame(columns).abs()
+
+
+@pytest.mark.parametrize("block_columns", [1, 2, 256])
+def test_blocked_pearson_matches_pandas(block_columns):
+    dataset = frame().drop(columns=["c", "d"])
+    expected = dataset.corr().to_numpy()
+    actual = blocked_pearson(dataset.to_numpy(), block_columns)
+    assert np.allclose(actual, expected, atol=1e-5)
+
+
+def test_pearson_matrix_matches_pandas():
+    dataset = frame()
+    categorical = ["c", "d"]
+    expected = factorized(dataset, categorical).corr()
+    actual = CorrelationEngine("pearson").matrix(dataset, categorical)
+    assert list(actual.columns) == list(dataset.columns)
+    assert np.allclose(actual.to_numpy(), expected.to_numpy(), atol=1e-5)
+
+
+def test_cramers_v_matches_contingency_table():
+    dataset = frame().dropna()
+    codes_c, uniques_c = pd.factorize(dataset["c"])
+    codes_d, uniques_d = pd.factorize(dataset["d"])
+    table = pd.crosstab(codes_c, codes_d).to_numpy().astype(float)
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / table.sum()
+    chi_squared = ((table - expected) ** 2 / expected).sum()
+    reference = np.sqrt(chi_squared / table.sum() / (min(table.shape) - 1))
+    assert cramers_v(codes_c, len(uniques_c), codes_d, len(uniques_d)) == pytest.approx(reference)
+    assert cramers_v(codes_d, len(uniques_d), codes_d, len(uniques_d)) == pytest.approx(1.0)
+
+
+def test_correlation_ratios_match_group_variance():
+    dataset = frame()
+    codes = pd.factorize(dataset["d"])[0]
+    ratios = correlation_ratios(codes, dataset[["x", "n"]].to_numpy())
+    for ratio, col in zip(ratios, ["x", "n"]):
+        values = dataset[col]
+        between = values.groupby(codes).apply(lambda group: len(group) * (group.mean() - values.mean()) ** 2).sum()
+        total = ((values - values.mean()) ** 2).sum()
+        assert ratio == pytest.approx(np.sqrt(between / total))
+
+
+def test_association_matrix_is_symmetric():
+    dataset = frame()
+    matrix = CorrelationEngine("association").matrix(dataset, ["c", "d"])
+    assert np.allclose(matrix.to_numpy(), matrix.to_numpy().T, equal_nan=True)
+    assert np.allclose(matrix.loc[["x", "y", "n"], ["x", "y", "n"]], dataset[["x", "y", "n"]].corr().abs(), atol=1e-5)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        CorrelationEngine("spearman")
+
+
+def test_matrix_round_trip(tmp_path):
+    matrix = CorrelationEngine("pearson").matrix(frame(), ["c", "d"])
+    save_matrix(matrix, str(tmp_path), "corr")
+    loaded = load_matrix(str(tmp_path), "corr")
+    assert list(loaded.columns) == list(matrix.columns)
+    assert np.allclose(loaded.to_numpy(), matrix.to_numpy(), equal_nan=True)
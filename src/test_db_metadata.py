@@ -0,0 +1,13 @@
+from modules.db_metadata import _row_estimate
+
+
+class BrokenMeta:
+    def getIndexInfo(self, *args):
+        raise RuntimeError("no statistics")
+
+
+def test_row_estimate_reports_failures_on_stderr(capsys):
+    assert _row_estimate(None, BrokenMeta(), "unknown", None, "t") is None
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert "No row estimate for t: no statistics" in err
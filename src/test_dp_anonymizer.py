@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("snsynth")
+
+from configuration.configurations import DPColumnConfig, DPConfig, SamplingConfig
+from modules.dp_anonymizer import DifferentialPrivacyAnonymizer, continued_values
+
+
+def test_continued_values_keep_keys_unique():
+    positions = np.arange(7)
+    assert continued_values(pd.Series([5, 2, 9]), positions).tolist() == [5, 2, 9, 10, 11, 12, 13]
+    assert continued_values(pd.Series(["a", "b", "c"]), positions).tolist() == [
+        "a", "b", "c", "a_1", "b_1", "c_1", "a_2",
+    ]
+    dates = pd.Series(pd.date_range("2020-01-01", periods=3))
+    assert continued_values(dates, positions)[3] == dates.to_numpy()[0]
+
+
+def test_scaled_anonymization_generates_fresh_keys():
+    dataset = pd.DataFrame({"id": [10, 20, 30, 40], "value": [1.0, 2.0, 3.0, 4.0]})
+    config = DPConfig(
+        "t", "0", "0", "mwem", DPColumnConfig(["id"], [], ["value"], []),
+        sampling=SamplingConfig(scale_factor=2.5, chunk_rows=3),
+    )
+    chunks = list(DifferentialPrivacyAnonymizer(dataset, config, None).iter_anonymization())
+    data = pd.concat(chunks, ignore_index=True)
+    assert list(data.columns) == ["id", "value"]
+    assert data["id"].tolist() == [10, 20, 30, 40, 41, 42, 43, 44, 45, 46]
+    assert data["id"].is_unique
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from configuration.configurations import DPColumnConfig
+from modules.dtype_planner import DtypePlanner, column_memory, frame_memory
+
+
+def frame():
+    return pd.DataFrame(
+        {
+            "id": np.arange(1000, dtype=np.int64),
+            "small": np.arange(1000, dtype=np.int64) % 100,
+            "wide": np.arange(1000, dtype=np.int64) * 10**7,
+            "price": np.arange(1000) / 4,
+            "precise": np.arange(1000) / 3,
+            "city": np.where(np.arange(1000) % 2 == 0, "Berlin", "Paris").astype(object),
+            "note": np.full(1000, "text", dtype=object),
+            "flag": np.arange(1000) % 2 == 0,
+            "created": pd.date_range("2020-01-01", periods=1000, freq="h"),
+            "other": np.arange(1000, dtype=np.int64),
+        }
+    )
+
+
+def planner():
+    return DtypePlanner(DPColumnConfig(["id"], ["city", "flag"], ["wide", "price", "precise", "created"], ["small"]))
+
+
+def test_plan_picks_compact_dtypes():
+    dataset = frame()
+    dtypes = planner().plan(dataset, [dataset.columns.get_loc("created")])
+    assert dtypes == {
+        "small": np.dtype(np.int8),
+        "price": np.dtype(np.float32),
+        "city": "category",
+    }
+
+
+def test_plan_keeps_lossy_and_unclassified_columns():
+    dataset = frame()
+    dataset["small"] = dataset["small"] + 2**31
+    dataset["price"] = dataset["price"] + 1e-9
+    dtypes = planner().plan(dataset, [dataset.columns.get_loc("created")])
+    assert dtypes == {"city": "category"}
+
+
+def test_plan_keeps_special_floats():
+    dataset = pd.DataFrame({"price": [np.nan, np.inf, -np.inf, 1.5]})
+    assert DtypePlanner(DPColumnConfig([], [], ["price"], [])).plan(dataset, []) == {"price": np.dtype(np.float32)}
+
+
+def test_apply_keeps_values_and_shares_unchanged_columns():
+    dataset = frame()
+    planned = planner().apply(dataset, [dataset.columns.get_loc("created")])
+    assert list(planned.columns) == list(dataset.columns)
+    assert planned["small"].dtype == np.int8
+    assert isinstance(planned["city"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(planned, dataset, check_dtype=False, check_categorical=False)
+    assert np.shares_memory(planned["wide"].to_numpy(), dataset["wide"].to_numpy())
+    assert frame_memory(planned) < frame_memory(dataset)
+
+
+def test_frame_memory():
+    dataset = frame()
+    assert frame_memory(dataset) == dataset.memory_usage(index=True).sum()
+    assert frame_memory(dataset, deep=True) > frame_memory(dataset)
+
+
+def test_apply_reports_deep_sizes_of_changed_columns(capsys):
+    dataset = frame()
+    changed = [dataset.columns.get_loc(col) for col in ("small", "price", "city")]
+    planned = planner().apply(dataset, [dataset.columns.get_loc("created")])
+    before, after = column_memory(dataset, changed), column_memory(planned, changed)
+    assert before == dataset.iloc[:, changed].memory_usage(index=False, deep=True).sum()
+    assert after < before / 4
+    assert f"{before / 2**20:0.1f} MiB -> {after / 2**20:0.1f} MiB" in capsys.readouterr().out
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.fake_values import (
+    ALPHABET,
+    KEYED_INTEGER_RANGES,
+    POOL_SIZE,
+    draw_fake_values,
+    fake_pool,
+    keyed_fake_values,
+    keyed_integers,
+    keyed_slots,
+    keyed_strings,
+    random_strings,
+    unique_fake_values,
+    unique_random_strings,
+)
+
+LETTERS = set(ALPHABET.tobytes().decode("ascii"))
+
+
+def test_fake_pool_is_seeded():
+    pool = fake_pool("random_letter", ("en_US",), 1, 50)
+    assert len(pool) == 50
+    assert list(fake_pool.__wrapped__("random_letter", ("en_US",), 1, 50)) == list(pool)
+    assert not pool.flags.writeable
+
+
+def test_draw_fake_values_takes_the_pool_up_to_its_size():
+    rng = np.random.default_rng(1)
+    values = draw_fake_values("random_letter", ("en_US",), 1, 50, rng)
+    assert list(values) == list(fake_pool("random_letter", ("en_US",), 1, 50))
+    assert values.flags.writeable
+
+
+def test_draw_fake_values_samples_beyond_the_pool():
+    values = draw_fake_values("random_letter", ("en_US",), 2, POOL_SIZE + 10, np.random.default_rng(1))
+    assert len(values) == POOL_SIZE + 10
+    assert set(values) <= set(fake_pool("random_letter", ("en_US",), 2, POOL_SIZE))
+
+
+def test_random_strings_lengths_and_letters():
+    values = random_strings(np.random.default_rng(1), 1000, 2, 5)
+    assert all(2 <= len(value) <= 5 for value in values)
+    assert {len(value) for value in values} == {2, 3, 4, 5}
+    assert set("".join(values)) <= LETTERS
+    assert list(random_strings(np.random.default_rng(1), 3, 0, 0)) == ["", "", ""]
+
+
+def test_unique_fake_values_appends_suffixes():
+    values = unique_fake_values("random_letter", ("en_US",), 1, 500, np.random.default_rng(1))
+    assert len(values) == 500
+    assert len(set(values)) == 500
+
+
+@pytest.mark.parametrize(
+    "count,min_chars,max_chars",
+    [
+        (52 + 52**2, 1, 2),
+        (1000, 1, 2),
+        (100000, 3, 8),
+        (1000, 20, 20),
+    ],
+)
+def test_unique_random_strings_are_distinct(count, min_chars, max_chars):
+    values = unique_random_strings(np.random.default_rng(1), count, min_chars, max_chars)
+    assert len(values) == count
+    assert len(set(values)) == count
+    assert all(min_chars <= len(value) <= max_chars for value in values)
+    assert set("".join(values)) <= LETTERS
+
+
+def test_unique_random_strings_capacity():
+    with pytest.raises(ValueError):
+        unique_random_strings(np.random.default_rng(1), 53, 1, 1)
+
+
+def test_keyed_integers_permute_every_range():
+    low = 0
+    for high in KEYED_INTEGER_RANGES[:2]:
+        values = np.arange(low, high)
+        assert np.array_equal(np.sort(keyed_integers(values, "seed")), values)
+        assert np.array_equal(np.sort(keyed_integers(-1 - values, "seed")), np.sort(-1 - values))
+        low = high
+
+
+# Lower bounds of the ranges, the upper bound of the last one does not fit into an int64
+BOUNDS = np.array([0, *KEYED_INTEGER_RANGES[:-1]], dtype=np.int64)
+
+
+def integer_range(values: np.ndarray):
+    magnitudes = np.where(values < 0, -1 - values, values)
+    return values < 0, np.searchsorted(BOUNDS, magnitudes, side="right")
+
+
+def test_keyed_integers_keep_the_range_and_are_stable():
+    values = np.concatenate([BOUNDS, BOUNDS - 1, BOUNDS + 1, -BOUNDS - 2, [2**63 - 1, -(2**63)]])
+    pseudonyms = keyed_integers(values, "seed")
+    for expected, actual in zip(integer_range(values), integer_range(pseudonyms)):
+        assert np.array_equal(expected, actual)
+    assert np.array_equal(keyed_integers(values[::-1], "seed"), pseudonyms[::-1])
+    assert not np.array_equal(keyed_integers(values, "other"), pseudonyms)
+
+    values = np.random.default_rng(1).integers(2**31, 2**53, 100000)
+    assert len(np.unique(keyed_integers(values, "seed"))) == len(np.unique(values))
+
+
+def test_keyed_slots_depend_on_the_distinct_values_only():
+    values = np.arange(1000).astype(str).astype(object)
+    codes, slots = keyed_slots(values, "seed")
+    assert np.array_equal(np.sort(slots), np.arange(1000))
+    shuffled = np.random.default_rng(1).permutation(np.concatenate([values, values[:10]]))
+    shuffled_codes, shuffled_slots = keyed_slots(shuffled, "seed")
+    assert dict(zip(shuffled, shuffled_slots[shuffled_codes])) == dict(zip(values, slots[codes]))
+
+
+def test_keyed_strings_are_distinct_and_keep_the_width():
+    keys = np.arange(100000).astype(str).astype(object)
+    values = keyed_strings(keys, "seed", 1, 5)
+    assert len(set(values)) == len(keys)
+    assert all(1 <= len(value) <= 5 for value in values)
+    assert list(keyed_strings(keys[::-1], "seed", 1, 5)) == list(values[::-1])
+    assert list(keyed_strings(keys, "other", 1, 5)) != list(values)
+
+
+def test_keyed_fake_values_are_distinct_and_keep_the_width():
+    keys = np.arange(400).astype(str).astype(object)
+    values = keyed_fake_values("first_name", ("en_US",), 3, keys, 8)
+    assert len(set(values)) == len(keys)
+    assert all(len(value) <= 8 for value in values)
+    assert list(keyed_fake_values("first_name", ("en_US",), 3, keys[::-1], 8)) == list(values[::-1])
+    with pytest.raises(ValueError):
+        keyed_fake_values("random_letter", ("en_US",), 3, keys[:100], 8)
+
+
+def test_keyed_mode_requires_seed():
+    with pytest.raises(ValueError):
+        keyed_strings(np.array(["a"], dtype=object), None, 1, 1)
+    with pytest.raises(ValueError):
+        keyed_integers(np.array([1]), None)
@@ -0,0 +1,61 @@
+import jaydebeapi
+import numpy as np
+import pandas as pd
+
+from modules.jdbc_columnar import column_parameters, column_readers, parameter_rows, read_chunk, timestamp_parts
+
+
+def description(*types):
+    return [(f"c{i}", dbapi_type, None, None, None, None, 1) for i, dbapi_type in enumerate(types)]
+
+
+def test_read_chunk_types_columns():
+    readers = column_readers(
+        description(
+            jaydebeapi.NUMBER, jaydebeapi.NUMBER, jaydebeapi.DECIMAL, jaydebeapi.FLOAT,
+            jaydebeapi.NUMBER, jaydebeapi.STRING, jaydebeapi.DATETIME,
+        )
+    )
+    rows = [
+        (1, 5, 2, 1.5, True, "a", "2020-01-01 00:00:00"),
+        (2, None, 3, None, False, None, None),
+    ]
+    ids, sparse, whole, real, flag, text, stamp = read_chunk(rows, readers)
+    assert ids.dtype == np.int64 and ids.tolist() == [1, 2]
+    assert sparse.dtype == np.float64 and np.isnan(sparse[1])
+    assert whole.dtype == np.int64
+    assert real.dtype == np.float64 and np.isnan(real[1])
+    assert flag.dtype == np.bool_ and flag.tolist() == [True, False]
+    assert text.tolist() == ["a", None]
+    assert stamp.tolist() == ["2020-01-01 00:00:00", None]
+
+
+def test_read_chunk_of_no_rows():
+    chunk = read_chunk([], column_readers(description(jaydebeapi.NUMBER, jaydebeapi.STRING)))
+    assert [len(column) for column in chunk] == [0, 0]
+
+
+def test_read_chunk_keeps_integers_beyond_int64():
+    (column,) = read_chunk([(2**64,), (1,)], column_readers(description(jaydebeapi.DECIMAL)))
+    assert column.tolist() == [2**64, 1]
+
+
+def test_parameter_rows_of_multi_row_inserts():
+    df = pd.DataFrame({"i": [1, 2, 3], "f": [0.5, np.nan, 1.5], "s": ["x", None, "z"]})
+    parameters = column_parameters(df, [])
+    assert parameter_rows(parameters, 0, 3, 1) == [(1, 0.5, "x"), (2, None, None), (3, 1.5, "z")]
+    assert parameter_rows(parameters, 0, 2, 2) == [(1, 0.5, "x", 2, None, None)]
+
+
+def test_timestamp_parts_of_fetched_strings():
+    millis, nanos, mask = timestamp_parts(pd.Series(["2020-01-01 00:00:01.5", None, "2020-01-02"]), "UTC")
+    assert mask.tolist() == [False, True, False]
+    assert millis[[0, 2]].tolist() == [1577836801500, 1577923200000]
+    assert nanos[0] == 500000000
+
+
+def test_timestamp_parts_of_times_and_time_zones():
+    millis, _, _ = timestamp_parts(pd.Series(["12:30:00", None]), "UTC")
+    assert millis[0] == (12 * 60 + 30) * 60 * 1000
+    millis, _, _ = timestamp_parts(pd.Series(pd.to_datetime(["2020-07-01 02:00:00"])), "Europe/Berlin")
+    assert millis[0] == 1593561600000
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.correlation import CorrelationEngine
+from modules.report_stats import CategoryCounter, CoMoments, Moments, QuantileSketch, ReportStatistics
+
+
+def frame(rows: int = 3000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=rows)
+    dataset = pd.DataFrame(
+        {
+            "x": x,
+            "y": (3 * x + rng.normal(size=rows)).round(2),
+            "c": rng.choice(["a", "b", "c", "d"], rows),
+            "i": rng.integers(0, 100, rows),
+        }
+    )
+    dataset.loc[rng.random(rows) < 0.1, "y"] = np.nan
+    dataset.loc[rng.random(rows) < 0.1, "c"] = None
+    return dataset
+
+
+def chunked(dataset: pd.DataFrame, rows: int):
+    statistics = ReportStatistics()
+    for start in range(0, len(dataset), rows):
+        statistics.update(dataset.iloc[start : start + rows])
+    return statistics
+
+
+def test_moments_match_pandas():
+    values = frame()[["x", "y"]].to_numpy()
+    moments = Moments(2)
+    for start in range(0, len(values), 700):
+        moments.update(values[start : start + 700])
+    described = pd.DataFrame(values).describe()
+    assert np.allclose(moments.count, described.loc["count"])
+    assert np.allclose(moments.mean, described.loc["mean"])
+    assert np.allclose(moments.std(), described.loc["std"])
+    assert np.allclose(moments.minimum, described.loc["min"])
+    assert np.allclose(moments.maximum, described.loc["max"])
+
+
+def test_quantile_sketch_is_exact_for_few_values():
+    values = frame()["x"].to_numpy()[:1000]
+    sketch = QuantileSketch()
+    sketch.update(values[:400])
+    sketch.update(values[400:])
+    assert np.allclose(sketch.quantiles([0.25, 0.5, 0.75]), np.quantile(values, [0.25, 0.5, 0.75]))
+
+
+def test_quantile_sketch_rank_error():
+    values = np.random.default_rng(1).normal(size=200000)
+    sketch = QuantileSketch()
+    for start in range(0, len(values), 10000):
+        sketch.update(values[start : start + 10000])
+    ranks = np.searchsorted(np.sort(values), sketch.quantiles([0.1, 0.5, 0.9])) / len(values)
+    assert np.allclose(ranks, [0.1, 0.5, 0.9], atol=0.01)
+
+
+def test_category_counter_matches_factorize():
+    column = frame()["c"]
+    counter = CategoryCounter()
+    codes = np.concatenate([counter.update(column.iloc[:1000]), counter.update(column.iloc[1000:])])
+    assert np.array_equal(codes, pd.factorize(column)[0])
+    assert counter.value_counts().to_dict() == column.value_counts().to_dict()
+
+
+def test_category_counter_merges_by_label():
+    column = frame()["c"]
+    first, second = CategoryCounter(), CategoryCounter()
+    first.update(column.iloc[:1000])
+    second.update(column.iloc[1000:].sort_values(ascending=False))
+    remap = first.merge(second)
+    assert [list(first.codes)[code] for code in remap] == list(second.codes)
+    assert first.value_counts().to_dict() == column.value_counts().to_dict()
+
+
+def test_comoments_merge_matches_pandas():
+    dataset = frame()[["x", "y", "i"]]
+    values = dataset.to_numpy(dtype=np.float64)
+    first, second = CoMoments(3), CoMoments(3)
+    first.update(values[:1000])
+    second.update(values[1000:] + 50)
+    second.merge(first)
+    shifted = np.vstack([values[1000:] + 50, values[:1000]])
+    assert np.allclose(second.correlation(), pd.DataFrame(shifted).corr().to_numpy())
+
+
+@pytest.mark.parametrize("rows", [100, 1000, 5000])
+def test_statistics_match_pandas(rows):
+    dataset = frame()
+    statistics = chunked(dataset, rows)
+    assert statistics.continuous == ["x", "y", "i"]
+    assert statistics.categorical == ["c"]
+
+    described = dataset[statistics.continuous].describe().to_numpy()
+    exact = [0, 1, 2, 3, 7]
+    assert np.allclose(statistics.describe()[exact], described[exact])
+    # The table has more rows than a sketch level, hence the quartiles are estimates
+    for i, col in enumerate(statistics.continuous):
+        values = np.sort(dataset[col].dropna().to_numpy())
+        ranks = np.searchsorted(values, statistics.describe()[4:7, i]) / len(values)
+        assert np.allclose(ranks, [0.25, 0.5, 0.75], atol=0.02)
+    assert statistics.value_counts("c").to_dict() == dataset["c"].value_counts().to_dict()
+    expected = CorrelationEngine("pearson").matrix(dataset, ["c"])
+    assert np.allclose(statistics.correlation().to_numpy(), expected.to_numpy(), atol=1e-5)
+    assert np.array_equal(np.sort(statistics.sample("i")), np.sort(dataset["i"].to_numpy(dtype=float)))
+
+
+def test_merge_matches_sequential_update():
+    dataset = frame()
+    # The second half starts with the values in the order the first half saw them, so the codes agree
+    order = pd.unique(dataset["c"].iloc[:1500].dropna())
+    rows = [dataset.index[dataset["c"] == value][0] for value in order]
+    second = pd.concat([dataset.loc[rows], dataset.iloc[1500:]])
+    whole = pd.concat([dataset.iloc[:1500], second])
+
+    merged = chunked(dataset.iloc[:1500], 500)
+    merged.merge(chunked(second, 500))
+    expected = chunked(whole, 500)
+    assert np.allclose(merged.describe()[[0, 1, 2, 3, 7]], expected.describe()[[0, 1, 2, 3, 7]])
+    assert merged.value_counts("c").to_dict() == expected.value_counts("c").to_dict()
+    assert np.allclose(merged.correlation().to_numpy(), expected.correlation().to_numpy())
+
+
+def test_merge_of_differently_coded_categories():
+    dataset = frame()
+    first = chunked(dataset.iloc[:1500], 500)
+    other = dataset.iloc[1500:].sort_values("c", ascending=False)
+    first.merge(chunked(other, 500))
+
+    # The counts are matched by label, the correlations of the re-coded column are unknown
+    assert first.value_counts("c").to_dict() == dataset["c"].value_counts().to_dict()
+    correlation = first.correlation()
+    assert correlation["c"].isna().all()
+    expected = pd.concat([dataset.iloc[:1500], other])[["x", "y", "i"]].abs().corr()
+    assert np.allclose(correlation.loc[["x", "y", "i"], ["x", "y", "i"]], expected)
+
+
+def test_merge_into_empty_statistics():
+    dataset = frame()
+    merged = ReportStatistics()
+    merged.merge(chunked(dataset, 1000))
+    merged.merge(ReportStatistics())
+    assert np.allclose(merged.describe(), chunked(dataset, 1000).describe())
+
+
+def test_observe_stops_after_error():
+    dataset = frame()
+    statistics = ReportStatistics()
+    statistics.observe(dataset.iloc[:100])
+    statistics.observe(dataset.iloc[100:200].drop(columns=["x"]))
+    assert statistics.failed
+    statistics.observe(dataset.iloc[200:])
+    assert statistics.describe()[0, 0] == 100
+
+    merged = ReportStatistics()
+    merged.merge(statistics)
+    assert merged.failed
@@ -0,0 +1,54 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from configuration.configurations import SensitiveConfig, SensitiveEntry
+from modules.bulk_loader import NULL_MARKER, BulkLoader
+from modules.sensitive_anonymizer import SensitiveAnonymizer
+
+
+def keyed(column: str, method: str = "first_name"):
+    return SensitiveConfig([SensitiveEntry(column, method, "keyed", ["en_US"], "seed")])
+
+
+def write_back(df: pd.DataFrame):
+    data = b"".join(data for data, _ in BulkLoader(1000).csv_chunks(df, True))
+    return pd.read_csv(io.BytesIO(data), na_values=[NULL_MARKER], keep_default_na=False)
+
+
+def test_keyed_integer_keys_keep_the_join():
+    rng = np.random.default_rng(1)
+    orders = pd.DataFrame({"o_id": rng.permutation(np.arange(1, 5001)), "o_total": rng.random(5000)})
+    lines = pd.DataFrame({"l_order": rng.integers(1, 5001, 20000).astype(np.float64)})
+    # Lines without order make the foreign key a float column
+    lines.loc[rng.random(20000) < 0.1, "l_order"] = np.nan
+    joined = lines.merge(orders, left_on="l_order", right_on="o_id", how="left")
+
+    orders_anon = write_back(SensitiveAnonymizer(orders, keyed("o_id")).run_anonymization())
+    lines_anon = write_back(SensitiveAnonymizer(lines, keyed("l_order")).run_anonymization())
+    assert orders_anon["o_id"].dtype == np.int64
+    assert orders_anon["o_id"].is_unique and orders_anon["o_id"].max() < 2**15
+    assert not orders_anon["o_id"].isin(orders["o_id"]).all()
+    assert lines_anon["l_order"].isna().equals(lines["l_order"].isna())
+
+    joined_anon = lines_anon.merge(orders_anon, left_on="l_order", right_on="o_id", how="left")
+    assert joined_anon["o_id"].isna().equals(joined["o_id"].isna())
+    assert np.allclose(joined_anon["o_total"].fillna(-1), joined["o_total"].fillna(-1))
+
+
+@pytest.mark.parametrize("method", ["first_name", "missing_method"])
+def test_keyed_strings_keep_width_and_nulls(method):
+    names = pd.Series([f"customer-{i % 300}" for i in range(1000)] + [None], dtype=object)
+    faked = SensitiveAnonymizer(pd.DataFrame({"name": names}), keyed("name", method)).run_anonymization()["name"]
+    assert faked.isna().equals(names.isna())
+    present = faked.dropna()
+    assert present.str.len().max() <= names.dropna().str.len().max()
+    mapping = pd.DataFrame({"original": names.dropna(), "fake": present}).drop_duplicates()
+    assert mapping["original"].is_unique and mapping["fake"].is_unique and len(mapping) == 300
+
+
+def test_keyed_mode_rejects_fractional_numbers():
+    with pytest.raises(ValueError):
+        SensitiveAnonymizer(pd.DataFrame({"price": [1.5, 2.0]}), keyed("price")).run_anonymization()
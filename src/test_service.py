@@ -0,0 +1,41 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("snsynth")
+
+SCRIPT = """
+import multiprocessing
+import subprocess
+import sys
+
+sys.path.insert(0, {src!r})
+
+from service import redirect_stdout
+
+
+def child():
+    print("child output")
+
+
+if __name__ == "__main__":
+    protocol_stream = redirect_stdout()
+    print("parent output")
+    process = multiprocessing.get_context("spawn").Process(target=child)
+    process.start()
+    process.join()
+    subprocess.run([sys.executable, "-c", "print('native output')"], check=True)
+    protocol_stream.write("status\\n")
+    protocol_stream.flush()
+"""
+
+
+def test_redirect_stdout_keeps_children_off_the_protocol(tmp_path):
+    script = tmp_path / "redirect.py"
+    script.write_text(textwrap.dedent(SCRIPT.format(src=str(Path(__file__).parent))))
+    result = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, check=True, timeout=60)
+    assert result.stdout == "status\n"
+    assert result.stderr.split() == ["parent", "output", "child", "output", "native", "output"]